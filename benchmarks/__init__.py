@@ -0,0 +1,3 @@
+"""
+Benchmarks of the hot paths of the library
+"""
@@ -0,0 +1,85 @@
+"""
+Runner of the benchmark suite of the hot paths
+
+Run: python -m benchmarks [--suite flow] [--filter handle] [--json results.json]
+"""
+
+import argparse
+from datetime import datetime, timezone
+import json
+import platform
+import sys
+from typing import Any
+
+import orch_serv
+
+from .hot_paths import SUITES
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=sorted(SUITES),
+        help="suite to run, may be repeated (default: all)",
+    )
+    parser.add_argument(
+        "--filter", default="", help="run only cases whose name contains the value"
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiplier of the number of calls per repeat",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="number of repeats")
+    parser.add_argument("--json", dest="json_path", help="write results to the file")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    args = parse_args(argv)
+    results = []
+    print(f"{'case':<36} {'params':<48} {'us/call':>10} {'calls/s':>12}")
+    for suite in args.suite or list(SUITES):
+        for case in SUITES[suite]():
+            if args.filter not in case.name:
+                continue
+            seconds = case.run(scale=args.scale, repeat=args.repeat)
+            params = ", ".join(f"{key}={value}" for key, value in case.params.items())
+            print(
+                f"{case.name:<36} {params:<48}"
+                f" {seconds * 1e6:10.2f} {1 / seconds:12.0f}"
+            )
+            results.append(
+                dict(
+                    suite=suite,
+                    name=case.name,
+                    params=case.params,
+                    seconds_per_call=seconds,
+                    calls_per_second=1 / seconds,
+                )
+            )
+    report = dict(
+        meta=dict(
+            orch_serv_version=orch_serv.__version__,
+            python=sys.version.split()[0],
+            implementation=platform.python_implementation(),
+            platform=platform.platform(),
+            created_at=datetime.now(timezone.utc).isoformat(),
+            scale=args.scale,
+            repeat=args.repeat,
+        ),
+        results=results,
+    )
+    if args.json_path:
+        with open(args.json_path, "w") as file:
+            json.dump(report, file, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark of copying a message before it is processed by a block
+
+Run: python -m benchmarks.bench_block_snapshot
+"""
+
+from copy import deepcopy
+
+from orch_serv import SyncBlock
+
+from .common import SILENT_LOGGER, BenchMessage, make_message, measure
+
+MESSAGE_SIZES = (100, 1_000, 10_000, 50_000)
+
+
+def post_handler(message: BenchMessage) -> BenchMessage:
+    return message
+
+
+class NullableBlock(SyncBlock):
+    name_block = "nullable block"
+
+    def process(self, message: BenchMessage) -> None:
+        return None
+
+
+class SkippedSnapshotBlock(NullableBlock):
+    name_block = "skipped snapshot block"
+    is_execute_after_nullable_process_msg = False
+
+
+def main() -> None:
+    block = NullableBlock(post_handler_function=post_handler, logger=SILENT_LOGGER)
+    skipped_block = SkippedSnapshotBlock(
+        post_handler_function=post_handler, logger=SILENT_LOGGER
+    )
+    print(
+        f"{'size':>8} {'deepcopy, us':>13} {'snapshot, us':>13}"
+        f" {'block, us':>10} {'skipped, us':>12}"
+    )
+    for size in MESSAGE_SIZES:
+        message = make_message(size)
+        deepcopy_time = measure(lambda m=message: deepcopy(m), number=200) * 1e6
+        snapshot_time = measure(message.snapshot, number=200) * 1e6
+        block_time = (
+            measure(lambda m=message: block._process_logic(block, m), number=200) * 1e6
+        )
+        skipped_time = (
+            measure(
+                lambda m=message: skipped_block._process_logic(skipped_block, m),
+                number=200,
+            )
+            * 1e6
+        )
+        print(
+            f"{size:>8} {deepcopy_time:13.2f} {snapshot_time:13.2f}"
+            f" {block_time:10.2f} {skipped_time:12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
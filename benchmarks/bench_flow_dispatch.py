@@ -0,0 +1,70 @@
+"""
+Benchmark of resuming a message in a flow by its source
+
+Run: python -m benchmarks.bench_flow_dispatch
+"""
+
+from orch_serv import FlowBlock, FlowBuilder, SyncBlock, SyncFlow
+
+from .common import SILENT_LOGGER, BenchMessage, make_message, measure
+
+FLOW_LENGTHS = (5, 50, 500, 5000)
+
+
+class BenchBlock(SyncBlock):
+    name_block = "bench block"
+
+    def process(self, message: BenchMessage) -> None:
+        return None
+
+
+def build_flow(count_blocks: int) -> SyncFlow:
+    """
+    Build a flow with `count_blocks` blocks
+    :param int count_blocks: length of the flow
+    :return: flow instance
+    """
+    blocks = [
+        type(f"BenchBlock{i}", (BenchBlock,), {"name_block": f"bench block {i}"})
+        for i in range(count_blocks)
+    ]
+    flow_class = type(
+        f"BenchFlow{count_blocks}",
+        (SyncFlow,),
+        {
+            "name_flow": f"bench flow {count_blocks}",
+            "steps_flow": FlowBuilder(*[FlowBlock(block) for block in blocks]),
+        },
+    )
+    return flow_class(logger=SILENT_LOGGER)
+
+
+def main() -> None:
+    print(f"{'blocks':>8} {'dispatch, us':>14} {'linked list, us':>16}")
+    for count_blocks in FLOW_LENGTHS:
+        flow = build_flow(count_blocks)
+        source = f"bench block {count_blocks - 2}"
+        message = make_message(source=source)
+
+        def dispatch(
+            message: BenchMessage = message, source: str = source, flow: SyncFlow = flow
+        ) -> None:
+            message.set_source(source)
+            flow.to_go_with_the_flow(message)
+
+        def linked_list(
+            message: BenchMessage = message, source: str = source, flow: SyncFlow = flow
+        ) -> None:
+            message.set_source(source)
+            flow.flow_chain.handle(message)
+
+        dispatch_time = measure(dispatch) * 1e6
+        try:
+            linked_list_time = f"{measure(linked_list, number=100) * 1e6:16.2f}"
+        except RecursionError:
+            linked_list_time = f"{'RecursionError':>16}"
+        print(f"{count_blocks:>8} {dispatch_time:14.2f} {linked_list_time}")
+
+
+if __name__ == "__main__":
+    main()
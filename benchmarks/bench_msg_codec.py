@@ -0,0 +1,40 @@
+"""
+Benchmark of routing of received messages
+
+The command of the message is read from json by the validation of the message
+ and from the binary envelope without decoding of the body.
+
+Run: python -m benchmarks.bench_msg_codec
+"""
+
+from orch_serv.msg import decode_envelope, encode_message
+
+from .common import BenchMessage, make_message, measure
+
+MESSAGE_SIZES = (100, 1_000, 10_000, 50_000)
+
+
+def main() -> None:
+    print(
+        f"{'size':>8} {'json, us':>10} {'envelope, us':>13}"
+        f" {'decode, us':>11} {'encode, us':>11}"
+    )
+    for size in MESSAGE_SIZES:
+        message = make_message(size, command="bench", flow="flow")
+        json_data = message.model_dump_json().encode()
+        data = encode_message(message)
+        envelope = decode_envelope(data)
+        json_time = measure(
+            lambda j=json_data: BenchMessage.model_validate_json(j).get_command()
+        )
+        envelope_time = measure(lambda d=data: decode_envelope(d).get_command())
+        decode_time = measure(lambda e=envelope: e.decode(BenchMessage))
+        encode_time = measure(lambda m=message: encode_message(m))
+        print(
+            f"{size:>8} {json_time * 1e6:10.2f} {envelope_time * 1e6:13.2f}"
+            f" {decode_time * 1e6:11.2f} {encode_time * 1e6:11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark of the lazy validation of the body of messages
+
+The flow of the received message is read after the complete validation
+ and after the lazy validation of a dict, json and the binary envelope.
+The json is parsed completely, the envelope is not.
+
+Run: python -m benchmarks.bench_msg_lazy
+"""
+
+from orch_serv.msg import decode_envelope, encode_message
+
+from .common import BenchMessage, make_message, measure
+
+MESSAGE_SIZES = (100, 1_000, 10_000, 50_000)
+
+
+def main() -> None:
+    print(
+        f"{'size':>8} {'dict, us':>9} {'lazy, us':>9} {'json, us':>9}"
+        f" {'lazy, us':>9} {'envelope lazy, us':>18} {'lazy + body, us':>16}"
+    )
+    for size in MESSAGE_SIZES:
+        message = make_message(size, flow="flow")
+        data = message.model_dump()
+        json_data = message.model_dump_json()
+        envelope_data = encode_message(message)
+        times = [
+            measure(lambda d=data: BenchMessage.model_validate(d).get_flow()),
+            measure(lambda d=data: BenchMessage.model_validate_lazy(d).get_flow()),
+            measure(lambda d=json_data: BenchMessage.model_validate_json(d).get_flow()),
+            measure(lambda d=json_data: BenchMessage.model_validate_lazy(d).get_flow()),
+            measure(
+                lambda d=envelope_data: decode_envelope(d)
+                .decode(BenchMessage, is_lazy=True)
+                .get_flow()
+            ),
+            measure(lambda d=data: BenchMessage.model_validate_lazy(d).body),
+        ]
+        widths = (9, 9, 9, 9, 18, 16)
+        print(
+            f"{size:>8} "
+            + " ".join(
+                f"{seconds * 1e6:{width}.2f}"
+                for seconds, width in zip(times, widths, strict=True)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
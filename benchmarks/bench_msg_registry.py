@@ -0,0 +1,84 @@
+"""
+Benchmark of the registry of parametrised message classes
+
+Thousands of body models are parametrised like per-tenant models of a service.
+The build time of a new class is compared with the time of a registry hit,
+ the memory is measured after the classes of all variants were requested
+ with all classes kept alive and with the bounded registry.
+
+Run: python -m benchmarks.bench_msg_registry
+"""
+
+from collections.abc import Callable
+import gc
+import time
+import tracemalloc
+
+from pydantic import BaseModel, create_model
+
+from orch_serv import BaseOrchServMsg
+from orch_serv.msg import MsgClassRegistry
+
+from .common import BenchHeader, measure
+
+VARIANTS = 2_000
+MAXSIZE = 256
+
+
+def make_body_models(count: int) -> list[type[BaseModel]]:
+    return [
+        create_model(f"TenantBody{i}", payload=(str, ""), values=(list[int], []))
+        for i in range(count)
+    ]
+
+
+def build_all(body_models: list[type[BaseModel]]) -> list[type[BaseOrchServMsg]]:
+    return [BaseOrchServMsg[body, BenchHeader] for body in body_models]
+
+
+def request_all(body_models: list[type[BaseModel]]) -> MsgClassRegistry:
+    registry = MsgClassRegistry(maxsize=MAXSIZE)
+    for body in body_models:
+        registry.get(BaseOrchServMsg, body, BenchHeader)
+    return registry
+
+
+def measure_memory(func: Callable[[], object]) -> float:
+    """
+    :param func: returns the objects kept alive
+    :return: MiB allocated by the objects kept alive
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 2**20
+
+
+def main() -> None:
+    body_models = make_body_models(VARIANTS)
+    started = time.perf_counter()
+    classes = build_all(body_models)
+    build_time = (time.perf_counter() - started) / VARIANTS
+    del classes
+    gc.collect()
+
+    registry = MsgClassRegistry(maxsize=MAXSIZE)
+    hot = body_models[0]
+    registry.get(BaseOrchServMsg, hot, BenchHeader)
+    hit_time = measure(lambda: registry.get(BaseOrchServMsg, hot, BenchHeader))
+
+    unbounded_memory = measure_memory(lambda: build_all(make_body_models(VARIANTS)))
+    bounded_memory = measure_memory(lambda: request_all(make_body_models(VARIANTS)))
+    print(f"variants: {VARIANTS}, registry maxsize: {MAXSIZE}")
+    print(f"build of a new class: {build_time * 1e6:10.2f} us")
+    print(f"registry hit:         {hit_time * 1e6:10.2f} us")
+    print(f"memory, all classes alive: {unbounded_memory:8.2f} MiB")
+    print(f"memory, bounded registry:  {bounded_memory:8.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark of the executors of the sync orchestrator with a CPU-bound block
+
+Several threads call `SyncOrchestrator.handle` at the same time.
+With the inline and thread executors the blocks share the GIL,
+with the process executor the blocks are executed on all cores.
+
+Run: python -m benchmarks.bench_orchestrator_executor
+"""
+
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import os
+import time
+
+from orch_serv import SyncBlock, SyncOrchestrator
+
+from .common import SILENT_LOGGER, BenchMessage, make_message
+
+CALLERS = os.cpu_count() or 1
+MESSAGES_PER_CALLER = 20
+WORK_SIZE = 200_000
+
+
+class CpuBoundBlock(SyncBlock):
+    name_block = "cpu bound block"
+
+    def process(self, message: BenchMessage) -> BenchMessage:
+        message.body.values = [sum(i * i for i in range(WORK_SIZE)) % 1000]
+        return message
+
+
+def run(executor_factory: Callable[[], Executor | None]) -> float:
+    """
+    Process the messages by the callers with the executor
+    :param executor_factory: returns the executor of the orchestrator
+    :return: messages per second
+    """
+    executor = executor_factory()
+    orchestrator = SyncOrchestrator(
+        blocks=[CpuBoundBlock], logger=SILENT_LOGGER, executor=executor
+    )
+    messages = [
+        make_message(100, target=CpuBoundBlock.name_block)
+        for _ in range(CALLERS * MESSAGES_PER_CALLER)
+    ]
+    # warm up the workers of the executor
+    orchestrator.handle(make_message(target=CpuBoundBlock.name_block))
+    with ThreadPoolExecutor(max_workers=CALLERS) as callers:
+        started = time.perf_counter()
+        list(callers.map(orchestrator.handle, messages))
+        elapsed = time.perf_counter() - started
+    if executor:
+        executor.shutdown()
+    return len(messages) / elapsed
+
+
+def main() -> None:
+    backends: dict[str, Callable[[], Executor | None]] = {
+        "inline": lambda: None,
+        "thread": lambda: ThreadPoolExecutor(max_workers=CALLERS),
+        "process": lambda: ProcessPoolExecutor(max_workers=CALLERS),
+    }
+    print(f"callers: {CALLERS}")
+    print(f"{'executor':>10} {'msg/s':>10}")
+    for name, executor_factory in backends.items():
+        print(f"{name:>10} {run(executor_factory):10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark of the per-message overhead of `Service.handle`
+
+The overhead is the time of `Service.handle` minus the time of the direct call
+ of the processor and the post processor, for the declared result shapes
+ of the processor, for the known command and for the default command.
+The time to build the registry of the service is measured too.
+
+Run: python -m benchmarks.bench_service_dispatch
+"""
+
+from typing import Any
+
+from orch_serv import (
+    CommandHandlerPostProcessStrategy,
+    CommandHandlerProcessStrategy,
+    ResultShape,
+    Service,
+    ServiceBlock,
+    ServiceBuilder,
+)
+
+from .common import SILENT_LOGGER, BenchMessage, make_message, measure
+
+COUNT_COMMANDS = 100
+NUMBER = 20_000
+
+
+class _MessageHandler(CommandHandlerProcessStrategy):
+    target_command = "message"
+    result_shape = ResultShape.MESSAGE
+
+    def process(self, message: BenchMessage) -> BenchMessage:
+        return message
+
+
+class _AutoHandler(_MessageHandler):
+    target_command = "auto"
+    result_shape = ResultShape.AUTO
+
+
+class _TupleHandler(CommandHandlerProcessStrategy):
+    target_command = "tuple"
+    result_shape = ResultShape.TUPLE
+
+    def process(self, message: BenchMessage) -> tuple[BenchMessage, Any]:
+        return message, None
+
+
+class _PostHandler(CommandHandlerPostProcessStrategy):
+    def post_process(self, msg: BenchMessage, additional_data: Any = None) -> None:
+        pass
+
+
+FILLERS = [
+    type(f"_Filler{i}", (_MessageHandler,), dict(target_command=f"filler_{i}"))
+    for i in range(COUNT_COMMANDS)
+]
+
+
+def _make_service() -> Service:
+    return Service(
+        ServiceBuilder(
+            *[
+                ServiceBlock(processor=handler)
+                for handler in [_MessageHandler, _AutoHandler, _TupleHandler, *FILLERS]
+            ],
+            default_post_process=_PostHandler,
+        ),
+        default_command="message",
+        logger=SILENT_LOGGER,
+    )
+
+
+def main() -> None:
+    service = _make_service()
+    processor, post_processor = _MessageHandler(), _PostHandler()
+    direct_message = make_message(command="message")
+
+    def direct() -> None:
+        post_processor.post_process(processor.process(direct_message), None)
+
+    direct_time = measure(direct, number=NUMBER)
+    build_time = measure(_make_service, number=100)
+    print(f"commands: {COUNT_COMMANDS + 3}, build: {build_time * 1e3:.3f} ms")
+    print(f"{'case':>16} {'us/msg':>10} {'overhead us':>12}")
+    for command in ("message", "auto", "tuple", "default"):
+        message = make_message(command=command)
+        seconds = measure(lambda m=message: service.handle(m), number=NUMBER)
+        print(
+            f"{command:>16} {seconds * 1e6:10.3f}"
+            f" {(seconds - direct_time) * 1e6:12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
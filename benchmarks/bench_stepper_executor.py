@@ -0,0 +1,78 @@
+"""
+Benchmark of the executors of CPU-bound steps
+
+The stepper runs a group of CPU-bound `ExecutorStep` in `ParallelSteps`,
+ one step for each core.
+With the inline and thread executors the steps share the GIL,
+with the process executor the steps are executed on all cores.
+
+Run: python -m benchmarks.bench_stepper_executor
+"""
+
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import os
+import time
+
+from orch_serv import ExecutorStep, ParallelSteps, Step, Stepper, StepsBuilder
+from orch_serv.orchestrator.block import InlineExecutor
+
+from .common import SILENT_LOGGER
+
+CORES = os.cpu_count() or 1
+CALLS = 10
+WORK_SIZE = 200_000
+
+
+def start(value: int) -> int:
+    return value
+
+
+def cpu_bound(value: int) -> int:
+    return sum(i * i for i in range(WORK_SIZE + value)) % 1000 + 1
+
+
+def collect(*values: int) -> list[int]:
+    return list(values)
+
+
+def run(executor_factory: Callable[[], Executor]) -> float:
+    """
+    Execute the stepper with the executor of the CPU-bound steps
+    :param executor_factory: returns the executor of the steps
+    :return: calls of the stepper per second
+    """
+    executor = executor_factory()
+    stepper = Stepper(
+        StepsBuilder(
+            Step(start),
+            ParallelSteps(*[ExecutorStep(cpu_bound, executor) for _ in range(CORES)]),
+            Step(collect),
+            is_validate_consistency_steps=False,
+        ),
+        logger=SILENT_LOGGER,
+    )
+    # warm up the workers of the executor
+    stepper.step_by_step(1)
+    started = time.perf_counter()
+    for value in range(CALLS):
+        stepper.step_by_step(value + 1)
+    elapsed = time.perf_counter() - started
+    executor.shutdown()
+    return CALLS / elapsed
+
+
+def main() -> None:
+    backends: dict[str, Callable[[], Executor]] = {
+        "inline": InlineExecutor,
+        "thread": lambda: ThreadPoolExecutor(max_workers=CORES),
+        "process": lambda: ProcessPoolExecutor(max_workers=CORES),
+    }
+    print(f"cores: {CORES}, parallel steps: {CORES}")
+    print(f"{'executor':>10} {'calls/s':>10}")
+    for name, executor_factory in backends.items():
+        print(f"{name:>10} {run(executor_factory):10.2f}")
+
+
+if __name__ == "__main__":
+    main()
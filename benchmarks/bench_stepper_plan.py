@@ -0,0 +1,71 @@
+"""
+Benchmark of the per-step overhead of Stepper:
+ the compiled plan against the execution of the steps one by one
+ with `Step.execute` and logging of each step
+
+Run: python -m benchmarks.bench_stepper_plan
+"""
+
+import logging
+
+from orch_serv import Step, Stepper, StepsBuilder
+
+from .common import SILENT_LOGGER, measure
+
+STEP_COUNTS = (1, 10, 100)
+
+
+def first_step(value: int) -> int:
+    return value
+
+
+def next_step(value: int, arg: int = 1) -> int:
+    return value
+
+
+def build(count_steps: int) -> StepsBuilder:
+    return StepsBuilder(
+        Step(first_step), *[Step(next_step, arg=2) for _ in range(count_steps - 1)]
+    )
+
+
+def step_by_step_without_plan(stepper: Stepper, logger: logging.Logger, value: int):
+    """
+    Execution of the steps as it was done before the compiled plan
+    """
+    step_data: tuple = (value,)
+    result_data = None
+    for step in stepper.steps:  # type: ignore
+        logger.info("Starting Step %s", step)
+        result_data = step.execute(step_data)
+        step_data = result_data
+        logger.info("Finished Step %s", step)
+    return result_data
+
+
+def main() -> None:
+    print(
+        f"{'steps':>6} {'without plan, ns/step':>22} {'plan, ns/step':>14}"
+        f" {'plan with logging, ns/step':>27}"
+    )
+    for count_steps in STEP_COUNTS:
+        number = max(1000, 100_000 // count_steps)
+        stepper = Stepper(build(count_steps), logger=SILENT_LOGGER, is_log_steps=False)
+        logged_stepper = Stepper(build(count_steps), logger=SILENT_LOGGER)
+        without_plan = measure(
+            lambda s=stepper: step_by_step_without_plan(s, SILENT_LOGGER, 1),
+            number=number,
+        )
+        plan = measure(lambda s=stepper: s.step_by_step(1), number=number)
+        plan_with_logging = measure(
+            lambda s=logged_stepper: s.step_by_step(1), number=number
+        )
+        print(
+            f"{count_steps:>6} {without_plan / count_steps * 1e9:22.1f}"
+            f" {plan / count_steps * 1e9:14.1f}"
+            f" {plan_with_logging / count_steps * 1e9:27.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark of building StepsBuilder with and without the cache of signatures
+
+Run: python -m benchmarks.bench_steps_builder
+"""
+
+from collections.abc import Callable
+import inspect
+
+from orch_serv import Step, StepsBuilder
+from orch_serv.stepper import utils
+
+from .common import measure
+
+STEP_COUNTS = (10, 100, 1000)
+
+
+def first_step() -> list[int]:
+    return [1]
+
+
+def next_step(values: list[int], arg: int = 1) -> list[int]:
+    return values
+
+
+def build(count_steps: int) -> StepsBuilder:
+    return StepsBuilder(
+        Step(first_step), *[Step(next_step, arg=2) for _ in range(count_steps - 1)]
+    )
+
+
+class WithoutCache:
+    @staticmethod
+    def get(obj: Callable) -> inspect.Signature:
+        return inspect.signature(obj)
+
+
+def main() -> None:
+    print(f"{'steps':>8} {'without cache, us':>18} {'with cache, us':>15}")
+    cache = utils.signature_cache
+    for count_steps in STEP_COUNTS:
+        number = max(10, 10_000 // count_steps)
+        utils.signature_cache = WithoutCache()  # type: ignore
+        try:
+            without_cache = measure(lambda c=count_steps: build(c), number=number)
+        finally:
+            utils.signature_cache = cache
+        with_cache = measure(lambda c=count_steps: build(c), number=number)
+        print(f"{count_steps:>8} {without_cache * 1e6:18.2f} {with_cache * 1e6:15.2f}")
+
+
+if __name__ == "__main__":
+    main()
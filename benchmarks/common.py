@@ -0,0 +1,101 @@
+"""
+Helpers shared by the benchmarks
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from logging import CRITICAL, Logger
+import time
+import timeit
+from typing import Any
+
+from pydantic import BaseModel
+
+from orch_serv import BaseOrchServMsg
+
+SILENT_LOGGER = Logger("orch_serv.benchmarks", level=CRITICAL)
+
+
+class BenchBody(BaseModel):
+    payload: str = ""
+    values: list[int] = []
+    extra: dict[str, str] = {}
+
+
+class BenchHeader(BaseModel):
+    source: str | None = None
+    flow: str | None = None
+    target: str | None = None
+    command: str | None = None
+
+
+class BenchMessage(BaseOrchServMsg):
+    body: BenchBody
+    header: BenchHeader
+
+    def get_source(self) -> str | None:
+        return self.header.source
+
+    def set_source(self, source: str) -> None:
+        self.header.source = source
+
+    def get_flow(self) -> str | None:
+        return self.header.flow
+
+    def get_target(self) -> str | None:
+        return self.header.target
+
+    def get_command(self) -> str | None:
+        return self.header.command
+
+
+def make_message(size: int = 0, **header: Any) -> BenchMessage:
+    """
+    Build a benchmark message with a body of approximately `size` bytes
+    :param int size: approximate size of the body
+    :param header: header fields
+    :return: message
+    """
+    return BenchMessage(
+        body=BenchBody(
+            payload="x" * (size // 2),
+            values=list(range(size // 8)),
+            extra={str(i): str(i) for i in range(size // 32)},
+        ),
+        header=BenchHeader(**header),
+    )
+
+
+def measure(func: Callable[[], Any], number: int = 1000, repeat: int = 5) -> float:
+    """
+    Measure the best time of one call of `func`
+    :param func: function to measure
+    :param int number: number of calls in one repeat
+    :param int repeat: number of repeats
+    :return: seconds per call
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def measure_async(
+    func: Callable[[], Awaitable[Any]], number: int = 1000, repeat: int = 5
+) -> float:
+    """
+    Measure the best time of one await of `func` in an event loop
+    :param func: coroutine function to measure
+    :param int number: number of awaits in one repeat
+    :param int repeat: number of repeats
+    :return: seconds per call
+    """
+
+    async def run() -> float:
+        started = time.perf_counter()
+        for _ in range(number):
+            await func()
+        return time.perf_counter() - started
+
+    loop = asyncio.new_event_loop()
+    try:
+        return min(loop.run_until_complete(run()) for _ in range(repeat)) / number
+    finally:
+        loop.close()
@@ -0,0 +1,299 @@
+"""
+Benchmark cases of the hot paths of the library:
+ orchestrators, flows, services and stepper
+"""
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from orch_serv import (
+    AsyncBlock,
+    AsyncCommandHandlerProcessStrategy,
+    AsyncFlow,
+    AsyncOrchestrator,
+    AsyncService,
+    CommandHandlerProcessStrategy,
+    FlowBlock,
+    FlowBuilder,
+    Service,
+    ServiceBlock,
+    ServiceBuilder,
+    Step,
+    Stepper,
+    StepsBuilder,
+    SyncBlock,
+    SyncFlow,
+    SyncOrchestrator,
+)
+
+from .common import SILENT_LOGGER, BenchMessage, make_message, measure, measure_async
+
+MESSAGE_SIZES = (100, 10_000)
+BLOCK_COUNTS = (1, 10, 100)
+FLOW_LENGTHS = (5, 50, 500)
+STEP_COUNTS = (1, 10, 100)
+
+
+@dataclass
+class BenchCase:
+    """
+    One benchmark case
+    :attr name: name of the measured path
+    :attr params: parameters of the case
+    :attr func: function to measure
+    :attr is_async: `func` is a coroutine function
+    :attr number: number of calls in one repeat
+    """
+
+    name: str
+    params: dict[str, Any]
+    func: Callable[[], Any]
+    is_async: bool = False
+    number: int = 1000
+
+    def run(self, scale: float = 1.0, repeat: int = 5) -> float:
+        """
+        Run the case
+        :param scale: multiplier of the number of calls
+        :param repeat: number of repeats
+        :return: seconds per call
+        """
+        number = max(1, int(self.number * scale))
+        if self.is_async:
+            return measure_async(self.func, number=number, repeat=repeat)
+        return measure(self.func, number=number, repeat=repeat)
+
+
+def _block_classes(
+    base: type[SyncBlock] | type[AsyncBlock], count: int, prefix: str
+) -> list[type]:
+    return [
+        type(f"{prefix}{i}", (base,), {"name_block": f"{prefix} {i}"})
+        for i in range(count)
+    ]
+
+
+class _SyncBenchBlock(SyncBlock):
+    def process(self, message: BenchMessage) -> BenchMessage:
+        return message
+
+
+class _AsyncBenchBlock(AsyncBlock):
+    async def process(self, message: BenchMessage) -> BenchMessage:
+        return message
+
+
+def _flow_class(
+    base: type[SyncFlow] | type[AsyncFlow], blocks: list[type], name: str
+) -> type:
+    return type(
+        name,
+        (base,),
+        {
+            "name_flow": name,
+            "is_run_to_completion": True,
+            "steps_flow": FlowBuilder(*[FlowBlock(block) for block in blocks]),
+        },
+    )
+
+
+def orchestrator_cases() -> Iterator[BenchCase]:
+    """
+    `SyncOrchestrator.handle` and `AsyncOrchestrator.handle`
+     for targets and flows
+    """
+    for count_blocks in BLOCK_COUNTS:
+        sync_blocks = _block_classes(_SyncBenchBlock, count_blocks, "sync block")
+        async_blocks = _block_classes(_AsyncBenchBlock, count_blocks, "async block")
+        sync_orchestrator = SyncOrchestrator(
+            blocks=sync_blocks, logger=SILENT_LOGGER, preload=True
+        )
+        async_orchestrator = AsyncOrchestrator(
+            blocks=async_blocks, logger=SILENT_LOGGER, preload=True
+        )
+        for size in MESSAGE_SIZES:
+            params = dict(blocks=count_blocks, message_size=size)
+            sync_message = make_message(size, target=sync_blocks[-1].name_block)
+            async_message = make_message(size, target=async_blocks[-1].name_block)
+            yield BenchCase(
+                "sync_orchestrator.handle.target",
+                params,
+                lambda o=sync_orchestrator, m=sync_message: o.handle(m),
+            )
+            yield BenchCase(
+                "async_orchestrator.handle.target",
+                params,
+                lambda o=async_orchestrator, m=async_message: o.handle(m),
+                is_async=True,
+            )
+    for flow_length in FLOW_LENGTHS:
+        sync_flow = _flow_class(
+            SyncFlow,
+            _block_classes(_SyncBenchBlock, flow_length, "sync flow block"),
+            f"sync flow {flow_length}",
+        )
+        async_flow = _flow_class(
+            AsyncFlow,
+            _block_classes(_AsyncBenchBlock, flow_length, "async flow block"),
+            f"async flow {flow_length}",
+        )
+        sync_orchestrator = SyncOrchestrator(
+            flows=[sync_flow], logger=SILENT_LOGGER, preload=True
+        )
+        async_orchestrator = AsyncOrchestrator(
+            flows=[async_flow], logger=SILENT_LOGGER, preload=True
+        )
+        params = dict(flow_length=flow_length, message_size=MESSAGE_SIZES[0])
+        sync_message = make_message(MESSAGE_SIZES[0], flow=sync_flow.name_flow)
+        async_message = make_message(MESSAGE_SIZES[0], flow=async_flow.name_flow)
+
+        def handle_sync(
+            orchestrator: SyncOrchestrator = sync_orchestrator,
+            message: BenchMessage = sync_message,
+        ) -> None:
+            message.header.source = None
+            orchestrator.handle(message)
+
+        async def handle_async(
+            orchestrator: AsyncOrchestrator = async_orchestrator,
+            message: BenchMessage = async_message,
+        ) -> None:
+            message.header.source = None
+            await orchestrator.handle(message)
+
+        number = max(10, 10_000 // flow_length)
+        yield BenchCase(
+            "sync_orchestrator.handle.flow", params, handle_sync, number=number
+        )
+        yield BenchCase(
+            "async_orchestrator.handle.flow",
+            params,
+            handle_async,
+            is_async=True,
+            number=number,
+        )
+
+
+def flow_cases() -> Iterator[BenchCase]:
+    """
+    `Flow.to_go_with_the_flow` for one step and for the whole flow
+    """
+    for flow_length in FLOW_LENGTHS:
+        sync_flow = _flow_class(
+            SyncFlow,
+            _block_classes(_SyncBenchBlock, flow_length, "sync flow block"),
+            f"sync flow {flow_length}",
+        )(logger=SILENT_LOGGER)
+        async_flow = _flow_class(
+            AsyncFlow,
+            _block_classes(_AsyncBenchBlock, flow_length, "async flow block"),
+            f"async flow {flow_length}",
+        )(logger=SILENT_LOGGER)
+        sync_message = make_message(MESSAGE_SIZES[0])
+        async_message = make_message(MESSAGE_SIZES[0])
+        for is_run_to_completion in (False, True):
+            params = dict(
+                flow_length=flow_length, is_run_to_completion=is_run_to_completion
+            )
+
+            def go_sync(
+                flow: SyncFlow = sync_flow,
+                message: BenchMessage = sync_message,
+                is_run_to_completion: bool = is_run_to_completion,
+            ) -> None:
+                message.header.source = None
+                flow.to_go_with_the_flow(
+                    message, is_run_to_completion=is_run_to_completion
+                )
+
+            async def go_async(
+                flow: AsyncFlow = async_flow,
+                message: BenchMessage = async_message,
+                is_run_to_completion: bool = is_run_to_completion,
+            ) -> None:
+                message.header.source = None
+                await flow.to_go_with_the_flow(
+                    message, is_run_to_completion=is_run_to_completion
+                )
+
+            number = max(10, 10_000 // flow_length) if is_run_to_completion else 1000
+            yield BenchCase(
+                "sync_flow.to_go_with_the_flow", params, go_sync, number=number
+            )
+            yield BenchCase(
+                "async_flow.to_go_with_the_flow",
+                params,
+                go_async,
+                is_async=True,
+                number=number,
+            )
+
+
+class _SyncBenchHandler(CommandHandlerProcessStrategy):
+    target_command = "bench"
+
+    def process(self, message: BenchMessage) -> BenchMessage:
+        return message
+
+
+class _AsyncBenchHandler(AsyncCommandHandlerProcessStrategy):
+    target_command = "bench"
+
+    async def process(self, message: BenchMessage) -> BenchMessage:
+        return message
+
+
+def service_cases() -> Iterator[BenchCase]:
+    """
+    `Service.handle` and `AsyncService.handle`
+    """
+    sync_service = Service(
+        service_commands=ServiceBuilder(ServiceBlock(processor=_SyncBenchHandler)),
+        logger=SILENT_LOGGER,
+    )
+    async_service = AsyncService(
+        service_commands=ServiceBuilder(ServiceBlock(processor=_AsyncBenchHandler)),
+        logger=SILENT_LOGGER,
+    )
+    for size in MESSAGE_SIZES:
+        message = make_message(size, command="bench")
+        params = dict(message_size=size)
+        yield BenchCase(
+            "service.handle", params, lambda m=message: sync_service.handle(m)
+        )
+        yield BenchCase(
+            "async_service.handle",
+            params,
+            lambda m=message: async_service.handle(m),
+            is_async=True,
+        )
+
+
+def _increment(value: int) -> int:
+    return value + 1
+
+
+def stepper_cases() -> Iterator[BenchCase]:
+    """
+    `Stepper.step_by_step`
+    """
+    for count_steps in STEP_COUNTS:
+        stepper = Stepper(
+            steps=StepsBuilder(*[Step(_increment) for _ in range(count_steps)]),
+            logger=SILENT_LOGGER,
+        )
+        yield BenchCase(
+            "stepper.step_by_step",
+            dict(steps=count_steps),
+            lambda s=stepper: s.step_by_step(1),
+            number=max(10, 10_000 // count_steps),
+        )
+
+
+SUITES: dict[str, Callable[[], Iterator[BenchCase]]] = {
+    "orchestrator": orchestrator_cases,
+    "flow": flow_cases,
+    "service": service_cases,
+    "stepper": stepper_cases,
+}
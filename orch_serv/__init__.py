@@ -17,14 +17,30 @@ from .orchestrator import (
 from .service import (
     AsyncCommandHandlerPostProcessStrategy,
     AsyncCommandHandlerProcessStrategy,
+    AsyncPostProcessingPipeline,
     AsyncService,
     CommandHandlerPostProcessStrategy,
     CommandHandlerProcessStrategy,
+    PostProcessingPipeline,
+    ResultShape,
     Service,
     ServiceBlock,
     ServiceBuilder,
 )
-from .stepper import Step, Stepper, StepsBuilder
+from .stepper import (
+    AsyncStepper,
+    BatchStep,
+    CachedStep,
+    ExecutorStep,
+    ForEachStep,
+    IfStep,
+    ParallelSteps,
+    Step,
+    StepCache,
+    Stepper,
+    StepsBuilder,
+    WhileStep,
+)
 
 __version__ = "0.1.7"
 __all__ = [
@@ -46,7 +62,19 @@ __all__ = [
     "Service",
     "ServiceBlock",
     "ServiceBuilder",
+    "ResultShape",
+    "PostProcessingPipeline",
+    "AsyncPostProcessingPipeline",
     "Stepper",
     "StepsBuilder",
     "Step",
+    "AsyncStepper",
+    "ParallelSteps",
+    "BatchStep",
+    "CachedStep",
+    "StepCache",
+    "ExecutorStep",
+    "IfStep",
+    "WhileStep",
+    "ForEachStep",
 ]
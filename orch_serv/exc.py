@@ -18,6 +18,14 @@ class MsgException(OrchServError):
     """
 
 
+class MsgCodecError(MsgException):
+    """
+    Message can not be encoded to or decoded from the binary envelope
+    """
+
+    pass
+
+
 class OrchestratorException(OrchServError):
     """
     Main exception class exceptions with Orchestrator
@@ -212,6 +220,30 @@ class IncorrectDefaultCommand(ServiceException):
         Exception.__init__(self, self.message)
 
 
+class ResultShapeMismatchError(ServiceException):
+    """
+    The result of the processor does not match its `result_shape`
+    """
+
+    def __init__(self, command: str, result_shape: str, result_type: str):
+        self.message = (
+            f"Processor of command `{command}` declares `result_shape`"
+            f" `{result_shape}` and returned `{result_type}`."
+            f" The processor must return a tuple (message, additional_data)."
+        )
+        Exception.__init__(self, self.message)
+
+
+class PostProcessingClosedError(ServiceException):
+    """
+    The results are submitted to the closed post-processing pipeline
+    """
+
+    def __init__(self) -> None:
+        self.message = "Post-processing pipeline is closed"
+        Exception.__init__(self, self.message)
+
+
 class StepperException(OrchServError):
     """
     Main exception class exceptions with Stepper
@@ -301,3 +333,46 @@ class EmptyStepper(StepperException):
     ) -> None:
         self.message = "Empty stepper"
         Exception.__init__(self, self.message)
+
+
+class BatchSizeMismatchError(StepperException):
+    """
+    The batch step returned a different number of results than it received items
+    """
+
+    def __init__(self, step: str, count_items: int, count_results: int):
+        self.message = (
+            f"Batch step `{step}` received {count_items} item(s)"
+            f" and returned {count_results} result(s)."
+            f" The object must return a result for each item of the batch."
+        )
+        Exception.__init__(self, self.message)
+
+
+class NotPicklableStepError(StepperException):
+    """
+    The object or kwargs of the step executed in the process pool
+     can't be pickled
+    """
+
+    def __init__(self, obj: str, error: str):
+        self.message = (
+            f"The object `{obj}` or its kwargs can't be pickled"
+            f" to execute the step in the process pool. Error: {error}."
+            f" Use functions defined at the module level and picklable kwargs."
+        )
+        Exception.__init__(self, self.message)
+
+
+class LoopLimitExceededError(StepperException):
+    """
+    The loop step exceeded the max number of the iterations
+    """
+
+    def __init__(self, step: str, max_iterations: int):
+        self.message = (
+            f"Loop step `{step}` exceeded the max number"
+            f" of the iterations {max_iterations}."
+            f" Check the condition of the loop or increase `max_iterations`."
+        )
+        Exception.__init__(self, self.message)
@@ -0,0 +1,292 @@
+"""
+Module with hooks for metrics and tracing of blocks, service commands and steps
+
+Hooks are registered globally with `register_hook`.
+If no hooks are registered the instrumented code only checks
+ that `registered_hooks` is empty
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable
+import threading
+import time
+from typing import Any, TypeVar
+
+KIND_BLOCK = "block"
+KIND_COMMAND = "command"
+KIND_STEP = "step"
+
+_T = TypeVar("_T")
+
+registered_hooks: tuple[Hook, ...] = tuple()
+_registry_lock = threading.Lock()
+
+
+class HookEvent:
+    """
+    Event of one call of the instrumented object
+    :attr kind: kind of the object: `block`, `command` or `step`
+    :attr name: name of the block, command or step
+    :attr started: value of `time.perf_counter` at the start of the call
+    :attr duration: duration of the call in seconds, set before `on_end`
+     and `on_error`
+    :attr error: exception raised by the call, set before `on_error`
+    :attr context: storage for the hooks, e.g. for spans of the tracing
+    """
+
+    __slots__ = ("kind", "name", "started", "duration", "error", "context")
+
+    def __init__(self, kind: str, name: str) -> None:
+        self.kind = kind
+        self.name = name
+        self.started = time.perf_counter()
+        self.duration: float | None = None
+        self.error: BaseException | None = None
+        self.context: dict[str, Any] = dict()
+
+
+class Hook:
+    """
+    Base hook, override the methods needed.
+    Hooks are called from all threads and event loops
+     which process messages, so they must be thread-safe.
+    Exceptions of the hooks are not caught
+    """
+
+    def on_start(self, event: HookEvent) -> None:
+        """
+        Called before the call of the object
+        :param HookEvent event: event of the call
+        :return: nothing
+        """
+
+    def on_end(self, event: HookEvent) -> None:
+        """
+        Called after the successful call of the object
+        :param HookEvent event: event of the call with the duration
+        :return: nothing
+        """
+
+    def on_error(self, event: HookEvent) -> None:
+        """
+        Called if the object raised an exception,
+         the exception is raised further after the hooks
+        :param HookEvent event: event of the call with the duration and the error
+        :return: nothing
+        """
+
+
+def register_hook(hook: Hook) -> None:
+    """
+    Registers the hook for all blocks, commands and steps
+    :param Hook hook: hook to register
+    :return: nothing
+    :raise TypeError: if hook is not a Hook
+    """
+    global registered_hooks
+    if not isinstance(hook, Hook):
+        raise TypeError(f"Hook must be a Hook and not {type(hook)}")
+    with _registry_lock:
+        if hook not in registered_hooks:
+            registered_hooks = (*registered_hooks, hook)
+
+
+def unregister_hook(hook: Hook) -> None:
+    """
+    Removes the hook if it is registered
+    :param Hook hook: hook to remove
+    :return: nothing
+    """
+    global registered_hooks
+    with _registry_lock:
+        registered_hooks = tuple(item for item in registered_hooks if item is not hook)
+
+
+def _finish(
+    hooks: tuple[Hook, ...], event: HookEvent, error: BaseException | None
+) -> None:
+    event.duration = time.perf_counter() - event.started
+    if error is None:
+        for hook in hooks:
+            hook.on_end(event)
+    else:
+        event.error = error
+        for hook in hooks:
+            hook.on_error(event)
+
+
+def call_with_hooks(
+    kind: str, name: str, func: Callable[..., _T], *args: Any, **kwargs: Any
+) -> _T:
+    """
+    Calls the function between `on_start` and `on_end` or `on_error`
+     of the registered hooks
+    :param str kind: kind of the object
+    :param str name: name of the object
+    :param func: function to call
+    :return: result of the function
+    """
+    hooks = registered_hooks
+    event = HookEvent(kind, name)
+    for hook in hooks:
+        hook.on_start(event)
+    try:
+        result = func(*args, **kwargs)
+    except BaseException as exc:
+        _finish(hooks, event, exc)
+        raise
+    _finish(hooks, event, None)
+    return result
+
+
+async def async_call_with_hooks(
+    kind: str,
+    name: str,
+    func: Callable[..., Awaitable[_T]],
+    *args: Any,
+    **kwargs: Any,
+) -> _T:
+    """
+    Awaits the coroutine function between `on_start` and `on_end` or `on_error`
+     of the registered hooks
+    :param str kind: kind of the object
+    :param str name: name of the object
+    :param func: coroutine function to await
+    :return: result of the function
+    """
+    hooks = registered_hooks
+    event = HookEvent(kind, name)
+    for hook in hooks:
+        hook.on_start(event)
+    try:
+        result = await func(*args, **kwargs)
+    except BaseException as exc:
+        _finish(hooks, event, exc)
+        raise
+    _finish(hooks, event, None)
+    return result
+
+
+class _Histogram:
+    """
+    Histogram of durations with logarithmic buckets
+    """
+
+    __slots__ = ("counts", "count", "errors", "total", "max")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class HistogramHook(Hook):
+    """
+    In-memory collector of the latencies of each block, command and step.
+    Durations are counted in logarithmic buckets,
+     so the percentiles are estimated with the relative error
+     of the bucket growth factor
+    :example:
+    >>> histogram = HistogramHook()
+    >>> register_hook(histogram)
+    >>> # process messages
+    >>> histogram.percentile("block", "first block", 99)
+    """
+
+    def __init__(
+        self,
+        min_duration: float = 1e-6,
+        max_duration: float = 100.0,
+        growth_factor: float = 1.1,
+    ) -> None:
+        """
+        :param float min_duration: upper bound of the first bucket in seconds
+        :param float max_duration: durations above are counted in the last bucket
+        :param float growth_factor: ratio of the bounds of neighbouring buckets
+        """
+        if min_duration <= 0 or max_duration <= min_duration or growth_factor <= 1:
+            raise ValueError("Incorrect bounds of the histogram buckets")
+        bounds = [min_duration]
+        while bounds[-1] < max_duration:
+            bounds.append(bounds[-1] * growth_factor)
+        self._bounds = bounds
+        self._histograms: dict[tuple[str, str], _Histogram] = dict()
+        self._lock = threading.Lock()
+
+    def _add(self, event: HookEvent, is_error: bool) -> None:
+        duration = event.duration or 0.0
+        index = min(bisect_left(self._bounds, duration), len(self._bounds) - 1)
+        key = (event.kind, event.name)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(len(self._bounds))
+            histogram.counts[index] += 1
+            histogram.count += 1
+            histogram.total += duration
+            if duration > histogram.max:
+                histogram.max = duration
+            if is_error:
+                histogram.errors += 1
+
+    def on_end(self, event: HookEvent) -> None:
+        self._add(event, is_error=False)
+
+    def on_error(self, event: HookEvent) -> None:
+        self._add(event, is_error=True)
+
+    def percentile(self, kind: str, name: str, percent: float) -> float | None:
+        """
+        Estimates the percentile of the durations
+        :param str kind: kind of the object
+        :param str name: name of the object
+        :param float percent: percentile from 0 to 100
+        :return: upper bound of the bucket with the percentile in seconds
+         or None if there are no calls
+        :rtype: Optional[float]
+        """
+        with self._lock:
+            histogram = self._histograms.get((kind, name))
+            if histogram is None or not histogram.count:
+                return None
+            rank = max(1, histogram.count * percent / 100)
+            cumulative = 0
+            for index, count in enumerate(histogram.counts):
+                cumulative += count
+                if cumulative >= rank:
+                    return min(self._bounds[index], histogram.max)
+            return histogram.max  # pragma: no cover
+
+    def summary(self) -> dict[tuple[str, str], dict[str, float | int | None]]:
+        """
+        Returns statistics of all objects
+        :return: {(kind, name): {count, errors, mean, p50, p90, p99, max}}
+        :rtype: dict[tuple[str, str], dict[str, Union[float, int, None]]]
+        """
+        with self._lock:
+            keys = list(self._histograms)
+        result = dict()
+        for kind, name in keys:
+            histogram = self._histograms[(kind, name)]
+            result[(kind, name)] = dict(
+                count=histogram.count,
+                errors=histogram.errors,
+                mean=histogram.total / histogram.count,
+                p50=self.percentile(kind, name, 50),
+                p90=self.percentile(kind, name, 90),
+                p99=self.percentile(kind, name, 99),
+                max=histogram.max,
+            )
+        return result
+
+    def reset(self) -> None:
+        """
+        Removes all collected durations
+        :return: nothing
+        """
+        with self._lock:
+            self._histograms.clear()
@@ -2,4 +2,7 @@
 import `msg` module content
 """
 
+from .codec import MsgEnvelope, decode_envelope, encode_message
+from .log_repr import LazyMessageRepr
 from .message import BaseOrchServMsg
+from .registry import MSG_CLASS_REGISTRY, MsgClassRegistry
@@ -0,0 +1,244 @@
+"""
+Module with the binary envelope of messages
+
+The envelope has a fixed routing header with the source, flow, target
+ and command of the message, the header of the message and the body as json.
+Routing decisions are made by the routing header
+ without decoding of the body, the body is kept as `memoryview`
+ of the received buffer and validated only by `MsgEnvelope.decode`.
+
+Layout (big-endian)::
+
+    magic b"OSM" | version: uint8
+    source, flow, target, command: uint16 length | utf-8 bytes
+    header: uint32 length | json
+    body: json until the end of the buffer
+
+A length of all ones means None
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import TypeVar
+from weakref import WeakKeyDictionary
+
+import pydantic_core
+
+from orch_serv.exc import MsgCodecError
+
+from .message import BaseOrchServMsg
+
+MAGIC = b"OSM"
+VERSION = 1
+
+_PREFIX = struct.Struct("!3sB")
+_FIELD_LENGTH = struct.Struct("!H")
+_HEADER_LENGTH = struct.Struct("!I")
+_NONE_FIELD = 0xFFFF
+_NONE_HEADER = 0xFFFFFFFF
+
+MsgType = TypeVar("MsgType", bound=BaseOrchServMsg)
+# fields of the message encoded to the envelope
+_ENCODED_FIELDS = frozenset(("body", "header"))
+# names of the fields of the message classes which are not encoded
+_NOT_ENCODED_FIELDS: WeakKeyDictionary[type, tuple[str, ...]] = WeakKeyDictionary()
+
+
+def _get_routing_value(message: BaseOrchServMsg, name: str) -> str | None:
+    try:
+        return getattr(message, name)()
+    except NotImplementedError:
+        return None
+
+
+def _get_not_encoded_fields(message: BaseOrchServMsg) -> tuple[str, ...]:
+    message_class = type(message)
+    names = _NOT_ENCODED_FIELDS.get(message_class)
+    if names is None:
+        names = _NOT_ENCODED_FIELDS[message_class] = tuple(
+            sorted(message_class.model_fields.keys() - _ENCODED_FIELDS)
+        )
+    if message.__pydantic_extra__:
+        return names + tuple(sorted(message.__pydantic_extra__))
+    return names
+
+
+def _pack_field(value: str | None) -> bytes:
+    if value is None:
+        return _FIELD_LENGTH.pack(_NONE_FIELD)
+    data = value.encode()
+    if len(data) >= _NONE_FIELD:
+        raise MsgCodecError(f"Routing field is too long: {len(data)} bytes")
+    return _FIELD_LENGTH.pack(len(data)) + data
+
+
+def _pack(
+    routing: tuple[str | None, str | None, str | None, str | None],
+    header: bytes | memoryview | None,
+    body: bytes | memoryview,
+) -> bytes:
+    parts: list[bytes | memoryview] = [_PREFIX.pack(MAGIC, VERSION)]
+    parts.extend(_pack_field(value) for value in routing)
+    if header is None:
+        parts.append(_HEADER_LENGTH.pack(_NONE_HEADER))
+    else:
+        parts.append(_HEADER_LENGTH.pack(len(header)))
+        parts.append(header)
+    parts.append(body)
+    return b"".join(parts)
+
+
+def encode_message(message: BaseOrchServMsg) -> bytes:
+    """
+    Encodes the message to the binary envelope.
+    Routing fields are taken from `get_source`, `get_flow`, `get_target`
+     and `get_command`, None if the method is not implemented.
+    Only the header and the body are encoded,
+     so messages with other fields are not supported
+    :param BaseOrchServMsg message: message to encode
+    :return: envelope
+    :rtype: bytes
+    :raise MsgCodecError: if a routing field is longer than 65534 bytes
+     or the message has fields except the header and the body
+    """
+    not_encoded = _get_not_encoded_fields(message)
+    if not_encoded:
+        raise MsgCodecError(
+            f"Message `{type(message).__name__}` has fields {list(not_encoded)}"
+            f" which are not encoded, only `header` and `body` are encoded"
+        )
+    routing = (
+        _get_routing_value(message, "get_source"),
+        _get_routing_value(message, "get_flow"),
+        _get_routing_value(message, "get_target"),
+        _get_routing_value(message, "get_command"),
+    )
+    header = None if message.header is None else pydantic_core.to_json(message.header)
+    return _pack(routing, header, pydantic_core.to_json(message.body))
+
+
+class MsgEnvelope:
+    """
+    Decoded routing header of the binary envelope,
+     the header and the body of the message are not decoded.
+    The envelope has the getters of the routing methods of `BaseOrchServMsg`.
+    The routing header is read-only, it mirrors the header of the message,
+     to change the routing decode the message and encode it again
+    :example:
+    >>> envelope = decode_envelope(data)
+    >>> if envelope.get_command() == "my_command":
+    >>>     message = envelope.decode(MyMessage)
+    """
+
+    __slots__ = ("_source", "_flow", "_target", "_command", "header", "body")
+
+    def __init__(
+        self,
+        source: str | None,
+        flow: str | None,
+        target: str | None,
+        command: str | None,
+        header: memoryview | None,
+        body: memoryview,
+    ) -> None:
+        """
+        :param source: source of the message
+        :param flow: flow of the message
+        :param target: target of the message
+        :param command: command of the message
+        :param header: json of the header of the message
+        :type header: Optional[memoryview]
+        :param memoryview body: json of the body of the message
+        """
+        self._source = source
+        self._flow = flow
+        self._target = target
+        self._command = command
+        self.header = header
+        self.body = body
+
+    def get_source(self) -> str | None:
+        return self._source
+
+    def get_flow(self) -> str | None:
+        return self._flow
+
+    def get_target(self) -> str | None:
+        return self._target
+
+    def get_command(self) -> str | None:
+        return self._command
+
+    def decode(self, message_class: type[MsgType], is_lazy: bool = False) -> MsgType:
+        """
+        Validates the header and the body of the message
+        :param message_class: class of the message
+        :param bool is_lazy: validate the body on the first access,
+         see `BaseOrchServMsg.model_validate_lazy`
+        :return: message
+        """
+        if is_lazy:
+            data = dict(body=self.body)
+            if self.header is not None:
+                data["header"] = pydantic_core.from_json(bytes(self.header))
+            return message_class.model_validate_lazy(data)  # type: ignore
+        parts: list[bytes | memoryview] = [b'{"body":', self.body]
+        if self.header is not None:
+            parts.extend((b',"header":', self.header))
+        parts.append(b"}")
+        return message_class.model_validate_json(b"".join(parts))
+
+    def to_bytes(self) -> bytes:
+        """
+        Encodes the envelope, e.g. to forward it,
+         the routing header, the header and the body are copied without decoding
+        :return: envelope
+        :rtype: bytes
+        """
+        return _pack(
+            (self._source, self._flow, self._target, self._command),
+            self.header,
+            self.body,
+        )
+
+
+def decode_envelope(data: bytes | bytearray | memoryview) -> MsgEnvelope:
+    """
+    Decodes the routing header of the binary envelope,
+     the header and the body reference the buffer without copying
+    :param data: envelope
+    :type data: Union[bytes, bytearray, memoryview]
+    :return: envelope
+    :rtype: MsgEnvelope
+    :raise MsgCodecError: if the data is not a valid envelope
+    """
+    view = memoryview(data)
+    try:
+        magic, version = _PREFIX.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise MsgCodecError(
+                f"Unsupported envelope: magic {magic!r}, version {version}"
+            )
+        offset = _PREFIX.size
+        routing: list[str | None] = list()
+        for _ in range(4):
+            (length,) = _FIELD_LENGTH.unpack_from(view, offset)
+            offset += _FIELD_LENGTH.size
+            if length == _NONE_FIELD:
+                routing.append(None)
+                continue
+            routing.append(str(view[offset : offset + length], "utf-8"))
+            offset += length
+        (length,) = _HEADER_LENGTH.unpack_from(view, offset)
+        offset += _HEADER_LENGTH.size
+        header: memoryview | None = None
+        if length != _NONE_HEADER:
+            header = view[offset : offset + length]
+            offset += length
+    except (struct.error, UnicodeDecodeError) as exc:
+        raise MsgCodecError(f"Invalid envelope: {exc}") from exc
+    if offset > len(view):
+        raise MsgCodecError("Invalid envelope: data is truncated")
+    source, flow, target, command = routing
+    return MsgEnvelope(source, flow, target, command, header=header, body=view[offset:])
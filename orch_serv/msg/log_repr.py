@@ -0,0 +1,82 @@
+"""Module with lazy representation of messages for logging"""
+
+from __future__ import annotations
+
+import reprlib
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class _BoundedRepr(reprlib.Repr):
+    """
+    Repr with limits for nested pydantic models,
+     containers and strings of the message
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.maxlevel = 4
+        self.maxstring = 80
+        self.maxother = 80
+        self.maxlist = self.maxtuple = self.maxset = 10
+        self.maxdict = 10
+
+    def repr1(self, x: Any, level: int) -> str:
+        if isinstance(x, BaseModel):
+            name = type(x).__name__
+            if level <= 0:
+                return f"{name}(...)"
+            fields = list(x.__dict__.items())
+            pieces = [
+                f"{key}={self.repr1(value, level - 1)}"
+                for key, value in fields[: self.maxdict]
+            ]
+            if len(fields) > self.maxdict:
+                pieces.append("...")
+            return f"{name}({', '.join(pieces)})"
+        return super().repr1(x, level)
+
+
+_bounded_repr = _BoundedRepr()
+
+
+class LazyMessageRepr:
+    """
+    Lazy representation of the message for the logger.
+    The message is rendered only if the log record is formatted,
+     so the disabled log levels do not serialize the message
+    :attr message: message to render
+    :attr max_length: max length of the representation,
+     if set the message is rendered with limits for nested values
+     and the full body is never rendered
+    :attr is_dump: render the message as `model_dump(exclude_unset=True)`
+     if `max_length` is not set
+    """
+
+    __slots__ = ("message", "max_length", "is_dump")
+
+    def __init__(
+        self, message: Any, max_length: int | None = None, is_dump: bool = False
+    ):
+        """
+        :param message: message to render
+        :param max_length: max length of the representation
+        :type max_length: Optional[int]
+        :param bool is_dump: render the dump of the message
+        """
+        self.message = message
+        self.max_length = max_length
+        self.is_dump = is_dump
+
+    def __str__(self) -> str:
+        if self.max_length is None:
+            if self.is_dump and isinstance(self.message, BaseModel):
+                return str(self.message.model_dump(exclude_unset=True))
+            return str(self.message)
+        value = _bounded_repr.repr(self.message)
+        if len(value) > self.max_length:
+            value = f"{value[: self.max_length]}..."
+        return value
+
+    __repr__ = __str__
@@ -2,15 +2,91 @@
 
 # pylint: disable=too-few-public-methods,no-name-in-module
 
-from typing import Generic, Optional, TypeVar
+from collections.abc import Mapping
+from copy import deepcopy
+from enum import Enum
+from typing import Any, Generic, Optional, TypeVar
+from weakref import WeakKeyDictionary
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SerializerFunctionWrapHandler, model_serializer
+import pydantic_core
+
+from .registry import MSG_CLASS_REGISTRY
 
 # from pydantic.generics import GenericModel
 
 SubPydanticBodyModel = TypeVar("SubPydanticBodyModel", bound=BaseModel)
 SubPydanticHeaderModel = TypeVar("SubPydanticHeaderModel", bound=BaseModel)
 
+_IMMUTABLE_TYPES = frozenset(
+    {str, bytes, int, float, bool, complex, type(None), frozenset}
+)
+# key of the not validated body in the private attributes of the message
+_LAZY_BODY = "_orch_serv_lazy_body"
+_JSON_TYPES = (str, bytes, bytearray, memoryview)
+# names of all fields and of the required fields of the message classes
+_FIELD_NAMES: "WeakKeyDictionary[type, tuple[frozenset[str], frozenset[str]]]" = (
+    WeakKeyDictionary()
+)
+
+
+def _get_field_names(
+    model_class: type[BaseModel],
+) -> tuple[frozenset[str], frozenset[str]]:
+    """
+    :param model_class: class of the message
+    :return: names of all fields and names of the required fields
+    """
+    names = _FIELD_NAMES.get(model_class)
+    if names is None:
+        fields = model_class.model_fields
+        names = _FIELD_NAMES[model_class] = (
+            frozenset(fields),
+            frozenset(name for name, field in fields.items() if field.is_required()),
+        )
+    return names
+
+
+def _copy_values(values: dict[str, Any] | None) -> None:
+    """
+    Replaces the mutable values of the dict by their structural copies
+    :param values: values of the copied model
+    :return: nothing
+    """
+    if not values:
+        return
+    for name, value in values.items():
+        if type(value) not in _IMMUTABLE_TYPES:
+            values[name] = _structural_copy(value)
+
+
+def _structural_copy(value: Any) -> Any:
+    """
+    Copies models and containers, immutable values are shared with the original
+    :param value: value to copy
+    :return: copy of the value
+    """
+    type_value = type(value)
+    if type_value in _IMMUTABLE_TYPES:
+        return value
+    if isinstance(value, BaseModel):
+        copy_value = value.__copy__()
+        # `__copy__` shares the values of the fields, extra fields
+        #  and private attributes with the original
+        _copy_values(copy_value.__dict__)
+        _copy_values(copy_value.__pydantic_extra__)
+        _copy_values(copy_value.__pydantic_private__)
+        return copy_value
+    if type_value is list:
+        return [_structural_copy(item) for item in value]
+    if type_value is dict:
+        return {key: _structural_copy(item) for key, item in value.items()}
+    if type_value is tuple:
+        return tuple(_structural_copy(item) for item in value)
+    if isinstance(value, Enum):
+        return value
+    return deepcopy(value)
+
 
 class BaseOrchServMsg(
     BaseModel, Generic[SubPydanticBodyModel, SubPydanticHeaderModel]
@@ -55,6 +131,161 @@ class BaseOrchServMsg(
         None, description="Optional message header " "with the structure you need"
     )
 
+    @classmethod
+    def parametrize(
+        cls, body: type[BaseModel], header: type[BaseModel] = BaseModel
+    ) -> type["BaseOrchServMsg"]:
+        """
+        Returns the parametrised message class `cls[body, header]`
+         from the bounded registry of the classes,
+         use it instead of `cls[body, header]` for dynamically created models
+         so the class and its schema are built once
+         and unused classes can be garbage collected
+        :param body: model of the body
+        :param header: model of the header
+        :return: parametrised message class
+        :example:
+        >>> TenantMsg = BaseOrchServMsg.parametrize(TenantBody, Header)
+        >>> TenantMsg(body=body, header=header)
+        """
+        return MSG_CLASS_REGISTRY.get(cls, body, header)
+
+    @classmethod
+    def model_validate_lazy(
+        cls, obj: Mapping[str, Any] | str | bytes | bytearray
+    ) -> "BaseOrchServMsg":
+        """
+        Validates the message without the body,
+         the body is validated on the first access to `body`
+         and the validated body is kept in the message.
+        Routing by the header does not validate the body,
+         serialization, also as a field of another model,
+         iteration and comparison validate it.
+        The body can be a dict, a model or json,
+         e.g. `memoryview` of the binary envelope,
+         `memoryview` and `bytearray` are copied to `bytes`,
+         so the message can be copied and pickled.
+        If the data has unknown keys or misses required fields
+         or the class has model validators the message is validated completely
+        :param obj: data of the message or json of the message
+        :type obj: Union[Mapping[str, Any], str, bytes, bytearray]
+        :return: message
+        :rtype: BaseOrchServMsg
+        :raise ValidationError: if the data of the message without the body
+         is not valid
+        :example:
+        >>> message = MyMessage.model_validate_lazy(data)
+        >>> message.get_flow()  # the body is not validated
+        >>> message.body  # the body is validated once
+        """
+        if isinstance(obj, _JSON_TYPES):
+            obj = pydantic_core.from_json(obj)
+        names, required_names = _get_field_names(cls)
+        if (
+            not isinstance(obj, Mapping)
+            or obj.get("body") is None
+            or not obj.keys() <= names
+            or not required_names <= obj.keys()
+            # model validators may read the body
+            or cls.__pydantic_decorators__.model_validators
+        ):
+            return cls.model_validate(obj)
+        message = cls.model_construct()
+        validator = cls.__pydantic_validator__
+        for name, value in obj.items():
+            if name != "body":
+                validator.validate_assignment(message, name, value)
+        message.__pydantic_fields_set__.add("body")
+        private = message.__pydantic_private__
+        if private is None:
+            private = dict()
+            object.__setattr__(message, "__pydantic_private__", private)
+        body = obj["body"]
+        if isinstance(body, (memoryview, bytearray)):
+            body = bytes(body)
+        private[_LAZY_BODY] = body
+        return message
+
+    @property
+    def is_body_validated(self) -> bool:
+        """
+        :return: False if the body of the lazily validated message
+         is not validated yet
+        """
+        return "body" in self.__dict__
+
+    def __getattr__(self, item: str) -> Any:
+        if item == "body":
+            private = self.__pydantic_private__
+            if private is not None and _LAZY_BODY in private:
+                return self._validate_lazy_body(private)
+        return super().__getattr__(item)  # type: ignore
+
+    def _ensure_body(self) -> None:
+        private = self.__pydantic_private__
+        if private is not None and _LAZY_BODY in private:
+            self._validate_lazy_body(private)
+
+    def _validate_lazy_body(self, private: dict[str, Any]) -> Any:
+        body = private[_LAZY_BODY]
+        # buffers are copied to bytes by `model_validate_lazy`
+        if isinstance(body, (str, bytes)):
+            body = pydantic_core.from_json(body)
+        self.__pydantic_validator__.validate_assignment(self, "body", body)
+        self._drop_lazy_body(private)
+        return self.__dict__["body"]
+
+    def _drop_lazy_body(self, private: dict[str, Any]) -> None:
+        # restores the order of the fields for serialization
+        values = self.__dict__
+        ordered = {
+            name: values[name] for name in type(self).model_fields if name in values
+        }
+        values.clear()
+        values.update(ordered)
+        del private[_LAZY_BODY]
+        if not private:
+            object.__setattr__(self, "__pydantic_private__", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "body":
+            # the assigned body replaces the body which is not validated yet
+            private = self.__pydantic_private__
+            if private is not None and _LAZY_BODY in private:
+                self._drop_lazy_body(private)
+
+    @model_serializer(mode="wrap")
+    def _serialize_with_body(self, handler: SerializerFunctionWrapHandler) -> Any:
+        # the serializer is called for the nested messages too
+        self._ensure_body()
+        return handler(self)
+
+    def __iter__(self) -> Any:
+        self._ensure_body()
+        return super().__iter__()
+
+    def __repr_args__(self) -> Any:
+        self._ensure_body()
+        return super().__repr_args__()
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, BaseOrchServMsg):
+            self._ensure_body()
+            other._ensure_body()
+        return super().__eq__(other)
+
+    def snapshot(self) -> "BaseOrchServMsg":
+        """
+        Returns a snapshot of the message which is not affected by changes
+         of the original message.
+        Unlike `deepcopy` only models and containers are copied,
+         immutable values are shared between the message and the snapshot
+        :return: snapshot of the message
+        :rtype: BaseOrchServMsg
+        """
+        return _structural_copy(self)  # type: ignore
+
     def get_source(self) -> str | None:
         """
         ### For orchestrator ###
@@ -0,0 +1,122 @@
+"""
+Module with the registry of parametrised message classes
+
+The registry bounds the number of classes built by `BaseOrchServMsg[Body, Header]`
+ for dynamically created models, the evicted classes are garbage collected.
+The classes are built in `MsgClassRegistry.get`, so pydantic resolves
+ forward references of the generic message class against the namespace
+ of this module instead of the module of the caller
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import threading
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .message import BaseOrchServMsg
+
+DEFAULT_MSG_CLASS_REGISTRY_MAXSIZE = 1024
+
+
+class MsgClassRegistry:
+    """
+    Bounded registry of parametrised message classes
+     `BaseOrchServMsg[Body, Header]` with LRU eviction.
+    Each parametrisation builds a new pydantic class with its schema,
+     the registry returns the built class for the same body and header models.
+    Pydantic keeps parametrised classes weakly,
+     so the evicted classes which are not used are garbage collected
+    :example:
+    >>> registry = MsgClassRegistry(maxsize=10_000)
+    >>> TenantMsg = registry.get(BaseOrchServMsg, TenantBody, Header)
+    >>> registry.info()  # {"hits": 0, "misses": 1, "size": 1, "maxsize": 10000}
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MSG_CLASS_REGISTRY_MAXSIZE) -> None:
+        """
+        :param int maxsize: max number of the classes,
+         the least recently used classes are evicted
+        :raise ValueError: if maxsize less than 1
+        """
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be greater than 0")
+        self._maxsize = maxsize
+        self._data: OrderedDict[tuple[type, ...], type[BaseOrchServMsg]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def get(
+        self,
+        msg_class: type[BaseOrchServMsg],
+        body: type[BaseModel],
+        header: type[BaseModel] = BaseModel,
+    ) -> type[BaseOrchServMsg]:
+        """
+        Returns the parametrised message class, the class is built on the first call.
+        Forward references of `msg_class` are resolved against the namespace
+         of this module, rebuild `msg_class` with `model_rebuild`
+         in its module before if it has forward references
+        :param msg_class: generic message class, e.g. `BaseOrchServMsg`
+        :param body: model of the body
+        :param header: model of the header
+        :return: parametrised message class `msg_class[body, header]`
+        """
+        key = (msg_class, body, header)
+        with self._lock:
+            parametrised = self._data.get(key)
+            if parametrised is not None:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return parametrised
+            self._misses += 1
+        # the class is built without the lock,
+        # a concurrent build of the same class returns the class cached by pydantic
+        parametrised = msg_class[body, header]  # type: ignore
+        with self._lock:
+            self._data[key] = parametrised
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+        return parametrised
+
+    def info(self) -> dict[str, int]:
+        """
+        :return: counters of the registry for monitoring
+        """
+        with self._lock:
+            return dict(
+                hits=self._hits,
+                misses=self._misses,
+                size=len(self._data),
+                maxsize=self._maxsize,
+            )
+
+    def clear(self) -> None:
+        """
+        Removes all classes and resets the counters
+        :return: nothing
+        """
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+# registry of `BaseOrchServMsg.parametrize`
+MSG_CLASS_REGISTRY = MsgClassRegistry()
@@ -3,4 +3,5 @@ import `block` module content
 """
 
 from .async_block import AsyncBlock
+from .executor import InlineExecutor
 from .sync_block import SyncBlock
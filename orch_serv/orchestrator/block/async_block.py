@@ -5,11 +5,11 @@ Module with base block class for user async blocks
 # pylint: disable=not-callable, inconsistent-mro
 from abc import ABC
 from collections.abc import Awaitable, Callable
-from copy import deepcopy
 from logging import Logger
 import types
 from typing import Optional
 
+from orch_serv import hooks
 from orch_serv.exc import FlowException
 from orch_serv.msg import BaseOrchServMsg
 
@@ -49,6 +49,17 @@ class AsyncBlock(AsyncBaseBlock, ABC):
         """
         return True
 
+    @property
+    def is_transport_boundary(self) -> bool:
+        """
+        The block hands the message over to a transport (e.g. sends it to
+         a remote service), so in run-to-completion mode the flow
+         stops after this block and waits for the message to come back
+        :return: true if the flow should not continue after this block in-process
+        :rtype: bool
+        """
+        return False
+
     @property
     def pre_handler_function(
         self,
@@ -192,7 +203,29 @@ class AsyncBlock(AsyncBaseBlock, ABC):
 
     async def _process_logic(
         self, block: AsyncBaseBlock, message: BaseOrchServMsg
-    ) -> None:
+    ) -> BaseOrchServMsg | None:
+        """
+        Processes the message by the block,
+         the registered hooks are called around the processing
+        :param block: block for processing
+        :type block: AsyncBaseBlock
+        :param message: message for processing
+        :type message: BaseOrchServMsg
+        :return: message returned by the block `process`,
+         the message passed to the `process` if it returned nothing
+         and `is_execute_after_nullable_process_msg` is set,
+         otherwise None
+        :rtype: Optional[BaseOrchServMsg]
+        """
+        if hooks.registered_hooks:
+            return await hooks.async_call_with_hooks(
+                hooks.KIND_BLOCK, block.name_block, self._process_block, block, message
+            )
+        return await self._process_block(block, message)
+
+    async def _process_block(
+        self, block: AsyncBaseBlock, message: BaseOrchServMsg
+    ) -> BaseOrchServMsg | None:
         """
         Auxiliary function in which the logic of working with additional
          functions is hidden
@@ -200,20 +233,31 @@ class AsyncBlock(AsyncBaseBlock, ABC):
         :type block: AsyncBaseBlock
         :param message: message for processing
         :type message: BaseOrchServMsg
-        :return: nothing
+        :return: message returned by the block `process`,
+         the message passed to the `process` if it returned nothing
+         and `is_execute_after_nullable_process_msg` is set,
+         otherwise None
+        :rtype: Optional[BaseOrchServMsg]
         """
         if block.pre_handler_function:
             message = await block.pre_handler_function(message)  # type: ignore
         if not message:
-            return
+            return None
         message.set_source(block.name_block)
-        copy_msg = deepcopy(message)
+        copy_msg = None
+        if block.post_handler_function and self.is_execute_after_nullable_process_msg:
+            # the snapshot is needed only if the post handler
+            # can be called with the message sent to the `process`
+            copy_msg = message.snapshot()
         new_msg = await block.process(message)
         if block.post_handler_function:
             if new_msg:
                 await block.post_handler_function(new_msg)
-            elif self.is_execute_after_nullable_process_msg:
+            elif copy_msg is not None:
                 await block.post_handler_function(copy_msg)
+        if new_msg:
+            return new_msg
+        return message if self.is_execute_after_nullable_process_msg else None
 
     async def handle(self, message: BaseOrchServMsg) -> None:
         """
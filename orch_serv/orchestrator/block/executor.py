@@ -0,0 +1,91 @@
+"""
+Module with helpers to execute the logic of sync blocks in executors
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from orch_serv.msg import BaseOrchServMsg
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .sync_block import SyncBlock
+
+# blocks created in the worker process, one instance for each block class
+_worker_blocks: dict[type, SyncBlock] = dict()
+
+
+class InlineExecutor(Executor):
+    """
+    Executor that runs the function in the calling thread.
+    Used to force inline execution of the block
+     if the orchestrator has another executor
+    """
+
+    def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> Future:
+        """
+        Executes the function and returns a completed future
+        :param fn: function to execute
+        :return: future with result or exception of the function
+        :rtype: Future
+        """
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def _process_in_worker(
+    block_class: type[SyncBlock], message_class: type[BaseOrchServMsg], payload: str
+) -> tuple[type[BaseOrchServMsg], str] | None:
+    """
+    Runs `process` of the block in the worker process
+    :param block_class: class of the block to process message
+    :param message_class: class of the message
+    :param payload: message serialized to json
+    :return: class of the returned message and the message serialized to json
+    """
+    block = _worker_blocks.get(block_class)
+    if block is None:
+        block = _worker_blocks[block_class] = block_class()
+    result = block.process(message_class.model_validate_json(payload))
+    if result is None:
+        return None
+    return type(result), result.model_dump_json()
+
+
+def execute_process(
+    executor: Executor | None, block: SyncBlock, message: BaseOrchServMsg
+) -> BaseOrchServMsg | None:
+    """
+    Executes `process` of the block in the executor and waits for the result.
+    For ProcessPoolExecutor the message is serialized with its pydantic model,
+     and the block is created in the worker process from the block class,
+     so changes of the message made in the `process`
+     are available only through the returned message
+    :param executor: executor, if None `process` is called inline
+    :type executor: Optional[Executor]
+    :param block: block to process message
+    :type block: SyncBlock
+    :param message: message to process
+    :type message: BaseOrchServMsg
+    :return: result of the block `process`
+    :rtype: Optional[BaseOrchServMsg]
+    """
+    if executor is None:
+        return block.process(message)
+    if isinstance(executor, ProcessPoolExecutor):
+        result = executor.submit(
+            _process_in_worker,
+            type(block),
+            type(message),
+            message.model_dump_json(),
+        ).result()
+        if result is None:
+            return None
+        result_class, result_payload = result
+        return result_class.model_validate_json(result_payload)
+    return executor.submit(block.process, message).result()
@@ -7,15 +7,17 @@ from __future__ import annotations
 
 from abc import ABC
 from collections.abc import Callable
-from copy import deepcopy
+from concurrent.futures import Executor
 from logging import Logger
 import types
 from typing import Optional
 
+from orch_serv import hooks
 from orch_serv.exc import FlowException
 from orch_serv.msg import BaseOrchServMsg
 
 from .base_block import SyncBaseBlock
+from .executor import execute_process
 
 
 class SyncBlock(SyncBaseBlock, ABC):
@@ -32,9 +34,14 @@ class SyncBlock(SyncBaseBlock, ABC):
     :type _post_handler_function:  Optional[
         Callable[[BaseOrchServMsg], Optional[BaseOrchServMsg]]
     ]
+    :attr executor: executor in which the `process` of the block is executed,
+     if None the executor of the orchestrator is used,
+     if the orchestrator has no executor `process` is called inline
+    :type executor: Optional[Executor]
     """
 
     _next_handler: SyncBaseBlock = None  # type: ignore
+    executor: Executor | None = None
     _pre_handler_function: (
         Callable[[BaseOrchServMsg], BaseOrchServMsg | None] | None
     ) = None
@@ -51,6 +58,17 @@ class SyncBlock(SyncBaseBlock, ABC):
         """
         return True
 
+    @property
+    def is_transport_boundary(self) -> bool:
+        """
+        The block hands the message over to a transport (e.g. sends it to
+         a remote service), so in run-to-completion mode the flow
+         stops after this block and waits for the message to come back
+        :return: true if the flow should not continue after this block in-process
+        :rtype: bool
+        """
+        return False
+
     @property
     def pre_handler_function(
         self,
@@ -183,7 +201,41 @@ class SyncBlock(SyncBaseBlock, ABC):
         """
         return self._next_handler
 
-    def _process_logic(self, block: SyncBaseBlock, message: BaseOrchServMsg) -> None:
+    def run_process(self, message: BaseOrchServMsg) -> BaseOrchServMsg | None:
+        """
+        Runs `process` of the block in the executor of the block
+        :param message: message to process
+        :type message: BaseOrchServMsg
+        :return: result of the `process`
+        :rtype: Optional[BaseOrchServMsg]
+        """
+        return execute_process(self.executor, self, message)
+
+    def _process_logic(
+        self, block: SyncBaseBlock, message: BaseOrchServMsg
+    ) -> BaseOrchServMsg | None:
+        """
+        Processes the message by the block,
+         the registered hooks are called around the processing
+        :param block: block for processing
+        :type block: SyncBaseBlock
+        :param message: message for processing
+        :type message: BaseOrchServMsg
+        :return: message returned by the block `process`,
+         the message passed to the `process` if it returned nothing
+         and `is_execute_after_nullable_process_msg` is set,
+         otherwise None
+        :rtype: Optional[BaseOrchServMsg]
+        """
+        if hooks.registered_hooks:
+            return hooks.call_with_hooks(
+                hooks.KIND_BLOCK, block.name_block, self._process_block, block, message
+            )
+        return self._process_block(block, message)
+
+    def _process_block(
+        self, block: SyncBaseBlock, message: BaseOrchServMsg
+    ) -> BaseOrchServMsg | None:
         """
         Auxiliary function in which the logic of working with additional
          functions is hidden
@@ -191,20 +243,31 @@ class SyncBlock(SyncBaseBlock, ABC):
         :type block: SyncBaseBlock
         :param message: message for processing
         :type message: BaseOrchServMsg
-        :return: nothing
+        :return: message returned by the block `process`,
+         the message passed to the `process` if it returned nothing
+         and `is_execute_after_nullable_process_msg` is set,
+         otherwise None
+        :rtype: Optional[BaseOrchServMsg]
         """
         if block.pre_handler_function:
             message = block.pre_handler_function(message)  # type: ignore
         if not message:
-            return
+            return None
         message.set_source(block.name_block)
-        copy_msg = deepcopy(message)
-        new_msg = block.process(message)
+        copy_msg = None
+        if block.post_handler_function and self.is_execute_after_nullable_process_msg:
+            # the snapshot is needed only if the post handler
+            # can be called with the message sent to the `process`
+            copy_msg = message.snapshot()
+        new_msg = block.run_process(message)  # type: ignore
         if block.post_handler_function:
             if new_msg:
                 block.post_handler_function(new_msg)
-            elif self.is_execute_after_nullable_process_msg:
+            elif copy_msg is not None:
                 block.post_handler_function(copy_msg)
+        if new_msg:
+            return new_msg
+        return message if self.is_execute_after_nullable_process_msg else None
 
     def handle(self, message: BaseOrchServMsg) -> None:
         """
@@ -13,6 +13,7 @@ from typing import Any, Union
 from orch_serv.exc import (
     FlowBlockException,
     FlowBuilderException,
+    FlowException,
     NotUniqueBlockInFlowError,
     WorkTypeMismatchException,
 )
@@ -167,11 +168,21 @@ class Flow:
     :attr is_contains_duplicat_blocks: whether the flow contains repeating blocks
      needed to avoid looping
     :type is_contains_duplicat_blocks: bool
+    :attr is_run_to_completion: whether the message is driven through all
+     consecutive blocks in one call and not only through one block.
+     The flow stops after the last block, if a pre handler did not return
+     a message or after a block marked as `is_transport_boundary`
+    :type is_run_to_completion: bool
+    :attr _dispatch_table: compiled flow chain - the name of the block that
+     set the source of the message mapped to the next block to be executed
+    :type _dispatch_table: dict[str, Union[SyncBaseBlock, AsyncBaseBlock, None]]
 
     """
 
     flow_chain: SyncBaseBlock | AsyncBaseBlock | None = None
     is_contains_duplicat_blocks: bool = False
+    is_run_to_completion: bool = False
+    _dispatch_table: dict[str, SyncBaseBlock | AsyncBaseBlock | None]
 
     @property
     def name_flow(self) -> str:
@@ -231,13 +242,14 @@ class Flow:
                 f" and not {type(self.steps_flow)}"
             )
         self._validate_data()
+        self._dispatch_table = self._compile_dispatch_table()
 
     def _validate_data(self) -> None:
         """
         flow validation function after initialization
         """
         current = self.flow_chain
-        list_exists_blocks = list()
+        list_exists_blocks = set()
         while current:
             if not isinstance(current, self._base_class_for_blocks):
                 raise WorkTypeMismatchException(
@@ -249,9 +261,56 @@ class Flow:
                 raise NotUniqueBlockInFlowError(
                     block_name=current.name_block, flow_name=self.name_flow
                 )
-            list_exists_blocks.append(current.name_block)
+            list_exists_blocks.add(current.name_block)
             current = current.get_next()
 
+    def _compile_dispatch_table(
+        self,
+    ) -> dict[str, SyncBaseBlock | AsyncBaseBlock | None]:
+        """
+        Compiles the flow chain into a table `source -> next block`
+        so that the message is resumed in constant time
+         regardless of the length of the flow
+        :return: dispatch table, the last block is mapped to None
+        :rtype: dict[str, Union[SyncBaseBlock, AsyncBaseBlock, None]]
+        """
+        dispatch_table: dict[str, SyncBaseBlock | AsyncBaseBlock | None] = dict()
+        current = self.flow_chain
+        while current:
+            next_block = current.get_next()
+            dispatch_table[current.name_block] = next_block
+            current = next_block
+        return dispatch_table
+
+    def _get_block_to_process(self, source: str | None) -> Any:
+        """
+        Returns the block which should process a message came from `source`
+        :param source: source of the message
+        :type source: Optional[str]
+        :raise FlowException: if the source is not a block of the flow
+         or the source is the last block of the flow
+        :return: block to process the message
+        :rtype: Union[SyncBaseBlock, AsyncBaseBlock]
+        """
+        if not source:
+            return self.flow_chain
+        block = self._dispatch_table.get(source)
+        if block is None:
+            raise FlowException(
+                f"Not found block after source `{source}` in flow `{self.name_flow}`"
+            )
+        return block
+
+    def get_blocks(self) -> list[SyncBaseBlock | AsyncBaseBlock]:
+        """
+        Returns blocks of the flow in the order of execution
+        :return: blocks of the flow
+        :rtype: list[Union[SyncBaseBlock, AsyncBaseBlock]]
+        """
+        blocks = [self.flow_chain] if self.flow_chain else []
+        blocks.extend(block for block in self._dispatch_table.values() if block)
+        return blocks  # type: ignore
+
     def get_steps(self) -> str:
         """
         Print steps flow
@@ -19,11 +19,33 @@ class SyncFlow(Flow, ABC):
     _base_class_for_blocks: type = SyncBlock
     flow_chain: SyncBlock
 
-    def to_go_with_the_flow(self, message: BaseOrchServMsg) -> None:
+    def to_go_with_the_flow(
+        self, message: BaseOrchServMsg, is_run_to_completion: bool | None = None
+    ) -> None:
         """
-        Method that starts flow execution from the first block
+        Method that continues flow execution from the block
+         following the source of the message
+        (from the first block if the message has no source)
         :param message: message to process
         :type message: BaseOrchServMsg
+        :param is_run_to_completion: drive the message through all consecutive
+         in-process blocks, if None the value of the flow is used
+        :type is_run_to_completion: Optional[bool]
+        :raise FlowException: if no block is found for the message source
         :return: None
         """
-        self.flow_chain.handle(message)
+        if is_run_to_completion is None:
+            is_run_to_completion = self.is_run_to_completion
+        block = self._get_block_to_process(message.get_source())
+        while block:
+            # the next block gets the message returned by the `process`,
+            # the post handler of the block is called on each step
+            processed_message = block._process_logic(block=block, message=message)
+            if (
+                not is_run_to_completion
+                or processed_message is None
+                or block.is_transport_boundary
+            ):
+                return
+            message = processed_message
+            block = self._dispatch_table[block.name_block]
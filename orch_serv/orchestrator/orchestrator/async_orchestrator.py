@@ -2,15 +2,36 @@
 Module with async orchestrator
 """
 
-from typing import Optional
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from typing import Any, Optional
 
+from orch_serv import hooks
 from orch_serv.msg import BaseOrchServMsg
 from orch_serv.orchestrator.block import AsyncBlock
 from orch_serv.orchestrator.flow import AsyncFlow
+from orch_serv.settings import DEFAULT_MAX_CONCURRENCY
 
 from .sync_orchestrator import SyncOrchestrator
 
 
+async def _as_async_iterable(
+    messages: AsyncIterable[BaseOrchServMsg] | Iterable[BaseOrchServMsg],
+) -> AsyncIterator[BaseOrchServMsg]:
+    """
+    Helper to iterate over sync and async iterables in the same way
+    :param messages: messages to iterate
+    :return: async iterator over messages
+    """
+    if isinstance(messages, AsyncIterable):
+        async for message in messages:
+            yield message
+    else:
+        for message in messages:
+            yield message
+
+
 class AsyncOrchestrator(SyncOrchestrator):
     """
     AsyncOrchestrator
@@ -38,7 +59,9 @@ class AsyncOrchestrator(SyncOrchestrator):
         :rtype: Optional[BaseOrchServMsg]
         """
         is_return_message = is_force_return
-        self.logger.debug("Orchestrator. Started processing msg: %s", str(message))
+        self.logger.debug(
+            "Orchestrator. Started processing msg: %s", self._message_repr(message)
+        )
         if not isinstance(message, BaseOrchServMsg):
             raise TypeError(
                 "Incorrect type `message`."
@@ -48,8 +71,9 @@ class AsyncOrchestrator(SyncOrchestrator):
         if message.get_flow() or message.get_target():
             if message.get_target():
                 name_target = message.get_target()
-                target = self._targets.get(name_target)  # type: ignore
-                if not target and not self._default_block:
+                target = self._get_target(name_target)  # type: ignore
+                # the targets are checked to be `AsyncBlock` on initialization
+                if not isinstance(target, AsyncBlock):
                     is_return_message = True
                     self.logger.warning(
                         "Orchestrator. No suitable target was found to process "
@@ -59,28 +83,30 @@ class AsyncOrchestrator(SyncOrchestrator):
                         list(self._targets.keys()),
                     )
                 else:
-                    if not target:
-                        target = self._targets.get(self._default_block)
-                    if isinstance(target, type):
-                        target = target(logger=self.logger)
-                        self._targets[target.name_block] = target
                     try:
-                        if target:
-                            await target.process(message)  # type: ignore
+                        if hooks.registered_hooks:
+                            await hooks.async_call_with_hooks(
+                                hooks.KIND_BLOCK,
+                                target.name_block,
+                                target.process,
+                                message,
+                            )
+                        else:
+                            await target.process(message)
                     except Exception as exc:
                         is_return_message = True
                         self.logger.warning(
                             "Orchestrator. Error processing msg `%s` in target `%s`."
                             " Error: %s",
-                            str(message),
+                            self._message_repr(message),
                             name_target,
                             str(exc),
                             exc_info=True,
                         )
             else:
                 name_flow = message.get_flow()
-                flow = self._flows.get(name_flow)  # type: ignore
-                if not flow and not self._default_flow:
+                flow = self._get_flow(name_flow)  # type: ignore
+                if not flow:
                     is_return_message = True
                     self.logger.warning(
                         "Orchestrator. No suitable flow was found to process "
@@ -90,20 +116,16 @@ class AsyncOrchestrator(SyncOrchestrator):
                         list(self._flows.keys()),
                     )
                 else:
-                    if not flow:
-                        flow = self._flows.get(self._default_flow)
-                    if isinstance(flow, type):
-                        flow = flow(logger=self.logger)
-                        self._flows[flow.name_flow] = flow
                     try:
-                        if flow:
-                            await flow.to_go_with_the_flow(message)  # type: ignore
+                        await flow.to_go_with_the_flow(  # type: ignore
+                            message, is_run_to_completion=self._is_run_to_completion
+                        )
                     except Exception as exc:
                         is_return_message = True
                         self.logger.warning(
                             "Orchestrator. Error processing msg %s in flow %s."
                             " Error: %s",
-                            str(message),
+                            self._message_repr(message),
                             name_flow,
                             str(exc),
                             exc_info=True,
@@ -114,9 +136,98 @@ class AsyncOrchestrator(SyncOrchestrator):
                 "Orchestrator. Msg %s. "
                 "Does not contain information about the type of"
                 " processing and it was not processed",
-                str(message),
+                self._message_repr(message),
             )
-        self.logger.debug("Orchestrator. Finished processing msg: %s", str(message))
+        self.logger.debug(
+            "Orchestrator. Finished processing msg: %s", self._message_repr(message)
+        )
         if is_return_message:
             return message
         return None
+
+    async def handle_batch(
+        self,
+        messages: Iterable[BaseOrchServMsg],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        is_force_return: bool = False,
+    ) -> list[BaseOrchServMsg | BaseException | None]:
+        """
+        Processes a batch of messages concurrently.
+        Targets and flows of the messages are initialized once
+         before processing, an error of a message or of its route
+         is returned in place of the result of that message only
+        :param messages: messages to process
+        :type messages: Iterable[BaseOrchServMsg]
+        :param max_concurrency: maximum number of messages processed
+         at the same time
+        :type max_concurrency: int
+        :param is_force_return: always return messages
+        :type is_force_return: bool
+        :raise ValueError: if max_concurrency is less than 1
+        :return: results of `handle` in the order of the messages,
+         an exception is returned in place of the result
+         if it was raised while processing the message
+        :rtype: list[Union[BaseOrchServMsg, BaseException, None]]
+        """
+        if max_concurrency < 1:
+            raise ValueError("`max_concurrency` must be greater than 0")
+        messages = list(messages)
+        self._resolve_routes(messages)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def handle_message(message: BaseOrchServMsg) -> BaseOrchServMsg | None:
+            async with semaphore:
+                return await self.handle(message, is_force_return=is_force_return)
+
+        return await asyncio.gather(
+            *(handle_message(message) for message in messages),
+            return_exceptions=True,
+        )
+
+    async def handle_stream(
+        self,
+        messages: AsyncIterable[BaseOrchServMsg] | Iterable[BaseOrchServMsg],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        is_force_return: bool = False,
+    ) -> AsyncIterator[BaseOrchServMsg | BaseException | None]:
+        """
+        Processes a stream of messages concurrently
+         and yields results in the order of the messages.
+        No more than `max_concurrency` messages are taken from the stream
+         until the result of the oldest of them is yielded
+        :param messages: messages to process
+        :type messages: Union[AsyncIterable[BaseOrchServMsg],
+         Iterable[BaseOrchServMsg]]
+        :param max_concurrency: maximum number of messages processed
+         at the same time
+        :type max_concurrency: int
+        :param is_force_return: always return messages
+        :type is_force_return: bool
+        :raise ValueError: if max_concurrency is less than 1
+        :return: results of `handle` in the order of the messages,
+         an exception is returned in place of the result
+         if it was raised while processing the message
+        :rtype: AsyncIterator[Union[BaseOrchServMsg, BaseException, None]]
+        """
+        if max_concurrency < 1:
+            raise ValueError("`max_concurrency` must be greater than 0")
+        pending: deque[asyncio.Task] = deque()
+
+        async def get_result(task: asyncio.Task) -> Any:
+            try:
+                return await task
+            except Exception as exc:
+                return exc
+
+        try:
+            async for message in _as_async_iterable(messages):
+                if len(pending) >= max_concurrency:
+                    yield await get_result(pending.popleft())
+                pending.append(
+                    asyncio.ensure_future(self.handle(message, is_force_return))
+                )
+            while pending:
+                yield await get_result(pending.popleft())
+        finally:
+            for task in pending:
+                task.cancel()
@@ -2,11 +2,15 @@
 Module with sync orchestrator
 """
 
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Executor, ThreadPoolExecutor
 import inspect
 from logging import Logger
-from types import ModuleType
+import threading
+from types import MappingProxyType, ModuleType
 from typing import Any, Optional, Union
 
+from orch_serv import hooks
 from orch_serv.exc import (
     NoDateException,
     NotFoundDefaultError,
@@ -14,7 +18,7 @@ from orch_serv.exc import (
     WorkTypeMismatchException,
     WrongTypeException,
 )
-from orch_serv.msg import BaseOrchServMsg
+from orch_serv.msg import BaseOrchServMsg, LazyMessageRepr
 from orch_serv.orchestrator.block import AsyncBlock, SyncBlock
 from orch_serv.orchestrator.flow import AsyncFlow, SyncFlow
 from orch_serv.settings import DEFAULT_LOGGER
@@ -29,9 +33,17 @@ class SyncOrchestrator:
     _base_class_for_target: type[SyncBlock | AsyncBlock] = SyncBlock
     _default_flow: str = None  # type: ignore
     _default_block: str = None  # type: ignore
+    _is_run_to_completion: bool | None = None
+    _executor: Executor | None = None
+    _log_message_max_length: int | None = None
 
-    _flows: dict[str, type[SyncFlow | AsyncFlow] | SyncFlow | AsyncFlow] = dict()
-    _targets: dict[str, type[SyncBlock | AsyncBlock] | SyncBlock | AsyncBlock] = dict()
+    # read-only registries, replaced as a whole when a flow or target is initialized
+    _flows: Mapping[str, type[SyncFlow | AsyncFlow] | SyncFlow | AsyncFlow] = (
+        MappingProxyType(dict())
+    )
+    _targets: Mapping[str, type[SyncBlock | AsyncBlock] | SyncBlock | AsyncBlock] = (
+        MappingProxyType(dict())
+    )
 
     @property
     def flows(self) -> ModuleType | list | None:
@@ -50,6 +62,10 @@ class SyncOrchestrator:
         blocks_to_ignore: list[str] | None = None,
         default_flow: str | None = None,
         default_block: str | None = None,
+        is_run_to_completion: bool | None = None,
+        executor: Executor | None = None,
+        preload: bool = False,
+        log_message_max_length: int | None = None,
     ):
         """
         init Orchestrator
@@ -68,44 +84,73 @@ class SyncOrchestrator:
          if a non-existing flow is specified
         :param str default_block: name of the block that will be called
          if a non-existing block is specified
+        :param is_run_to_completion: drive messages through all consecutive
+         in-process blocks of the flows in one call,
+         if None the value of each flow is used
+        :type is_run_to_completion: Optional[bool]
+        :param executor: executor in which the `process` of the sync blocks
+         is executed, blocks with their own executor keep it.
+         For ProcessPoolExecutor messages are serialized
+         with their pydantic models.
+         The orchestrator does not shut down the executor
+        :type executor: Optional[Executor]
+        :param preload: initialize all flows and targets
+         on init of the orchestrator instead of the first message
+        :type preload: bool
+        :param log_message_max_length: max length of the messages in the logs,
+         if None the messages are logged in full
+        :type log_message_max_length: Optional[int]
         """
         self.logger = logger or DEFAULT_LOGGER
+        self._is_run_to_completion = is_run_to_completion
+        self._executor = executor
+        self._log_message_max_length = log_message_max_length
+        self._flows = MappingProxyType(dict())
+        self._targets = MappingProxyType(dict())
         if flows_to_ignore is None:
             flows_to_ignore = list()
         if blocks_to_ignore is None:
             blocks_to_ignore = list()
 
         if flows:
-            self._flows = self._generate_data(  # type: ignore
-                data_to_process=flows,
-                type_to_compare=(SyncFlow, AsyncFlow),
-                attribute_to_get="name_flow",
-                names_to_ignore=flows_to_ignore,
-                type_data="flow",
+            self._flows = MappingProxyType(
+                self._generate_data(  # type: ignore
+                    data_to_process=flows,
+                    type_to_compare=(SyncFlow, AsyncFlow),
+                    attribute_to_get="name_flow",
+                    names_to_ignore=flows_to_ignore,
+                    type_data="flow",
+                )
             )
         elif self.flows:
-            self._flows = self._generate_data(  # type: ignore
-                data_to_process=self.flows,
-                type_to_compare=(SyncFlow, AsyncFlow),
-                attribute_to_get="name_flow",
-                names_to_ignore=flows_to_ignore,
-                type_data="flow",
+            self._flows = MappingProxyType(
+                self._generate_data(  # type: ignore
+                    data_to_process=self.flows,
+                    type_to_compare=(SyncFlow, AsyncFlow),
+                    attribute_to_get="name_flow",
+                    names_to_ignore=flows_to_ignore,
+                    type_data="flow",
+                )
             )
         if blocks:
-            self._targets = self._generate_data(  # type: ignore
-                data_to_process=blocks,
-                type_to_compare=(SyncBlock, AsyncBlock),
-                attribute_to_get="name_block",
-                names_to_ignore=blocks_to_ignore,
-                type_data="block",
+            self._targets = MappingProxyType(
+                self._generate_data(  # type: ignore
+                    data_to_process=blocks,
+                    type_to_compare=(SyncBlock, AsyncBlock),
+                    attribute_to_get="name_block",
+                    names_to_ignore=blocks_to_ignore,
+                    type_data="block",
+                )
             )
         elif self.blocks:
-            self._targets = self._generate_data(  # type: ignore
-                data_to_process=self.blocks,
-                type_to_compare=(SyncBlock, AsyncBlock),
-                attribute_to_get="name_block",
-                names_to_ignore=blocks_to_ignore,
-                type_data="block",
+            self._targets = MappingProxyType(
+                self._generate_data(  # type: ignore
+                    data_to_process=self.blocks,
+                    type_to_compare=(SyncBlock, AsyncBlock),
+                    attribute_to_get="name_block",
+                    names_to_ignore=blocks_to_ignore,
+                    type_data="block",
+                )
             )
         if not self._targets and not self._flows:
             raise NoDateException(
@@ -113,6 +158,9 @@ class SyncOrchestrator:
                 "There is no data for the orchestrator to work correctly",
             )
         self._validate_data()
+        for obj in (*self._targets.values(), *self._flows.values()):
+            if not isinstance(obj, type):
+                self._setup_executor(obj)
         if default_flow:
             if not self._flows.get(default_flow):
                 raise NotFoundDefaultError(
@@ -127,11 +175,56 @@ class SyncOrchestrator:
                 )
             else:
                 self._default_block = default_block
+        # locks are created once, so the initialized objects are read without them
+        self._targets_locks = {name: threading.Lock() for name in self._targets}
+        self._flows_locks = {name: threading.Lock() for name in self._flows}
+        self._registry_lock = threading.Lock()
         self.logger.info(
             "Allowed flows to work: %s \n" "Allowed blocks to work: %s",
             self.get_list_flows(),
             self.get_list_blocks(),
         )
+        if preload:
+            self.warm_up()
+
+    def warm_up(
+        self, is_parallel: bool = False, max_workers: int | None = None
+    ) -> None:
+        """
+        Initializes all flows and targets of the orchestrator,
+         so the first messages do not pay the cost of building them
+        :param is_parallel: initialize flows and targets in a thread pool
+        :type is_parallel: bool
+        :param max_workers: max workers of the thread pool
+        :type max_workers: Optional[int]
+        :return: nothing
+        """
+        initializers = [
+            *(lambda name=name: self._get_target(name) for name in self._targets),
+            *(lambda name=name: self._get_flow(name) for name in self._flows),
+        ]
+        if is_parallel:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                list(pool.map(lambda initializer: initializer(), initializers))
+        else:
+            for initializer in initializers:
+                initializer()
+        self.logger.info(
+            "Orchestrator. Initialized flows: %s. Initialized blocks: %s",
+            self.get_list_flows(),
+            self.get_list_blocks(),
+        )
+
+    def _message_repr(self, message: BaseOrchServMsg) -> LazyMessageRepr:
+        """
+        Returns the representation of the message for the logger,
+         the message is rendered only if the log record is emitted
+        :param message: message to log
+        :type message: BaseOrchServMsg
+        :return: lazy representation of the message
+        :rtype: LazyMessageRepr
+        """
+        return LazyMessageRepr(message, max_length=self._log_message_max_length)
 
     def get_list_flows(self) -> list[str]:
         """
@@ -159,7 +252,7 @@ class SyncOrchestrator:
             return obj.__class__.__name__  # pragma: no cover
 
         def check_type_dict_obj(
-            dict_objects: dict[str, Any], type_to_check: type, is_target: bool
+            dict_objects: Mapping[str, Any], type_to_check: type, is_target: bool
         ) -> None:
             for obj in dict_objects.values():
                 if isinstance(obj, type):
@@ -264,6 +357,115 @@ class SyncOrchestrator:
             raise NoDateException(type_data)
         return _data
 
+    def _setup_executor(
+        self, obj: SyncBlock | AsyncBlock | SyncFlow | AsyncFlow
+    ) -> None:
+        """
+        Sets the executor of the orchestrator to the sync blocks
+         of the target or flow which do not have their own executor
+        :param obj: initialized target or flow
+        :type obj: Union[SyncBlock, AsyncBlock, SyncFlow, AsyncFlow]
+        :return: nothing
+        """
+        if self._executor is None:
+            return
+        blocks = obj.get_blocks() if isinstance(obj, (SyncFlow, AsyncFlow)) else [obj]
+        for block in blocks:
+            if isinstance(block, SyncBlock) and block.executor is None:
+                block.executor = self._executor
+
+    def _initialize(
+        self,
+        attribute: str,
+        locks: dict[str, threading.Lock],
+        name: str,
+    ) -> Any:
+        """
+        Initializes the flow or target class once and replaces the registry
+         of the orchestrator with a copy containing the instance,
+         so the registry is read by other threads without locks.
+        Concurrent calls for the same name wait for the first one
+        :param str attribute: name of the registry, `_flows` or `_targets`
+        :param locks: locks for the names of the registry
+        :param str name: name of the flow or target
+        :return: initialized flow or target
+        :rtype: Union[SyncBlock, AsyncBlock, SyncFlow, AsyncFlow]
+        """
+        with locks[name]:
+            obj = getattr(self, attribute)[name]
+            if isinstance(obj, type):
+                obj = obj(logger=self.logger)
+                self._setup_executor(obj)
+                with self._registry_lock:
+                    registry = dict(getattr(self, attribute))
+                    registry[name] = obj
+                    setattr(self, attribute, MappingProxyType(registry))
+        return obj
+
+    def _get_target(self, name_target: str) -> SyncBlock | AsyncBlock | None:
+        """
+        Returns the initialized target to process the message
+         or the default target if the target with `name_target` does not exist
+        :param str name_target: name of the target
+        :return: target if exist
+        :rtype: Optional[Union[SyncBlock, AsyncBlock]]
+        """
+        target = self._targets.get(name_target)
+        if not target and self._default_block:
+            name_target = self._default_block
+            target = self._targets.get(name_target)
+        if isinstance(target, type):
+            return self._initialize("_targets", self._targets_locks, name_target)
+        return target
+
+    def _get_flow(self, name_flow: str) -> SyncFlow | AsyncFlow | None:
+        """
+        Returns the initialized flow to process the message
+         or the default flow if the flow with `name_flow` does not exist
+        :param str name_flow: name of the flow
+        :return: flow if exist
+        :rtype: Optional[Union[SyncFlow, AsyncFlow]]
+        """
+        flow = self._flows.get(name_flow)
+        if not flow and self._default_flow:
+            name_flow = self._default_flow
+            flow = self._flows.get(name_flow)
+        if isinstance(flow, type):
+            return self._initialize("_flows", self._flows_locks, name_flow)
+        return flow
+
+    def _resolve_routes(self, messages: Iterable[Any]) -> None:
+        """
+        Groups messages by target and flow and initializes each
+         of them once before the messages are processed.
+        Errors are not raised here, the route is resolved again
+         while processing the message and the error is raised for that message only
+        :param messages: messages to process
+        :return: nothing
+        """
+        routes: set[tuple[Callable[[str], Any], str]] = set()
+        for message in messages:
+            if not isinstance(message, BaseOrchServMsg):
+                continue
+            try:
+                name_target = message.get_target()
+                name_flow = None if name_target else message.get_flow()
+            except Exception:
+                continue
+            if name_target:
+                routes.add((self._get_target, name_target))
+            elif name_flow:
+                routes.add((self._get_flow, name_flow))
+        for get_route, name in routes:
+            try:
+                get_route(name)
+            except Exception as exc:
+                self.logger.debug(
+                    "Orchestrator. Failed to initialize `%s` before processing: %s",
+                    name,
+                    str(exc),
+                )
+
     def handle(  # noqa: C901
         self, message: BaseOrchServMsg, is_force_return: bool = False
     ) -> BaseOrchServMsg | None:
@@ -288,13 +490,15 @@ class SyncOrchestrator:
                 " The `message` the message must be "
                 f"of type `BaseOrchServMsg` and not {type(message)}"
             )
-        self.logger.debug("Orchestrator. Started processing msg: %s", str(message))
+        self.logger.debug(
+            "Orchestrator. Started processing msg: %s", self._message_repr(message)
+        )
 
         if message.get_flow() or message.get_target():
             if message.get_target():
                 name_target = message.get_target()
-                target = self._targets.get(name_target)  # type: ignore
-                if not target and not self._default_block:
+                target = self._get_target(name_target)  # type: ignore
+                if not target:
                     is_return_message = True
                     self.logger.warning(
                         "Orchestrator. No suitable target was found to process "
@@ -304,28 +508,30 @@ class SyncOrchestrator:
                         list(self._targets.keys()),
                     )
                 else:
-                    if not target:
-                        target = self._targets.get(self._default_block)
-                    if isinstance(target, type):
-                        target = target(logger=self.logger)
-                        self._targets[target.name_block] = target
                     try:
-                        if target:
-                            target.process(message)
+                        if hooks.registered_hooks:
+                            hooks.call_with_hooks(
+                                hooks.KIND_BLOCK,
+                                target.name_block,
+                                target.run_process,  # type: ignore
+                                message,
+                            )
+                        else:
+                            target.run_process(message)  # type: ignore
                     except Exception as exc:
                         is_return_message = True
                         self.logger.warning(
                             "Orchestrator. Error processing msg `%s` in target `%s`."
                             " Error: %s",
-                            str(message),
+                            self._message_repr(message),
                             name_target,
                             str(exc),
                             exc_info=True,
                         )
             else:
                 name_flow = message.get_flow()
-                flow = self._flows.get(name_flow)  # type: ignore
-                if not flow and not self._default_flow:
+                flow = self._get_flow(name_flow)  # type: ignore
+                if not flow:
                     is_return_message = True
                     self.logger.warning(
                         "Orchestrator. No suitable flow was found to process "
@@ -335,20 +541,16 @@ class SyncOrchestrator:
                         list(self._flows.keys()),
                     )
                 else:
-                    if not flow:
-                        flow = self._flows.get(self._default_flow)
-                    if isinstance(flow, type):
-                        flow = flow(logger=self.logger)
-                        self._flows[flow.name_flow] = flow
                     try:
-                        if flow:
-                            flow.to_go_with_the_flow(message)  # type: ignore
+                        flow.to_go_with_the_flow(  # type: ignore
+                            message, is_run_to_completion=self._is_run_to_completion
+                        )
                     except Exception as exc:
                         is_return_message = True
                         self.logger.warning(
                             "Orchestrator. Error processing msg %s in flow %s."
                             " Error: %s",
-                            str(message),
+                            self._message_repr(message),
                             name_flow,
                             str(exc),
                             exc_info=True,
@@ -359,9 +561,11 @@ class SyncOrchestrator:
                 "Orchestrator. Msg %s. "
                 "Does not contain information about the type of"
                 " processing and it was not processed",
-                str(message),
+                self._message_repr(message),
             )
-        self.logger.debug("Orchestrator. Finished processing msg: %s", str(message))
+        self.logger.debug(
+            "Orchestrator. Finished processing msg: %s", self._message_repr(message)
+        )
         if is_return_message:
             return message
         return None
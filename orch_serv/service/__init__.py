@@ -2,12 +2,14 @@
 import `service` module content
 """
 
+from .post_processing import AsyncPostProcessingPipeline, PostProcessingPipeline
 from .service import (
     AsyncCommandHandlerPostProcessStrategy,
     AsyncCommandHandlerProcessStrategy,
     AsyncService,
     CommandHandlerPostProcessStrategy,
     CommandHandlerProcessStrategy,
+    ResultShape,
     Service,
     ServiceBlock,
     ServiceBuilder,
@@ -0,0 +1,353 @@
+"""
+Module with pipelines of the batched post-processing of the service
+
+The results of the processors are buffered for each post processor
+ and flushed in batches through `post_process_batch`
+ in the background, so slow post processors are not on the hot path
+ of `Service.handle`
+"""
+
+from __future__ import annotations
+
+import asyncio
+from logging import Logger
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from orch_serv.exc import PostProcessingClosedError
+from orch_serv.settings import DEFAULT_LOGGER
+
+if TYPE_CHECKING:  # pragma: no cover
+    from orch_serv.msg import BaseOrchServMsg
+
+    from .service import (
+        AsyncCommandHandlerPostProcessStrategy,
+        CommandHandlerPostProcessStrategy,
+    )
+
+_STOP = object()
+
+
+class _Buffers:
+    """
+    Buffers of the results for each post processor
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float) -> None:
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        # id of the post processor: (post processor, deadline, batch)
+        self._data: dict[int, tuple[Any, float, list[tuple[Any, Any]]]] = dict()
+
+    def add(
+        self, post_processor: Any, message: Any, additional_data: Any
+    ) -> list[tuple[Any, Any]] | None:
+        """
+        :return: batch if it is full
+        """
+        key = id(post_processor)
+        item = self._data.get(key)
+        if item is None:
+            deadline = time.monotonic() + self._flush_interval
+            item = self._data[key] = (post_processor, deadline, [])
+        batch = item[2]
+        batch.append((message, additional_data))
+        if len(batch) >= self._batch_size:
+            del self._data[key]
+            return batch
+        return None
+
+    def pop_expired(self) -> list[tuple[Any, list[tuple[Any, Any]]]]:
+        now = time.monotonic()
+        expired = [key for key, item in self._data.items() if item[1] <= now]
+        return [self._pop(key) for key in expired]
+
+    def pop_all(self) -> list[tuple[Any, list[tuple[Any, Any]]]]:
+        return [self._pop(key) for key in list(self._data)]
+
+    def _pop(self, key: int) -> tuple[Any, list[tuple[Any, Any]]]:
+        post_processor, _, batch = self._data.pop(key)
+        return post_processor, batch
+
+    def timeout(self) -> float | None:
+        """
+        :return: seconds to the nearest deadline or None if there are no batches
+        """
+        if not self._data:
+            return None
+        return max(0.0, min(item[1] for item in self._data.values()) - time.monotonic())
+
+
+class _BasePostProcessingPipeline:
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 0.1,
+        max_pending: int = 10_000,
+        logger: Logger | None = None,
+    ) -> None:
+        """
+        :param int batch_size: max number of the results in the batch
+        :param float flush_interval: max time in seconds
+         the first result of the batch waits for the flush
+        :param int max_pending: max number of the results in the queue,
+         `submit` waits for the free space if the queue is full
+        :param logger: logger of the errors of the post processors
+        :type logger: Optional[Logger]
+        :raise ValueError: if the parameters are not positive
+        """
+        if batch_size < 1 or max_pending < 1 or flush_interval <= 0:
+            raise ValueError(
+                "`batch_size`, `flush_interval` and `max_pending` must be positive"
+            )
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self.logger = logger or DEFAULT_LOGGER
+        self._is_closed = False
+
+    @property
+    def is_closed(self) -> bool:
+        return self._is_closed
+
+    def _log_error(self, post_processor: Any, batch: list, exc: Exception) -> None:
+        self.logger.error(
+            "Error in time post processing batch of %s message(s) by %s. Error: %s",
+            len(batch),
+            type(post_processor).__name__,
+            str(exc),
+            exc_info=True,
+        )
+
+
+class PostProcessingPipeline(_BasePostProcessingPipeline):
+    """
+    Pipeline of the batched post-processing for `Service`.
+    The results are flushed by the background thread
+     when the batch of the post processor is full
+     or `flush_interval` has passed since the first result of the batch.
+    Errors of the post processors are logged,
+     the messages of the failed batch are not returned
+    :example:
+    >>> pipeline = PostProcessingPipeline(batch_size=500, flush_interval=0.05)
+    >>> service = MyService(post_processing=pipeline)
+    >>> service.handle(message)
+    >>> service.close()  # flushes the results and stops the thread
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 0.1,
+        max_pending: int = 10_000,
+        logger: Logger | None = None,
+    ) -> None:
+        super().__init__(batch_size, flush_interval, max_pending, logger)
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_pending)
+        self._thread: threading.Thread | None = None
+        # puts to the queue are made under the lock,
+        # so nothing is put after `_STOP`
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        """
+        Starts the background thread, must be called under the lock
+        :raise PostProcessingClosedError: if the pipeline is closed
+        """
+        if self._is_closed:
+            raise PostProcessingClosedError()
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="orch_serv-post-processing", daemon=True
+            )
+            self._thread.start()
+
+    def submit(
+        self,
+        post_processor: (
+            CommandHandlerPostProcessStrategy | AsyncCommandHandlerPostProcessStrategy
+        ),
+        message: BaseOrchServMsg,
+        additional_data: Any | None = None,
+    ) -> None:
+        """
+        Adds the result of the processor to the batch of the post processor,
+         waits if the queue is full
+        :param post_processor: post processor of the command
+        :param BaseOrchServMsg message: message returned by the processor
+        :param additional_data: data returned by the processor
+        :return: nothing
+        :raise PostProcessingClosedError: if the pipeline is closed
+        """
+        with self._lock:
+            self._start()
+            self._queue.put((post_processor, message, additional_data))
+
+    def flush(self) -> None:
+        """
+        Waits until all submitted results are post processed
+        :return: nothing
+        """
+        event = threading.Event()
+        with self._lock:
+            if self._thread is None or self._is_closed:
+                return
+            self._queue.put(event)
+        event.wait()
+
+    def close(self) -> None:
+        """
+        Flushes the results and stops the background thread,
+         the pipeline can't be used after closing
+        :return: nothing
+        """
+        with self._lock:
+            if self._is_closed:
+                return
+            self._is_closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _post_process(self, post_processor: Any, batch: list) -> None:
+        try:
+            post_processor.post_process_batch(batch)
+        except Exception as exc:
+            self._log_error(post_processor, batch, exc)
+
+    def _run(self) -> None:
+        buffers = _Buffers(self._batch_size, self._flush_interval)
+        while True:
+            try:
+                item = self._queue.get(timeout=buffers.timeout())
+            except queue.Empty:
+                item = None
+            if item is _STOP or isinstance(item, threading.Event):
+                for post_processor, batch in buffers.pop_all():
+                    self._post_process(post_processor, batch)
+                if not isinstance(item, threading.Event):
+                    return
+                item.set()
+                continue
+            if item is not None:
+                full_batch = buffers.add(*item)
+                if full_batch is not None:
+                    self._post_process(item[0], full_batch)
+            for post_processor, batch in buffers.pop_expired():
+                self._post_process(post_processor, batch)
+
+
+class AsyncPostProcessingPipeline(_BasePostProcessingPipeline):
+    """
+    Pipeline of the batched post-processing for `AsyncService`.
+    The results are flushed by the background task of the event loop
+     when the batch of the post processor is full
+     or `flush_interval` has passed since the first result of the batch.
+    Errors of the post processors are logged,
+     the messages of the failed batch are not returned
+    :example:
+    >>> pipeline = AsyncPostProcessingPipeline(batch_size=500)
+    >>> service = MyAsyncService(post_processing=pipeline)
+    >>> await service.handle(message)
+    >>> await service.close()  # flushes the results and stops the task
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 0.1,
+        max_pending: int = 10_000,
+        logger: Logger | None = None,
+    ) -> None:
+        super().__init__(batch_size, flush_interval, max_pending, logger)
+        # created in the event loop of the first submit
+        self._queue: asyncio.Queue[Any] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def _start(self) -> asyncio.Queue[Any]:
+        """
+        Starts the background task in the running event loop
+        :return: queue of the background task
+        :raise PostProcessingClosedError: if the pipeline is closed
+        """
+        if self._is_closed:
+            raise PostProcessingClosedError()
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._max_pending)
+            self._task = asyncio.get_running_loop().create_task(self._run(self._queue))
+        return self._queue
+
+    async def submit(
+        self,
+        post_processor: (
+            CommandHandlerPostProcessStrategy | AsyncCommandHandlerPostProcessStrategy
+        ),
+        message: BaseOrchServMsg,
+        additional_data: Any | None = None,
+    ) -> None:
+        """
+        Adds the result of the processor to the batch of the post processor,
+         waits if the queue is full
+        :param post_processor: post processor of the command
+        :param BaseOrchServMsg message: message returned by the processor
+        :param additional_data: data returned by the processor
+        :return: nothing
+        :raise PostProcessingClosedError: if the pipeline is closed
+        """
+        await self._start().put((post_processor, message, additional_data))
+
+    async def flush(self) -> None:
+        """
+        Waits until all submitted results are post processed
+        :return: nothing
+        """
+        if self._queue is None or self._is_closed:
+            return
+        flushed = asyncio.get_running_loop().create_future()
+        await self._queue.put(flushed)
+        await flushed
+
+    async def close(self) -> None:
+        """
+        Flushes the results and stops the background task,
+         the pipeline can't be used after closing
+        :return: nothing
+        """
+        if self._is_closed:
+            return
+        self._is_closed = True
+        if self._queue is not None and self._task is not None:
+            await self._queue.put(_STOP)
+            await self._task
+
+    async def _post_process(self, post_processor: Any, batch: list) -> None:
+        try:
+            await post_processor.post_process_batch(batch)
+        except Exception as exc:
+            self._log_error(post_processor, batch, exc)
+
+    async def _run(self, queue_: asyncio.Queue[Any]) -> None:
+        buffers = _Buffers(self._batch_size, self._flush_interval)
+        while True:
+            try:
+                item = await asyncio.wait_for(queue_.get(), timeout=buffers.timeout())
+            except asyncio.TimeoutError:
+                item = None
+            if item is _STOP or isinstance(item, asyncio.Future):
+                for post_processor, batch in buffers.pop_all():
+                    await self._post_process(post_processor, batch)
+                if not isinstance(item, asyncio.Future):
+                    return
+                # the future is cancelled if the waiting `flush` is cancelled
+                if not item.done():
+                    item.set_result(None)
+                continue
+            if item is not None:
+                full_batch = buffers.add(*item)
+                if full_batch is not None:
+                    await self._post_process(item[0], full_batch)
+            for post_processor, batch in buffers.pop_expired():
+                await self._post_process(post_processor, batch)
@@ -5,22 +5,73 @@ Module Service with help classes for build service
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+import asyncio
+from collections.abc import Callable, Iterable, Mapping
+import enum
 from logging import Logger
+from types import MappingProxyType
 from typing import Any, Optional, Union
+from weakref import WeakKeyDictionary
 
-from pydantic import BaseModel, ConfigDict
-
+from orch_serv import hooks
 from orch_serv.exc import (
     DoublePostProcessFunctionDeclaredError,
     EmptyCommandsException,
     IncorrectDefaultCommand,
     NotUniqueCommandError,
+    ResultShapeMismatchError,
     ServiceBlockException,
     ServiceBuilderException,
 )
-from orch_serv.msg import BaseOrchServMsg
+from orch_serv.msg import BaseOrchServMsg, LazyMessageRepr
 from orch_serv.settings import DEFAULT_LOGGER
 
+from .post_processing import AsyncPostProcessingPipeline, PostProcessingPipeline
+
+
+class ResultShape(str, enum.Enum):
+    """
+    Declared shape of the result of the processor
+    """
+
+    # message or (message, additional_data), checked for each result
+    AUTO = "auto"
+    # message
+    MESSAGE = "message"
+    # (message, additional_data)
+    TUPLE = "tuple"
+
+
+def _unpack_auto(result: Any, command: str) -> tuple[Any, Any]:
+    if isinstance(result, tuple):
+        return result  # type: ignore
+    return result, None
+
+
+def _unpack_message(result: Any, command: str) -> tuple[Any, Any]:
+    return result, None
+
+
+def _unpack_tuple(result: Any, command: str) -> tuple[Any, Any]:
+    if isinstance(result, tuple) and len(result) == 2:
+        return result  # type: ignore
+    raise ResultShapeMismatchError(
+        command, ResultShape.TUPLE.value, type(result).__name__
+    )
+
+
+# functions to get (message, additional_data) from the result of the processor
+# and the name of its command
+RESULT_UNPACKERS: Mapping[ResultShape, Callable[[Any, str], tuple[Any, Any]]] = (
+    MappingProxyType(
+        {
+            ResultShape.AUTO: _unpack_auto,
+            ResultShape.MESSAGE: _unpack_message,
+            ResultShape.TUPLE: _unpack_tuple,
+        }
+    )
+)
+
 
 class CommandHandler:
     """
@@ -134,8 +185,13 @@ class CommandHandler:
 class CommandHandlerProcessStrategy(CommandHandler, ABC):
     """
     Handler class for base processing message
+    :attr result_shape: declared shape of the result of `process`,
+     with `ResultShape.AUTO` a tuple result is (message, additional_data)
+    :type result_shape: ResultShape
     """
 
+    result_shape: ResultShape = ResultShape.AUTO
+
     @property
     def target_command(self) -> str:
         """
@@ -177,12 +233,35 @@ class CommandHandlerPostProcessStrategy(CommandHandler, ABC):
         """
         raise NotImplementedError
 
+    def post_process_batch(
+        self, batch: list[tuple[BaseOrchServMsg, Any | None]]
+    ) -> None:
+        """
+        method for post-processing of the batch of results,
+         used by the post-processing pipeline of the service.
+        Calls `post_process` for each result by default,
+         override it to send the batch at once
+        :param batch: list of (msg, additional_data)
+        :return: None
+        """
+        for msg, additional_data in batch:
+            self.post_process(msg, additional_data)
+
 
 class AsyncCommandHandlerProcessStrategy(CommandHandler, ABC):
     """
     Handler class for base processing message
+    :attr result_shape: declared shape of the result of `process`,
+     with `ResultShape.AUTO` a tuple result is (message, additional_data)
+    :type result_shape: ResultShape
+    :attr max_concurrency: max number of messages processed by the handler
+     at the same time in the service, if None the number is not limited
+    :type max_concurrency: Optional[int]
     """
 
+    result_shape: ResultShape = ResultShape.AUTO
+    max_concurrency: int | None = None
+
     @property
     def target_command(self) -> str:
         """
@@ -224,6 +303,20 @@ class AsyncCommandHandlerPostProcessStrategy(CommandHandler, ABC):
         """
         raise NotImplementedError
 
+    async def post_process_batch(
+        self, batch: list[tuple[BaseOrchServMsg, Any | None]]
+    ) -> None:
+        """
+        method does post-processing of the batch of results,
+         used by the post-processing pipeline of the service.
+        Awaits `post_process` for each result by default,
+         override it to send the batch at once
+        :param batch: list of (msg, additional_data)
+        :return: None
+        """
+        for msg, additional_data in batch:
+            await self.post_process(msg, additional_data)
+
 
 class DefaultPostProcessStrategy(CommandHandlerPostProcessStrategy):
     def post_process(self, msg: BaseOrchServMsg, additional_data: Any | None = None):  # type: ignore
@@ -249,19 +342,44 @@ class AsyncDefaultPostProcessStrategy(AsyncCommandHandlerPostProcessStrategy):
         pass
 
 
-class ServiceCommand(BaseModel):
+class ServiceCommand:
     """
-    Structure class
+    Structure class of the registry of the service:
+     processor and post processor of the command
+    :attr processor: processor of the command
+    :attr post_processor: post processor of the command
+    :attr unpack_result: returns (message, additional_data)
+     from the result of the processor and the name of the command
     """
 
-    processor: CommandHandlerProcessStrategy | AsyncCommandHandlerProcessStrategy
-    post_processor: (
-        CommandHandlerPostProcessStrategy | AsyncCommandHandlerPostProcessStrategy
-    )
+    __slots__ = ("processor", "post_processor", "unpack_result")
 
-    # class Config:
-    #     arbitrary_types_allowed = True
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    def __init__(
+        self,
+        processor: CommandHandlerProcessStrategy | AsyncCommandHandlerProcessStrategy,
+        post_processor: (
+            CommandHandlerPostProcessStrategy | AsyncCommandHandlerPostProcessStrategy
+        ),
+        unpack_result: Callable[[Any, str], tuple[Any, Any]] = _unpack_auto,
+    ) -> None:
+        self.processor = processor
+        self.post_processor = post_processor
+        self.unpack_result = unpack_result
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(processor={self.processor!r},"
+            f" post_processor={self.post_processor!r})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ServiceCommand):
+            return NotImplemented
+        return (
+            self.processor is other.processor
+            and self.post_processor is other.post_processor
+            and self.unpack_result is other.unpack_result
+        )
 
 
 class ServiceBlock:
@@ -547,10 +665,31 @@ class ServiceBuilder:
             else:
 
                 dict_commands[processor.target_command] = ServiceCommand(
-                    processor=processor, post_processor=post_processor
+                    processor=processor,
+                    post_processor=post_processor,
+                    unpack_result=self.get_result_unpacker(processor),
                 )
         return dict_commands
 
+    @staticmethod
+    def get_result_unpacker(
+        processor: CommandHandlerProcessStrategy | AsyncCommandHandlerProcessStrategy,
+    ) -> Callable[[Any, str], tuple[Any, Any]]:
+        """
+        :param processor: processor of the command
+        :return: function to get (message, additional_data)
+         from the result of the processor and the name of the command
+        :raise ServiceBuilderException: if `result_shape` is not a `ResultShape`
+        """
+        try:
+            return RESULT_UNPACKERS[ResultShape(processor.result_shape)]
+        except ValueError:
+            raise ServiceBuilderException(
+                f"`result_shape` of command `{processor.target_command}`"
+                f" must be one of {[shape.value for shape in ResultShape]}"
+                f" and not {processor.result_shape!r}"
+            ) from None
+
 
 class Service:
     """
@@ -558,10 +697,15 @@ class Service:
     """
 
     _service_commands: ServiceBuilder = None  # type: ignore
-    _dict_handlers: dict[str, ServiceCommand] = dict()
+    # read-only registry of the commands, built for each service instance
+    _dict_handlers: Mapping[str, ServiceCommand] = MappingProxyType(dict())
     _default_command: str = None  # type: ignore
+    _default_service_command: ServiceCommand | None = None
+    _log_message_max_length: int | None = None
+    _post_processing: PostProcessingPipeline | AsyncPostProcessingPipeline | None = None
     _base_process_class = CommandHandlerProcessStrategy
     _base_post_process_class = CommandHandlerPostProcessStrategy
+    _post_processing_class: type = PostProcessingPipeline
 
     def __init__(
         self,
@@ -569,16 +713,46 @@ class Service:
         default_command: str | None = None,
         logger: Logger | None = None,
         is_catch_exceptions: bool = True,
+        log_message_max_length: int | None = None,
+        post_processing: (
+            PostProcessingPipeline | AsyncPostProcessingPipeline | None
+        ) = None,
     ):
+        """
+        :param service_commands: commands of the service
+        :type service_commands: Optional[ServiceBuilder]
+        :param default_command: command for messages without a known command
+        :type default_command: Optional[str]
+        :param logger: logger
+        :type logger: Optional[Logger]
+        :param bool is_catch_exceptions: log errors of the processing
+         and return the message instead of raising
+        :param log_message_max_length: max length of messages in the logs
+        :type log_message_max_length: Optional[int]
+        :param post_processing: pipeline of the batched post-processing,
+         if None the post processor is called right after the processor
+        :type post_processing: Union[PostProcessingPipeline,
+         AsyncPostProcessingPipeline, None]
+        :raise TypeError: if the pipeline does not match the service
+        """
         self._is_catch_exceptions = is_catch_exceptions
+        self._log_message_max_length = log_message_max_length
+        if post_processing is not None:
+            if not isinstance(post_processing, self._post_processing_class):
+                raise TypeError(
+                    f"`post_processing` must be a"
+                    f" {self._post_processing_class.__name__}"
+                    f" and not {type(post_processing)}"
+                )
+            self._post_processing = post_processing
         self.logger = logger or DEFAULT_LOGGER
         if not service_commands:
             # for validate if use property setup
             service_commands = self.service_commands
 
         self.__validate_service_builder(service_commands)
-        self._dict_handlers = self.service_commands.build(
-            service_instance=self, logger=logger
+        self._dict_handlers = MappingProxyType(
+            self.service_commands.build(service_instance=self, logger=logger)
         )
         if default_command:
             if not self._dict_handlers.get(default_command):
@@ -587,6 +761,10 @@ class Service:
                 )
             else:
                 self._default_command = default_command
+        if self._default_command:
+            self._default_service_command = self._dict_handlers.get(
+                self._default_command
+            )
         self._validate_data()
 
     def __validate_service_builder(self, service_builder: ServiceBuilder) -> None:
@@ -645,19 +823,76 @@ class Service:
                     f"and not `{command.post_processor.__class__.__base__.__name__}`"
                 )
 
+    def _message_repr(
+        self, message: BaseOrchServMsg, is_dump: bool = False
+    ) -> LazyMessageRepr:
+        """
+        Returns the representation of the message for the logger,
+         the message is rendered only if the log record is emitted
+        :param BaseOrchServMsg message: message to log
+        :param bool is_dump: log the dump of the message
+        :return: lazy representation of the message
+        """
+        return LazyMessageRepr(
+            message, max_length=self._log_message_max_length, is_dump=is_dump
+        )
+
     def _get_service_command(self, message: BaseOrchServMsg) -> ServiceCommand | None:
         """
         Function for get command to handle received message
         :param BaseOrchServMsg message: received message
         :return: handler if exist
         """
-        command = self._dict_handlers.get(message.get_command())  # type: ignore
-        if command:
-            return command
-        elif self._default_command:
-            return self._dict_handlers[self._default_command]
+        command_name = message.get_command()
+        if command_name is None:
+            return self._default_service_command
+        return self._dict_handlers.get(command_name, self._default_service_command)
+
+    def _dispatch_command(
+        self, command: ServiceCommand, message: BaseOrchServMsg
+    ) -> None:
+        """
+        Processes the message by the processor of the command
+         and sends the result to the post processor
+        :param ServiceCommand command: command to process message
+        :param BaseOrchServMsg message: message to process
+        :return: nothing
+        """
+        resp_process = command.processor.process(message)
+        if resp_process:
+            resp_msg, additional_data = command.unpack_result(
+                resp_process, command.processor.target_command
+            )
+            if command.post_processor and resp_msg:
+                if isinstance(self._post_processing, PostProcessingPipeline):
+                    self._post_processing.submit(
+                        command.post_processor, resp_msg, additional_data
+                    )
+                else:
+                    command.post_processor.post_process(resp_msg, additional_data)  # type: ignore
         else:
-            return None
+            self.logger.debug(
+                "Don't send to post-processing because"
+                " processor doesn't return data."
+            )
+
+    def flush(self) -> None:
+        """
+        Waits until the results submitted to the post-processing pipeline
+         are post processed
+        :return: nothing
+        """
+        if isinstance(self._post_processing, PostProcessingPipeline):
+            self._post_processing.flush()
+
+    def close(self) -> None:
+        """
+        Flushes and closes the post-processing pipeline,
+         call it on shutdown of the service
+        :return: nothing
+        """
+        if isinstance(self._post_processing, PostProcessingPipeline):
+            self._post_processing.close()
 
     def handle(
         self, message: BaseOrchServMsg, is_force_return: bool = False
@@ -671,29 +906,26 @@ class Service:
         is_return_message = is_force_return
         self.logger.info(
             "Service. Started processing message %s",
-            message.model_dump(exclude_unset=True),
+            self._message_repr(message, is_dump=True),
         )
         command = self._get_service_command(message)
         if command:
             try:
-                resp_process = command.processor.process(message)
-                if resp_process:
-                    try:
-                        resp_msg, additional_data = resp_process  # type: ignore # noqa
-                    except TypeError:
-                        resp_msg, additional_data = resp_process, None
-                    if command.post_processor and resp_msg:
-                        command.post_processor.post_process(resp_msg, additional_data)  # type: ignore
-                else:
-                    self.logger.debug(
-                        "Don't send to post-processing because"
-                        " processor doesn't return data."
+                if hooks.registered_hooks:
+                    hooks.call_with_hooks(
+                        hooks.KIND_COMMAND,
+                        command.processor.target_command,
+                        self._dispatch_command,
+                        command,
+                        message,
                     )
+                else:
+                    self._dispatch_command(command, message)
             except Exception as exc:
                 is_return_message = True
                 self.logger.warning(
                     "Error in time processing msg %s. Error %s",
-                    str(message),
+                    self._message_repr(message),
                     str(exc),
                     exc_info=True,
                 )
@@ -703,12 +935,12 @@ class Service:
             is_return_message = True
             self.logger.warning(
                 "Not found command to process message %s",
-                str(message.model_dump(exclude_unset=True)),
+                self._message_repr(message, is_dump=True),
             )
 
         self.logger.info(
             "Service. Finished processing message %s",
-            message.model_dump(exclude_unset=True),
+            self._message_repr(message, is_dump=True),
         )
         if is_return_message:
             return message
@@ -720,6 +952,159 @@ class AsyncService(Service, ABC):
 
     _base_process_class = AsyncCommandHandlerProcessStrategy  # type: ignore # noqa
     _base_post_process_class = AsyncCommandHandlerPostProcessStrategy  # type: ignore # noqa
+    _post_processing_class = AsyncPostProcessingPipeline
+    # `max_concurrency` of the commands
+    _command_limits: Mapping[str, int] = MappingProxyType(dict())
+
+    def _validate_data(self) -> None:
+        """
+        Help function to validate data service,
+         collects `max_concurrency` of the commands
+        :raise ValueError: if `max_concurrency` of the processor less than 1
+        """
+        super()._validate_data()
+        limits = dict()
+        for command_name, command in self._dict_handlers.items():
+            max_concurrency = command.processor.max_concurrency  # type: ignore
+            if max_concurrency is None:
+                continue
+            if max_concurrency < 1:
+                raise ValueError(
+                    f"`max_concurrency` of command `{command_name}`"
+                    f" must be greater than 0"
+                )
+            limits[command_name] = max_concurrency
+        self._command_limits = MappingProxyType(limits)
+        # semaphores are bound to the event loop, so they are created
+        # for each running event loop
+        self._command_semaphores: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]
+        ] = WeakKeyDictionary()
+
+    def _get_command_semaphore(self, command_name: str) -> asyncio.Semaphore | None:
+        """
+        :param str command_name: name of the command
+        :return: semaphore of the command in the running event loop
+         or None if the command has no `max_concurrency`
+        """
+        max_concurrency = self._command_limits.get(command_name)
+        if max_concurrency is None:
+            return None
+        loop = asyncio.get_running_loop()
+        semaphores = self._command_semaphores.get(loop)
+        if semaphores is None:
+            semaphores = self._command_semaphores[loop] = dict()
+        semaphore = semaphores.get(command_name)
+        if semaphore is None:
+            semaphore = semaphores[command_name] = asyncio.Semaphore(max_concurrency)
+        return semaphore
+
+    async def flush(self) -> None:  # type: ignore
+        """
+        Waits until the results submitted to the post-processing pipeline
+         are post processed
+        :return: nothing
+        """
+        if isinstance(self._post_processing, AsyncPostProcessingPipeline):
+            await self._post_processing.flush()
+
+    async def close(self) -> None:  # type: ignore
+        """
+        Flushes and closes the post-processing pipeline,
+         call it on shutdown of the service
+        :return: nothing
+        """
+        if isinstance(self._post_processing, AsyncPostProcessingPipeline):
+            await self._post_processing.close()
+
+    async def _dispatch_command(  # type: ignore
+        self, command: ServiceCommand, message: BaseOrchServMsg
+    ) -> None:
+        """
+        Processes the message by the processor of the command
+         and sends the result to the post processor
+        :param ServiceCommand command: command to process message
+        :param BaseOrchServMsg message: message to process
+        :return: nothing
+        """
+        resp_process = await command.processor.process(message)  # type: ignore # noqa
+        if resp_process:
+            resp_msg, additional_data = command.unpack_result(
+                resp_process, command.processor.target_command
+            )
+            if command.post_processor and resp_msg:
+                if isinstance(self._post_processing, AsyncPostProcessingPipeline):
+                    await self._post_processing.submit(
+                        command.post_processor, resp_msg, additional_data
+                    )
+                else:
+                    await command.post_processor.post_process(  # type: ignore
+                        resp_msg, additional_data
+                    )
+        else:
+            self.logger.debug(
+                "Don't send to post-processing because processor don't return data."
+            )
+
+    async def _run_command(
+        self, command: ServiceCommand, message: BaseOrchServMsg
+    ) -> None:
+        if hooks.registered_hooks:
+            await hooks.async_call_with_hooks(
+                hooks.KIND_COMMAND,
+                command.processor.target_command,
+                self._dispatch_command,
+                command,
+                message,
+            )
+        else:
+            await self._dispatch_command(command, message)
+
+    async def handle_many(
+        self,
+        messages: Iterable[BaseOrchServMsg],
+        max_concurrency: int | None = None,
+        is_force_return: bool = False,
+    ) -> list[BaseOrchServMsg]:
+        """
+        Handles the messages concurrently,
+         the messages are taken from the iterable when there is a free slot,
+         so only `max_concurrency` messages are processed at the same time.
+        Limits `max_concurrency` of the processors are applied too
+        :param messages: messages to process
+        :type messages: Iterable[BaseOrchServMsg]
+        :param max_concurrency: max number of messages processed at the same time,
+         if None all messages are processed at the same time
+        :type max_concurrency: Optional[int]
+        :param bool is_force_return: return msgs all time after execution
+        :return: not processed msgs or received msgs if is_force_return==True
+         in the order of the messages
+        :rtype: list[BaseOrchServMsg]
+        :raise ValueError: if max_concurrency less than 1
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("`max_concurrency` must be greater than 0")
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+        async def handle_message(message: BaseOrchServMsg) -> BaseOrchServMsg | None:
+            try:
+                return await self.handle(message, is_force_return)
+            finally:
+                if semaphore is not None:
+                    semaphore.release()
+
+        tasks = list()
+        try:
+            for message in messages:
+                if semaphore is not None:
+                    await semaphore.acquire()
+                tasks.append(asyncio.ensure_future(handle_message(message)))
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return [message for message in results if message is not None]
 
     async def handle(  # type: ignore # noqa
         self, message: BaseOrchServMsg, is_force_return: bool = False
@@ -733,31 +1118,24 @@ class AsyncService(Service, ABC):
         is_return_message = is_force_return
         self.logger.info(
             "Service. Started processing message %s",
-            message.model_dump(exclude_unset=True),
+            self._message_repr(message, is_dump=True),
         )
         command = self._get_service_command(message)
         if command:
             try:
-                resp_process = await command.processor.process(message)  # type: ignore # noqa
-                if resp_process:
-                    try:
-                        resp_msg, additional_data = resp_process
-                    except TypeError:
-                        resp_msg, additional_data = resp_process, None
-                    if command.post_processor and resp_msg:
-                        await command.post_processor.post_process(  # type: ignore
-                            resp_msg, additional_data
-                        )
+                semaphore = self._get_command_semaphore(
+                    command.processor.target_command
+                )
+                if semaphore is None:
+                    await self._run_command(command, message)
                 else:
-                    self.logger.debug(
-                        "Don't send to post-processing because "
-                        "processor don't return data."
-                    )
+                    async with semaphore:
+                        await self._run_command(command, message)
             except Exception as exc:
                 is_return_message = True
                 self.logger.warning(
                     "Error in time processing msg %s. Error %s",
-                    str(message.model_dump(exclude_unset=True)),
+                    self._message_repr(message, is_dump=True),
                     str(exc),
                     exc_info=True,
                 )
@@ -767,12 +1145,12 @@ class AsyncService(Service, ABC):
             is_return_message = True
             self.logger.warning(
                 "Not found command to process message %s",
-                str(message.model_dump(exclude_unset=True)),
+                self._message_repr(message, is_dump=True),
             )
 
         self.logger.info(
             "Service. Finished processing message %s",
-            message.model_dump(exclude_unset=True),
+            self._message_repr(message, is_dump=True),
         )
         if is_return_message:
             return message
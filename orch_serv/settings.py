@@ -7,3 +7,5 @@ import logging
 logging.basicConfig(level=logging.INFO)  # noqa
 
 DEFAULT_LOGGER = logging.Logger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 100
@@ -2,4 +2,17 @@
 Import stepper classes
 """
 
-from .stepper import Step, Stepper, StepsBuilder
+from .cache import StepCache
+from .stepper import (
+    AsyncStepper,
+    BatchStep,
+    CachedStep,
+    ExecutorStep,
+    ForEachStep,
+    IfStep,
+    ParallelSteps,
+    Step,
+    Stepper,
+    StepsBuilder,
+    WhileStep,
+)
@@ -0,0 +1,191 @@
+"""
+Module with the cache of results of the pure steps
+
+The results are kept in a bounded LRU cache with an optional time to live.
+The key of the result contains the object of the step, the input data,
+ the types of the input data and kwargs of the step
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+import threading
+import time
+from typing import Any
+
+MISSING = object()
+
+
+class StepCache:
+    """
+    Bounded cache of results of the steps with LRU eviction
+     and optional time to live of the results.
+    The key of the result is the object of the step, the input data
+     and kwargs of the step with their types, so one cache can be shared
+     between steps and Steppers and equal values of different types,
+     e.g. 1, 1.0 and True, have different results.
+    Input data which is not hashable is not cached
+    :example:
+    >>> cache = StepCache(maxsize=1024, ttl=60)
+    >>> step = CachedStep(normalize, cache=cache)
+    >>> cache.info()  # {"hits": 0, "misses": 0, "size": 0, "maxsize": 1024}
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float | None = None) -> None:
+        """
+        :param int maxsize: max number of the results,
+         the least recently used results are evicted
+        :param ttl: time to live of the results in seconds,
+         if None the results do not expire
+        :type ttl: Optional[float]
+        :raise ValueError: if maxsize less than 1 or ttl is not positive
+        """
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be greater than 0")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("`ttl` must be greater than 0")
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @staticmethod
+    def make_key(
+        obj: Callable, data_to_execute: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> Hashable | None:
+        """
+        :param Callable obj: object of the step
+        :param data_to_execute: input data of the step
+        :param kwargs: kwargs of the step
+        :return: key of the result or None if the data is not hashable
+        :rtype: Optional[Hashable]
+        """
+        key = (
+            obj,
+            data_to_execute,
+            tuple(type(value) for value in data_to_execute),
+            tuple((name, type(value), value) for name, value in sorted(kwargs.items())),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key: Hashable) -> Any:
+        """
+        :param key: key of the result
+        :return: result or `MISSING` if there is no result or it is expired
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                value, expires = item
+                if expires is None or expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._data[key]
+            self._misses += 1
+            return MISSING
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        :param key: key of the result
+        :param value: result of the step
+        :return: nothing
+        """
+        expires = None if self._ttl is None else time.monotonic() + self._ttl
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def call(
+        self,
+        obj: Callable,
+        kwargs: dict[str, Any],
+        func: Callable[[tuple[Any, ...]], Any],
+        data_to_execute: Any,
+    ) -> Any:
+        """
+        Returns the cached result or calls the function and caches its result
+        :param Callable obj: object of the step
+        :param kwargs: kwargs of the step
+        :param func: function executing the step with the input data
+        :param data_to_execute: input data of the step
+        :return: result of the step
+        """
+        if not isinstance(data_to_execute, tuple):
+            data_to_execute = (data_to_execute,)
+        key = self.make_key(obj, data_to_execute, kwargs)
+        if key is None:
+            return func(data_to_execute)
+        result = self.get(key)
+        if result is MISSING:
+            result = func(data_to_execute)
+            self.set(key, result)
+        return result
+
+    async def call_async(
+        self,
+        obj: Callable,
+        kwargs: dict[str, Any],
+        func: Callable[[tuple[Any, ...]], Awaitable[Any]],
+        data_to_execute: Any,
+    ) -> Any:
+        """
+        Returns the cached result or awaits the function and caches its result
+        :param Callable obj: object of the step
+        :param kwargs: kwargs of the step
+        :param func: coroutine function executing the step with the input data
+        :param data_to_execute: input data of the step
+        :return: result of the step
+        """
+        if not isinstance(data_to_execute, tuple):
+            data_to_execute = (data_to_execute,)
+        key = self.make_key(obj, data_to_execute, kwargs)
+        if key is None:
+            return await func(data_to_execute)
+        result = self.get(key)
+        if result is MISSING:
+            result = await func(data_to_execute)
+            self.set(key, result)
+        return result
+
+    def info(self) -> dict[str, int]:
+        """
+        :return: counters of the cache for monitoring
+        """
+        with self._lock:
+            return dict(
+                hits=self._hits,
+                misses=self._misses,
+                size=len(self._data),
+                maxsize=self._maxsize,
+            )
+
+    def clear(self) -> None:
+        """
+        Removes all results and resets the counters
+        :return: nothing
+        """
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
@@ -1,19 +1,41 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+import asyncio
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from copy import deepcopy
+import inspect
+import logging
 from logging import Logger
-from typing import Any
+from types import GenericAlias
+from typing import Any, NoReturn
 
+from orch_serv import hooks
 from orch_serv.exc import (
+    BatchSizeMismatchError,
     ConsistencyStepsException,
+    DataConsistencyError,
     EmptyStepper,
+    LoopLimitExceededError,
     NoDataForExecutionStepException,
 )
 from orch_serv.settings import DEFAULT_LOGGER
+from orch_serv.stepper.cache import StepCache
 from orch_serv.stepper.utils import (
+    aiter_chunks,
+    get_batch_element,
+    get_batch_returned_value,
     get_returned_value,
+    iter_chunks,
     parse_signature,
+    validate_batch_data_consistency,
     validate_data_consistency,
     validate_data_step,
 )
@@ -39,6 +61,7 @@ class Step:
 
     __obj: Callable
     __kwargs: dict[str, Any] = dict()
+    __is_async: bool = False
 
     @property
     def obj(self) -> Callable:
@@ -54,16 +77,940 @@ class Step:
         self.__obj = obj  # type: ignore
         if kwargs:
             self.__kwargs = kwargs
+        # objects with `async def __call__` are coroutine functions too
+        self.__is_async = inspect.iscoroutinefunction(
+            obj
+        ) or inspect.iscoroutinefunction(type(obj).__call__)
         validate_data_step(self.__obj, self.__kwargs)
 
     def __str__(self) -> str:
-        return f"<Step: obj: {self.obj.__name__}; kwargs:{self.__kwargs}>"
+        return f"<Step: obj: {self.name}; kwargs:{self.__kwargs}>"
+
+    @property
+    def name(self) -> str:
+        return getattr(self.obj, "__name__", type(self.obj).__name__)
+
+    @property
+    def is_async(self) -> bool:
+        """
+        the object of the step is a coroutine function
+        :return:
+        """
+        return self.__is_async
+
+    def get_returned_value(self) -> Any:
+        """
+        :return: annotation of the data returned by the step
+        """
+        return get_returned_value(self.obj)
+
+    def validate_consistency(self, return_previous_step: Any) -> None:
+        """
+        Validates that the data returned by the previous step
+         and kwargs of the step fit the signature of the object
+        :param return_previous_step: annotation returned from previous step
+        :return: nothing
+        :raises DataConsistencyError: if not consistent data
+        """
+        validate_data_consistency(
+            obj=self.obj,
+            return_previous_obj=return_previous_step,
+            additional_args=deepcopy(self.kwargs),
+        )
+
+    def parse_signature(self) -> tuple[str, str]:
+        """
+        :return: (attributes, returned) of the object of the step
+        """
+        return parse_signature(self.obj)
 
     def execute(self, data_to_execute: Any) -> Any:
         if not isinstance(data_to_execute, tuple):
             data_to_execute = (data_to_execute,)
+        if hooks.registered_hooks:
+            return hooks.call_with_hooks(
+                hooks.KIND_STEP,
+                self.name,
+                self.obj,
+                *data_to_execute,
+                **self.kwargs,
+            )
         return self.obj(*data_to_execute, **self.kwargs)
 
+    def compile(self) -> Callable[[Any], Any]:
+        """
+        Returns the function executing the step without hooks,
+         the object and kwargs of the step are bound to the function
+        :return: function(data_to_execute) -> result of the step,
+         for coroutine functions the result is awaitable
+        :rtype: Callable[[Any], Any]
+        """
+        obj = self.__obj
+        kwargs = self.__kwargs
+        if kwargs:
+
+            def call(data_to_execute: Any) -> Any:
+                if isinstance(data_to_execute, tuple):
+                    return obj(*data_to_execute, **kwargs)
+                return obj(data_to_execute, **kwargs)
+
+        else:
+
+            def call(data_to_execute: Any) -> Any:
+                if isinstance(data_to_execute, tuple):
+                    return obj(*data_to_execute)
+                return obj(data_to_execute)
+
+        return call
+
+    async def execute_async(self, data_to_execute: Any) -> Any:
+        """
+        Executes the step in the event loop,
+         synchronous objects are called directly
+        :param data_to_execute: data returned by the previous step
+        :return: result of the step
+        """
+        if not self.__is_async:
+            return self.execute(data_to_execute)
+        if not isinstance(data_to_execute, tuple):
+            data_to_execute = (data_to_execute,)
+        if hooks.registered_hooks:
+            return await hooks.async_call_with_hooks(
+                hooks.KIND_STEP,
+                self.name,
+                self.obj,
+                *data_to_execute,
+                **self.kwargs,
+            )
+        return await self.obj(*data_to_execute, **self.kwargs)
+
+
+class ExecutorStep(Step):
+    """
+    Step executed in the executor, e.g. CPU-bound steps in the process pool.
+    `Stepper` waits for the result of the executor,
+     `AsyncStepper` awaits it without blocking the event loop,
+     and steps of `ParallelSteps` are submitted before waiting,
+     so they are executed at the same time.
+    For ProcessPoolExecutor the object and kwargs are checked to be picklable
+    :example:
+    >>> executor = ProcessPoolExecutor()
+    >>> steps = StepsBuilder(
+    >>>     Step(load),
+    >>>     ParallelSteps(
+    >>>         ExecutorStep(resize, executor), ExecutorStep(detect, executor)
+    >>>     ),
+    >>>     Step(merge),
+    >>> )
+    """
+
+    def __init__(self, obj: Callable, executor: Executor, **kwargs: Any) -> None:
+        """
+        :param Callable obj: synchronous object of the step
+        :param Executor executor: executor of the step,
+         use `InlineExecutor` to execute the step in the calling thread
+        :param kwargs: additional kwargs for execution step
+        :raise TypeError: if executor is not an Executor
+         or obj is a coroutine function
+        :raise NotPicklableStepError: if the executor is a process pool
+         and obj or kwargs can't be pickled
+        """
+        if not isinstance(executor, Executor):
+            raise TypeError(f"Executor must be an Executor and not {type(executor)}")
+        self.__executor = executor
+        super().__init__(obj, **kwargs)
+        if self.is_async:
+            raise TypeError(
+                f"Step {self} is a coroutine function and can't be executed"
+                f" in the executor"
+            )
+        if isinstance(executor, ProcessPoolExecutor):
+            validate_data_step(self.obj, self.kwargs, is_pickle_required=True)
+
+    def __str__(self) -> str:
+        return (
+            f"<ExecutorStep: obj: {self.name};"
+            f" executor: {type(self.__executor).__name__}; kwargs:{self.kwargs}>"
+        )
+
+    @property
+    def executor(self) -> Executor:
+        return self.__executor
+
+    def submit(self, data_to_execute: Any) -> Future:
+        """
+        Submits the step to the executor without waiting for the result
+        :param data_to_execute: data returned by the previous step
+        :return: future of the result of the step
+        :rtype: Future
+        """
+        if not isinstance(data_to_execute, tuple):
+            data_to_execute = (data_to_execute,)
+        return self.__executor.submit(self.obj, *data_to_execute, **self.kwargs)
+
+    def __wait(self, data_to_execute: Any) -> Any:
+        return self.submit(data_to_execute).result()
+
+    async def __wait_async(self, data_to_execute: Any) -> Any:
+        return await asyncio.wrap_future(self.submit(data_to_execute))
+
+    def execute(self, data_to_execute: Any) -> Any:
+        if hooks.registered_hooks:
+            return hooks.call_with_hooks(
+                hooks.KIND_STEP, self.name, self.__wait, data_to_execute
+            )
+        return self.__wait(data_to_execute)
+
+    async def execute_async(self, data_to_execute: Any) -> Any:
+        """
+        Awaits the result of the executor in the event loop
+        :param data_to_execute: data returned by the previous step
+        :return: result of the step
+        """
+        if hooks.registered_hooks:
+            return await hooks.async_call_with_hooks(
+                hooks.KIND_STEP, self.name, self.__wait_async, data_to_execute
+            )
+        return await self.__wait_async(data_to_execute)
+
+    def compile(self) -> Callable[[Any], Any]:
+        submit = self.__executor.submit
+        obj = self.obj
+        kwargs = self.kwargs
+
+        def call(data_to_execute: Any) -> Any:
+            if isinstance(data_to_execute, tuple):
+                return submit(obj, *data_to_execute, **kwargs).result()
+            return submit(obj, data_to_execute, **kwargs).result()
+
+        return call
+
+
+class ParallelSteps(Step):
+    """
+    Group of steps which receive the same input data.
+    The results of the steps are combined into a tuple in the order
+     of the steps and passed to the next step.
+    In `AsyncStepper` the steps are executed concurrently,
+     in `Stepper` one by one
+    :example:
+    >>> steps = StepsBuilder(
+    >>>     Step(load_ids),
+    >>>     ParallelSteps(Step(load_users), Step(load_orders), max_concurrency=2),
+    >>>     Step(merge),  # merge(users, orders)
+    >>> )
+    """
+
+    def __init__(self, *steps: Step, max_concurrency: int | None = None) -> None:
+        """
+        :param steps: steps of the group
+        :type steps: *Step
+        :param max_concurrency: max number of steps executed at the same time,
+         if None all steps are executed at the same time
+        :type max_concurrency: Optional[int]
+        :raise EmptyStepper: if no steps
+        :raise ValueError: if max_concurrency less than 1
+        """
+        if not steps:
+            raise EmptyStepper()
+        for step in steps:
+            if not isinstance(step, Step):
+                raise TypeError(f"Step must be a Step and not {type(step)}")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("`max_concurrency` must be greater than 0")
+        self.__steps = steps
+        self.__max_concurrency = max_concurrency
+        self.__is_submitted = any(isinstance(step, ExecutorStep) for step in steps)
+
+    def __str__(self) -> str:
+        return f"<ParallelSteps: {', '.join(str(step) for step in self.__steps)}>"
+
+    @property
+    def steps(self) -> tuple[Step, ...]:
+        return self.__steps
+
+    @property
+    def obj(self) -> Callable:
+        raise AttributeError("ParallelSteps has no object, use `steps`")
+
+    @property
+    def name(self) -> str:
+        return f"parallel({', '.join(step.name for step in self.__steps)})"
+
+    @property
+    def is_async(self) -> bool:
+        return any(step.is_async for step in self.__steps)
+
+    def get_returned_value(self) -> Any:
+        returned = []
+        for step in self.__steps:
+            value = step.get_returned_value()
+            # the annotation is built at runtime from the returned types
+            returned.append(
+                GenericAlias(tuple, value) if isinstance(value, tuple) else value
+            )
+        return tuple(returned)
+
+    def validate_consistency(self, return_previous_step: Any) -> None:
+        for step in self.__steps:
+            step.validate_consistency(return_previous_step)
+
+    def parse_signature(self) -> tuple[str, str]:
+        signatures = [step.parse_signature() for step in self.__steps]
+        return (
+            "; ".join(params for params, _ in signatures),
+            f"tuple[{', '.join(returned for _, returned in signatures)}]",
+        )
+
+    def execute(self, data_to_execute: Any) -> tuple[Any, ...]:
+        if hooks.registered_hooks or not self.__is_submitted:
+            return tuple(step.execute(data_to_execute) for step in self.__steps)
+        futures = [
+            step.submit(data_to_execute) if isinstance(step, ExecutorStep) else None
+            for step in self.__steps
+        ]
+        return tuple(
+            step.execute(data_to_execute) if future is None else future.result()
+            for step, future in zip(self.__steps, futures, strict=True)
+        )
+
+    def compile(self) -> Callable[[Any], tuple[Any, ...]]:
+        calls = tuple(step.compile() for step in self.__steps)
+        if not self.__is_submitted:
+
+            def call(data_to_execute: Any) -> tuple[Any, ...]:
+                return tuple(step_call(data_to_execute) for step_call in calls)
+
+            return call
+
+        # steps in executors are submitted before waiting for the results
+        submits = tuple(
+            step.submit if isinstance(step, ExecutorStep) else None
+            for step in self.__steps
+        )
+
+        def call_submitted(data_to_execute: Any) -> tuple[Any, ...]:
+            futures = [
+                submit(data_to_execute) if submit is not None else None
+                for submit in submits
+            ]
+            return tuple(
+                step_call(data_to_execute) if future is None else future.result()
+                for step_call, future in zip(calls, futures, strict=True)
+            )
+
+        return call_submitted
+
+    async def execute_async(self, data_to_execute: Any) -> tuple[Any, ...]:
+        if self.__max_concurrency is None:
+            return tuple(
+                await asyncio.gather(
+                    *(step.execute_async(data_to_execute) for step in self.__steps)
+                )
+            )
+        semaphore = asyncio.Semaphore(self.__max_concurrency)
+
+        async def execute_step(step: Step) -> Any:
+            async with semaphore:
+                return await step.execute_async(data_to_execute)
+
+        return tuple(
+            await asyncio.gather(*(execute_step(step) for step in self.__steps))
+        )
+
+
+class BatchStep(Step):
+    """
+    Step with the object which processes a batch of items at once,
+     e.g. vectorised numeric transforms.
+    The object receives a sequence of the items as the first argument
+     and must return a sequence of the results of the same length.
+    In `stream` the items are accumulated into batches of `batch_size`
+     and the object is called once per batch,
+     `step_by_step` calls the object with a batch of one item
+    :example:
+    >>> def scale(values: list[float], factor: float = 2.0) -> list[float]:
+    >>>     return list(numpy.asarray(values) * factor)
+    >>> stepper = Stepper(
+    >>>     StepsBuilder(Step(parse), BatchStep(scale, batch_size=1000, factor=3.0))
+    >>> )
+    >>> for value in stepper.stream(rows):
+    >>>     print(value)
+    """
+
+    def __init__(self, obj: Callable, batch_size: int = 100, **kwargs: Any) -> None:
+        """
+        :param Callable obj: object processing the batch
+        :param int batch_size: max number of the items in the batch
+        :param kwargs: additional kwargs for execution step
+        :raise ValueError: if batch_size less than 1
+        """
+        if batch_size < 1:
+            raise ValueError("`batch_size` must be greater than 0")
+        super().__init__(obj, **kwargs)
+        self.__batch_size = batch_size
+
+    def __str__(self) -> str:
+        return (
+            f"<BatchStep: obj: {self.name}; batch_size: {self.__batch_size};"
+            f" kwargs:{self.kwargs}>"
+        )
+
+    @property
+    def batch_size(self) -> int:
+        return self.__batch_size
+
+    @staticmethod
+    def to_batch_item(data_to_execute: Any) -> Any:
+        """
+        :param data_to_execute: data returned by the previous step
+        :return: item of the batch, a tuple of one value is unpacked
+        """
+        if isinstance(data_to_execute, tuple) and len(data_to_execute) == 1:
+            return data_to_execute[0]
+        return data_to_execute
+
+    def get_returned_value(self) -> Any:
+        """
+        :return: annotation of the element of the sequence returned by the step
+        """
+        return get_batch_returned_value(self.obj)
+
+    def validate_consistency(self, return_previous_step: Any) -> None:
+        """
+        Validates that the data returned by the previous step
+         is the element type of the batch
+         and kwargs of the step fit the signature of the object
+        :param return_previous_step: annotation returned from previous step
+        :return: nothing
+        :raises DataConsistencyError: if not consistent data
+        """
+        validate_batch_data_consistency(
+            obj=self.obj,
+            return_previous_obj=return_previous_step,
+            additional_args=deepcopy(self.kwargs),
+        )
+
+    def _check_results(self, items: Sequence[Any], results: Any) -> Any:
+        if len(results) != len(items):
+            raise BatchSizeMismatchError(self.name, len(items), len(results))
+        return results
+
+    def execute_batch(self, items: Sequence[Any]) -> Any:
+        """
+        :param items: items of the batch
+        :return: sequence of the results of the items
+        :raise BatchSizeMismatchError: if the number of the results
+         is not equal to the number of the items
+        """
+        if hooks.registered_hooks:
+            results = hooks.call_with_hooks(
+                hooks.KIND_STEP, self.name, self.obj, items, **self.kwargs
+            )
+        else:
+            results = self.obj(items, **self.kwargs)
+        return self._check_results(items, results)
+
+    async def execute_batch_async(self, items: Sequence[Any]) -> Any:
+        """
+        Executes the batch in the event loop,
+         synchronous objects are called directly
+        :param items: items of the batch
+        :return: sequence of the results of the items
+        :raise BatchSizeMismatchError: if the number of the results
+         is not equal to the number of the items
+        """
+        if not self.is_async:
+            return self.execute_batch(items)
+        if hooks.registered_hooks:
+            results = await hooks.async_call_with_hooks(
+                hooks.KIND_STEP, self.name, self.obj, items, **self.kwargs
+            )
+        else:
+            results = await self.obj(items, **self.kwargs)
+        return self._check_results(items, results)
+
+    def execute(self, data_to_execute: Any) -> Any:
+        return self.execute_batch([self.to_batch_item(data_to_execute)])[0]
+
+    async def execute_async(self, data_to_execute: Any) -> Any:
+        return (await self.execute_batch_async([self.to_batch_item(data_to_execute)]))[
+            0
+        ]
+
+    def compile(self) -> Callable[[Any], Any]:
+        obj = self.obj
+        kwargs = self.kwargs
+        check_results = self._check_results
+        to_batch_item = self.to_batch_item
+        if self.is_async:
+
+            async def call_async(data_to_execute: Any) -> Any:
+                items = [to_batch_item(data_to_execute)]
+                return check_results(items, await obj(items, **kwargs))[0]
+
+            return call_async
+
+        def call(data_to_execute: Any) -> Any:
+            items = [to_batch_item(data_to_execute)]
+            return check_results(items, obj(items, **kwargs))[0]
+
+        return call
+
+
+class CachedStep(Step):
+    """
+    Step of the pure object, the results are cached
+     by the input data and kwargs of the step.
+    The cache can be shared between steps and Steppers
+     by passing the same `StepCache`
+    :example:
+    >>> cache = StepCache(maxsize=1024, ttl=60)
+    >>> steps = StepsBuilder(Step(load), CachedStep(normalize, cache=cache))
+    >>> cache.info()  # {"hits": 0, "misses": 0, "size": 0, "maxsize": 1024}
+    """
+
+    def __init__(
+        self, obj: Callable, cache: StepCache | None = None, **kwargs: Any
+    ) -> None:
+        """
+        :param Callable obj: pure object of the step
+        :param cache: cache of the results,
+         if None the step creates an LRU cache of 128 results
+        :type cache: Optional[StepCache]
+        :param kwargs: additional kwargs for execution step
+        """
+        super().__init__(obj, **kwargs)
+        self.__cache = cache if cache is not None else StepCache()
+
+    def __str__(self) -> str:
+        return f"<CachedStep: obj: {self.name}; kwargs:{self.kwargs}>"
+
+    @property
+    def cache(self) -> StepCache:
+        return self.__cache
+
+    def execute(self, data_to_execute: Any) -> Any:
+        return self.__cache.call(
+            self.obj, self.kwargs, super().execute, data_to_execute
+        )
+
+    async def execute_async(self, data_to_execute: Any) -> Any:
+        return await self.__cache.call_async(
+            self.obj, self.kwargs, super().execute_async, data_to_execute
+        )
+
+    def compile(self) -> Callable[[Any], Any]:
+        call = super().compile()
+        obj = self.obj
+        kwargs = self.kwargs
+        cache = self.__cache
+        if self.is_async:
+
+            async def cached_call_async(data_to_execute: Any) -> Any:
+                return await cache.call_async(obj, kwargs, call, data_to_execute)
+
+            return cached_call_async
+
+        def cached_call(data_to_execute: Any) -> Any:
+            return cache.call(obj, kwargs, call, data_to_execute)
+
+        return cached_call
+
+
+def _call_condition(condition: Callable[..., Any], data_to_execute: Any) -> Any:
+    if isinstance(data_to_execute, tuple):
+        return condition(*data_to_execute)
+    return condition(data_to_execute)
+
+
+def _validate_condition(condition: Callable[..., Any]) -> None:
+    if not callable(condition):
+        raise TypeError("`condition` must be a callable")
+    if inspect.iscoroutinefunction(condition):
+        raise TypeError("`condition` must be a synchronous callable")
+
+
+def _get_condition_name(condition: Callable[..., Any]) -> str:
+    return getattr(condition, "__name__", type(condition).__name__)
+
+
+def _validate_step(step: Any) -> None:
+    if not isinstance(step, Step):
+        raise TypeError(f"Step must be a Step and not {type(step)}")
+
+
+class IfStep(Step):
+    """
+    Conditional step, executes `then_step` if the condition is true
+     for the data of the previous step, otherwise `else_step`.
+    Without `else_step` the data is passed to the next step unchanged.
+    The condition receives the data like the steps
+    :example:
+    >>> steps = StepsBuilder(
+    >>>     Step(load),
+    >>>     IfStep(is_image, Step(resize), else_step=Step(convert)),
+    >>>     Step(save),
+    >>> )
+    """
+
+    def __init__(
+        self,
+        condition: Callable[..., bool],
+        then_step: Step,
+        else_step: Step | None = None,
+    ) -> None:
+        """
+        :param condition: synchronous callable which receives the data
+        :param Step then_step: step executed if the condition is true
+        :param else_step: step executed if the condition is false
+        :type else_step: Optional[Step]
+        :raise TypeError: if the condition is not a synchronous callable
+         or the steps are not Step
+        """
+        _validate_condition(condition)
+        _validate_step(then_step)
+        if else_step is not None:
+            _validate_step(else_step)
+        self.__condition = condition
+        self.__then_step = then_step
+        self.__else_step = else_step
+
+    def __str__(self) -> str:
+        return (
+            f"<IfStep: condition: {_get_condition_name(self.__condition)};"
+            f" then: {self.__then_step}; else: {self.__else_step}>"
+        )
+
+    @property
+    def condition(self) -> Callable[..., bool]:
+        return self.__condition
+
+    @property
+    def then_step(self) -> Step:
+        return self.__then_step
+
+    @property
+    def else_step(self) -> Step | None:
+        return self.__else_step
+
+    @property
+    def obj(self) -> Callable:
+        raise AttributeError("IfStep has no object, use `then_step` and `else_step`")
+
+    @property
+    def name(self) -> str:
+        return f"if({_get_condition_name(self.__condition)})"
+
+    @property
+    def is_async(self) -> bool:
+        return self.__then_step.is_async or bool(
+            self.__else_step and self.__else_step.is_async
+        )
+
+    def get_returned_value(self) -> Any:
+        return self.__then_step.get_returned_value()
+
+    def validate_consistency(self, return_previous_step: Any) -> None:
+        """
+        Validates the condition and both branches with the data
+         of the previous step, the branches must return the same data
+        :param return_previous_step: annotation returned from previous step
+        :return: nothing
+        :raises DataConsistencyError: if not consistent data
+        """
+        validate_data_consistency(
+            obj=self.__condition,
+            return_previous_obj=return_previous_step,
+            additional_args=dict(),
+        )
+        self.__then_step.validate_consistency(return_previous_step)
+        returned_else = return_previous_step
+        if self.__else_step is not None:
+            self.__else_step.validate_consistency(return_previous_step)
+            returned_else = self.__else_step.get_returned_value()
+        returned_then = self.__then_step.get_returned_value()
+        if returned_then != returned_else:
+            raise DataConsistencyError(
+                self.name,
+                [
+                    "The branches return different data."
+                    f" Then returns `{returned_then}`, else returns `{returned_else}`"
+                ],
+            )
+
+    def parse_signature(self) -> tuple[str, str]:
+        params, _ = parse_signature(self.__condition)
+        _, returned = self.__then_step.parse_signature()
+        return params, returned
+
+    def execute(self, data_to_execute: Any) -> Any:
+        if _call_condition(self.__condition, data_to_execute):
+            return self.__then_step.execute(data_to_execute)
+        if self.__else_step is not None:
+            return self.__else_step.execute(data_to_execute)
+        return data_to_execute
+
+    async def execute_async(self, data_to_execute: Any) -> Any:
+        if _call_condition(self.__condition, data_to_execute):
+            return await self.__then_step.execute_async(data_to_execute)
+        if self.__else_step is not None:
+            return await self.__else_step.execute_async(data_to_execute)
+        return data_to_execute
+
+    def compile(self) -> Callable[[Any], Any]:
+        condition = self.__condition
+        then_call = self.__then_step.compile()
+        else_call = self.__else_step.compile() if self.__else_step is not None else None
+
+        def call(data_to_execute: Any) -> Any:
+            if _call_condition(condition, data_to_execute):
+                return then_call(data_to_execute)
+            if else_call is not None:
+                return else_call(data_to_execute)
+            return data_to_execute
+
+        return call
+
+
+class WhileStep(Step):
+    """
+    Loop step, executes the step while the condition is true,
+     the result of each iteration is the input data of the next one.
+    If the condition is false before the first iteration
+     the data is passed to the next step unchanged
+    :example:
+    >>> steps = StepsBuilder(
+    >>>     Step(load_page),
+    >>>     WhileStep(has_next_page, Step(load_next_page), max_iterations=100),
+    >>>     Step(save),
+    >>> )
+    """
+
+    def __init__(
+        self,
+        condition: Callable[..., bool],
+        step: Step,
+        max_iterations: int | None = None,
+    ) -> None:
+        """
+        :param condition: synchronous callable which receives the data
+        :param Step step: step of the iteration
+        :param max_iterations: max number of the iterations,
+         if None the number is not limited
+        :type max_iterations: Optional[int]
+        :raise TypeError: if the condition is not a synchronous callable
+         or the step is not Step
+        :raise ValueError: if max_iterations less than 1
+        """
+        _validate_condition(condition)
+        _validate_step(step)
+        if max_iterations is not None and max_iterations < 1:
+            raise ValueError("`max_iterations` must be greater than 0")
+        self.__condition = condition
+        self.__step = step
+        self.__max_iterations = max_iterations
+
+    def __str__(self) -> str:
+        return (
+            f"<WhileStep: condition: {_get_condition_name(self.__condition)};"
+            f" step: {self.__step};"
+            f" max_iterations: {self.__max_iterations}>"
+        )
+
+    @property
+    def condition(self) -> Callable[..., bool]:
+        return self.__condition
+
+    @property
+    def step(self) -> Step:
+        return self.__step
+
+    @property
+    def obj(self) -> Callable:
+        raise AttributeError("WhileStep has no object, use `step`")
+
+    @property
+    def name(self) -> str:
+        return f"while({_get_condition_name(self.__condition)})"
+
+    @property
+    def is_async(self) -> bool:
+        return self.__step.is_async
+
+    def get_returned_value(self) -> Any:
+        return self.__step.get_returned_value()
+
+    def validate_consistency(self, return_previous_step: Any) -> None:
+        """
+        Validates the condition and the step with the data of the previous step,
+         the step must return the data it receives
+        :param return_previous_step: annotation returned from previous step
+        :return: nothing
+        :raises DataConsistencyError: if not consistent data
+        """
+        validate_data_consistency(
+            obj=self.__condition,
+            return_previous_obj=return_previous_step,
+            additional_args=dict(),
+        )
+        self.__step.validate_consistency(return_previous_step)
+        returned = self.__step.get_returned_value()
+        if returned != return_previous_step:
+            raise DataConsistencyError(
+                self.name,
+                [
+                    "The step of the loop must return the data it receives."
+                    f" Receives `{return_previous_step}`, returns `{returned}`"
+                ],
+            )
+
+    def parse_signature(self) -> tuple[str, str]:
+        return self.__step.parse_signature()
+
+    def _check_iterations(self, iterations: int) -> None:
+        if self.__max_iterations is not None and iterations >= self.__max_iterations:
+            raise LoopLimitExceededError(self.name, self.__max_iterations)
+
+    def execute(self, data_to_execute: Any) -> Any:
+        iterations = 0
+        while _call_condition(self.__condition, data_to_execute):
+            self._check_iterations(iterations)
+            data_to_execute = self.__step.execute(data_to_execute)
+            iterations += 1
+        return data_to_execute
+
+    async def execute_async(self, data_to_execute: Any) -> Any:
+        iterations = 0
+        while _call_condition(self.__condition, data_to_execute):
+            self._check_iterations(iterations)
+            data_to_execute = await self.__step.execute_async(data_to_execute)
+            iterations += 1
+        return data_to_execute
+
+    def compile(self) -> Callable[[Any], Any]:
+        condition = self.__condition
+        step_call = self.__step.compile()
+        check_iterations = self._check_iterations
+
+        def call(data_to_execute: Any) -> Any:
+            iterations = 0
+            while _call_condition(condition, data_to_execute):
+                check_iterations(iterations)
+                data_to_execute = step_call(data_to_execute)
+                iterations += 1
+            return data_to_execute
+
+        return call
+
+
+class ForEachStep(Step):
+    """
+    Step executed for each item of the sequence returned by the previous step,
+     the results are combined into a list in the order of the items.
+    As the first step the items are the arguments of `step_by_step`.
+    In `AsyncStepper` the items are processed concurrently,
+     in `Stepper` one by one
+    :example:
+    >>> steps = StepsBuilder(
+    >>>     Step(load_ids),  # -> list[int]
+    >>>     ForEachStep(Step(load_user), max_concurrency=10),  # -> list[User]
+    >>>     Step(save_users),
+    >>> )
+    """
+
+    def __init__(self, step: Step, max_concurrency: int | None = None) -> None:
+        """
+        :param Step step: step executed for each item
+        :param max_concurrency: max number of the items processed
+         at the same time in `AsyncStepper`, if None all items
+        :type max_concurrency: Optional[int]
+        :raise TypeError: if the step is not Step
+        :raise ValueError: if max_concurrency less than 1
+        """
+        _validate_step(step)
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("`max_concurrency` must be greater than 0")
+        self.__step = step
+        self.__max_concurrency = max_concurrency
+
+    def __str__(self) -> str:
+        return f"<ForEachStep: step: {self.__step}>"
+
+    @property
+    def step(self) -> Step:
+        return self.__step
+
+    @property
+    def obj(self) -> Callable:
+        raise AttributeError("ForEachStep has no object, use `step`")
+
+    @property
+    def name(self) -> str:
+        return f"for_each({self.__step.name})"
+
+    @property
+    def is_async(self) -> bool:
+        return self.__step.is_async
+
+    def get_returned_value(self) -> Any:
+        value = self.__step.get_returned_value()
+        if isinstance(value, tuple):
+            value = GenericAlias(tuple, value)
+        return GenericAlias(list, value)
+
+    def validate_consistency(self, return_previous_step: Any) -> None:
+        """
+        Validates the step with the element of the sequence
+         returned by the previous step
+        :param return_previous_step: annotation returned from previous step
+        :return: nothing
+        :raises DataConsistencyError: if not consistent data
+        """
+        element = get_batch_element(return_previous_step)
+        if element is inspect.Signature.empty:
+            raise DataConsistencyError(
+                self.name,
+                [
+                    "The previous step must return the sequence."
+                    f" Passed `{return_previous_step}`"
+                ],
+            )
+        self.__step.validate_consistency(element)
+
+    def parse_signature(self) -> tuple[str, str]:
+        params, returned = self.__step.parse_signature()
+        return params, f"list[{returned}]"
+
+    def execute(self, data_to_execute: Any) -> list[Any]:
+        execute = self.__step.execute
+        return [execute(item) for item in data_to_execute]
+
+    async def execute_async(self, data_to_execute: Any) -> list[Any]:
+        if self.__max_concurrency is None:
+            return list(
+                await asyncio.gather(
+                    *(self.__step.execute_async(item) for item in data_to_execute)
+                )
+            )
+        semaphore = asyncio.Semaphore(self.__max_concurrency)
+
+        async def execute_item(item: Any) -> Any:
+            async with semaphore:
+                return await self.__step.execute_async(item)
+
+        return list(
+            await asyncio.gather(*(execute_item(item) for item in data_to_execute))
+        )
+
+    def compile(self) -> Callable[[Any], list[Any]]:
+        step_call = self.__step.compile()
+
+        def call(data_to_execute: Any) -> list[Any]:
+            return [step_call(item) for item in data_to_execute]
+
+        return call
+
 
 class StepsBuilder:
     """
@@ -101,17 +1048,13 @@ class StepsBuilder:
                 f"Step must be a Step and not {type(steps[0])}"
             )  # pragma: no cover
         self.__steps.append(steps[0])
-        returned_previous_steps = get_returned_value(steps[0].obj)
+        returned_previous_steps = steps[0].get_returned_value()
         for step in steps[1:]:
             if not isinstance(step, Step):
                 raise TypeError(f"Step must be a Step and not {type(step)}")
             if is_validate_consistency_steps:
-                validate_data_consistency(
-                    obj=step.obj,
-                    return_previous_obj=returned_previous_steps,
-                    additional_args=deepcopy(step.kwargs),
-                )
-                returned_previous_steps = get_returned_value(step.obj)
+                step.validate_consistency(returned_previous_steps)
+                returned_previous_steps = step.get_returned_value()
             self.__steps.append(step)
 
     @property
@@ -148,10 +1091,16 @@ class Stepper:
     """
     class for forming a flow where the input data
      of step n is the output of step n
+    The steps are compiled into a plan of functions with bound objects
+     and kwargs on initialization.
+    Starting and finishing of each step are logged
+     if the logger is enabled for INFO,
+     pass `is_log_steps=False` to skip the logging of the steps
     """
 
     __steps: StepsBuilder
     __is_execute_if_empty: bool = False
+    __is_log_steps: bool = True
 
     @property
     def steps(self) -> StepsBuilder:
@@ -172,11 +1121,20 @@ class Stepper:
         """
         return self.__is_execute_if_empty
 
+    @property
+    def is_log_steps(self) -> bool:
+        """
+        log starting and finishing of each step
+        :return:
+        """
+        return self.__is_log_steps
+
     def __init__(
         self,
         steps: StepsBuilder | None = None,
         is_execute_if_empty: bool | None = None,
         logger: Logger | None = None,
+        is_log_steps: bool | None = None,
     ):
         self.logger = logger or DEFAULT_LOGGER
         if steps:
@@ -185,70 +1143,444 @@ class Stepper:
             self.__steps = None  # type: ignore
         if is_execute_if_empty is not None:
             self.__is_execute_if_empty = is_execute_if_empty
+        if is_log_steps is not None:
+            self.__is_log_steps = is_log_steps
         if not isinstance(self.steps, StepsBuilder):
             raise TypeError(
                 f"`Stepper.steps` must be a StepsBuilder and not {type(self.steps)} "
             )
+        self._validate_steps()
+        self._plan = self._compile_plan()
+        self._batch_indexes = tuple(
+            index
+            for index, step in enumerate(self.steps.steps)
+            if isinstance(step, BatchStep)
+        )
+        self._hooked_plan = self._compile_hooked_plan()
+
+    def _validate_steps(self) -> None:
+        """
+        Checks that all steps can be executed by the stepper
+        :raise TypeError: if the steps contain coroutine functions
+        """
+        for step in self.steps:
+            if step.is_async:
+                raise TypeError(
+                    f"Step {step} is a coroutine function. Use `AsyncStepper`"
+                )
+
+    def _compile_plan(self) -> tuple[tuple[Step, Callable[[Any], Any]], ...]:
+        """
+        :return: steps with the functions executing them without hooks
+        """
+        return tuple((step, step.compile()) for step in self.steps.steps)
+
+    def _compile_hooked_plan(self) -> tuple[tuple[Step, Callable[[Any], Any]], ...]:
+        """
+        :return: steps with the functions executing them with hooks
+        """
+        return tuple((step, step.execute) for step in self.steps.steps)
+
+    def _is_log_steps_enabled(self) -> bool:
+        return self.is_log_steps and self.logger.isEnabledFor(logging.INFO)
+
+    def _raise_step_error(
+        self,
+        index: int,
+        step: Step,
+        previous_step: str,
+        step_data: Any,
+        exc: Exception,
+    ) -> NoReturn:
+        """
+        Logs the error of the step and raises it,
+         errors of the arguments are raised as ConsistencyStepsException
+        :raise ConsistencyStepsException: if inconsistency of arguments
+        """
+        if not isinstance(exc, (AttributeError, TypeError)):
+            self.logger.error("Error in time processing %s. Error: %s", step, str(exc))
+            raise exc
+        self.logger.error(
+            "Error in time processing %s. "
+            "Inconsistency of arguments for function "
+            "execution or internal object error."
+            " Error: %s",
+            step,
+            str(exc),
+            exc_info=True,
+        )
+        params_prev, return_prev = self.steps[index - 1].parse_signature()
+        params_current, return_current = step.parse_signature()
+        raise ConsistencyStepsException(
+            step=step.name,
+            previous_step=previous_step,
+            signature_step_obj=params_current,
+            return_annotation_previous_step_obj=return_prev,
+            received_from_previous_step=step_data,
+            args_on_init_step=str(step.kwargs),
+        ) from exc
+
+    def _run_steps(
+        self,
+        plan: Sequence[tuple[Step, Callable[[Any], Any]]],
+        start: int,
+        state: tuple[Any, Any, str],
+        is_execute_if_empty: bool,
+        is_log_steps: bool,
+    ) -> tuple[Any, Any, str]:
+        """
+        Executes the part of the plan
+        :param plan: part of the plan
+        :param int start: index of the first step of the part
+        :param state: (step_data, result_data, previous_step) before the part
+        :return: (step_data, result_data, previous_step) after the part
+        """
+        step_data, result_data, previous_step = state
+        for i, (step, call) in enumerate(plan, start):
+            if is_log_steps:
+                self.logger.info("Starting Step %s", step)
+            try:
+                result_data = call(step_data)
+                if not result_data and not is_execute_if_empty:
+                    raise NoDataForExecutionStepException(step.name)
+            except Exception as exc:
+                self._raise_step_error(i, step, previous_step, step_data, exc)
+            if not result_data:
+                continue
+            step_data = result_data
+            previous_step = step.name
+            if is_log_steps:
+                self.logger.info("Finished Step %s", step)
+        return step_data, result_data, previous_step
 
     def __step_by_step(
         self,
         *args: Any,
     ) -> Any:
-        step_data = args
-        previous_step = "start"
-        result_data: Any = None
-        for i, step in enumerate(self.steps):  # type: ignore
-            self.logger.info("Starting Step %s", step)
+        plan = self._hooked_plan if hooks.registered_hooks else self._plan
+        _, result_data, _ = self._run_steps(
+            plan,
+            0,
+            (args, None, "start"),
+            self.is_execute_if_empty,
+            self._is_log_steps_enabled(),
+        )
+        return result_data
+
+    def step_by_step(
+        self,
+        *args: Any,
+    ) -> Any:
+        return self.__step_by_step(*args)
+
+    @staticmethod
+    def _validate_chunk_size(chunk_size: int | None) -> None:
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("`chunk_size` must be greater than 0")
+
+    @staticmethod
+    def _to_step_data(item: Any) -> tuple[Any, ...]:
+        return item if isinstance(item, tuple) else (item,)
+
+    def _split_batch(
+        self,
+        step: BatchStep,
+        batch: list[tuple[Any, Any, str]],
+        results: Any,
+        is_execute_if_empty: bool,
+    ) -> Iterator[tuple[Any, Any, str]]:
+        """
+        Splits the results of the batch step into the states of the items
+        :raise NoDataForExecutionStepException: if the result of an item is empty
+        """
+        for (step_data, _, previous_step), result_data in zip(
+            batch, results, strict=True
+        ):
+            if result_data:
+                yield result_data, result_data, step.name
+            elif is_execute_if_empty:
+                yield step_data, result_data, previous_step
+            else:
+                raise NoDataForExecutionStepException(step.name)
+
+    def _stream_steps(
+        self,
+        states: Iterator[tuple[Any, Any, str]],
+        plan: Sequence[tuple[Step, Callable[[Any], Any]]],
+        start: int,
+        is_execute_if_empty: bool,
+        is_log_steps: bool,
+    ) -> Iterator[tuple[Any, Any, str]]:
+        for state in states:
+            yield self._run_steps(plan, start, state, is_execute_if_empty, is_log_steps)
+
+    def _stream_batch(
+        self,
+        states: Iterator[tuple[Any, Any, str]],
+        index: int,
+        is_execute_if_empty: bool,
+        is_log_steps: bool,
+    ) -> Iterator[tuple[Any, Any, str]]:
+        step: BatchStep = self.steps[index]  # type: ignore
+        for batch in iter_chunks(states, step.batch_size):
+            if is_log_steps:
+                self.logger.info("Starting Step %s", step)
+            items = [step.to_batch_item(step_data) for step_data, _, _ in batch]
             try:
-                # if not isinstance(step_data, tuple):
-                #     step_data = (step_data,)
-                # result_data = step.obj(*step_data, **step.kwargs)
-                result_data = step.execute(step_data)
-                if not result_data and not self.is_execute_if_empty:
-                    raise NoDataForExecutionStepException(
-                        step.obj.__name__,
-                    )
-                elif not result_data:
-                    continue
-                else:
-                    step_data = result_data
-                    previous_step = step.obj.__name__
-
-            except (AttributeError, TypeError) as exc:
-                self.logger.error(
-                    "Error in time processing %s. "
-                    "Inconsistency of arguments for function "
-                    "execution or internal object error."
-                    " Error: %s",
-                    step,
-                    str(exc),
-                    exc_info=True,
-                )
-                params_prev, return_prev = parse_signature(self.steps[i - 1].obj)
-                params_current, return_current = parse_signature(self.steps[i].obj)
-                raise ConsistencyStepsException(
-                    step=self.steps[i].obj.__name__,
-                    previous_step=previous_step,
-                    signature_step_obj=params_current,
-                    return_annotation_previous_step_obj=return_prev,
-                    received_from_previous_step=step_data,
-                    args_on_init_step=str(self.steps[i].kwargs),
-                ) from exc
+                results = step.execute_batch(items)
             except Exception as exc:
-                self.logger.error(
-                    "Error in time processing %s. Error: %s", step, str(exc)
-                )
-                raise exc
+                self._raise_step_error(index, step, batch[0][2], items, exc)
+            yield from self._split_batch(step, batch, results, is_execute_if_empty)
+            if is_log_steps:
+                self.logger.info("Finished Step %s", step)
+
+    def stream(
+        self, items: Iterable[Any], chunk_size: int | None = None
+    ) -> Iterator[Any]:
+        """
+        Lazily executes the steps for each item of the iterable,
+         only the current item is kept in memory.
+        Tuples are passed to the first step as positional arguments
+         like the arguments of `step_by_step`.
+        Before `BatchStep` the items are accumulated into batches,
+         so only the current batch is kept in memory
+        :param items: input data of the first step
+        :param chunk_size: if set the items are grouped into lists
+         of the size and each list is passed to the first step
+        :type chunk_size: Optional[int]
+        :return: iterator of the results of the last step
+        :raise ValueError: if chunk_size less than 1
+        :example:
+        >>> for result in stepper.stream(read_rows(path), chunk_size=1000):
+        >>>     write(result)
+        """
+        self._validate_chunk_size(chunk_size)
+        if chunk_size is not None:
+            items = ((chunk,) for chunk in iter_chunks(items, chunk_size))
+        if not self._batch_indexes:
+            return (self.__step_by_step(*self._to_step_data(item)) for item in items)
+        plan = self._hooked_plan if hooks.registered_hooks else self._plan
+        is_execute_if_empty = self.is_execute_if_empty
+        is_log_steps = self._is_log_steps_enabled()
+        states: Iterator[tuple[Any, Any, str]] = (
+            (self._to_step_data(item), None, "start") for item in items
+        )
+        start = 0
+        for index in self._batch_indexes:
+            states = self._stream_steps(
+                states, plan[start:index], start, is_execute_if_empty, is_log_steps
+            )
+            states = self._stream_batch(
+                states, index, is_execute_if_empty, is_log_steps
+            )
+            start = index + 1
+        states = self._stream_steps(
+            states, plan[start:], start, is_execute_if_empty, is_log_steps
+        )
+        return (result_data for _, result_data, _ in states)
 
-            self.logger.info("Finished Step %s", step)
 
-        return result_data
+class AsyncStepper(Stepper):
+    """
+    Stepper for steps with coroutine functions,
+     synchronous steps are called directly in the event loop.
+    Steps of `ParallelSteps` are executed concurrently
+    """
 
-    def step_by_step(
+    def _validate_steps(self) -> None:
+        pass
+
+    def _compile_plan(  # type: ignore
+        self,
+    ) -> tuple[tuple[Step, Callable[[Any], Any], bool], ...]:
+        """
+        :return: steps with the functions executing them without hooks
+         and whether the result of the function must be awaited
+        """
+        plan: list[tuple[Step, Callable[[Any], Any], bool]] = []
+        for step in self.steps.steps:
+            # the control steps are awaited even without coroutine functions,
+            # the nested executor steps must not block the event loop
+            if isinstance(
+                step, (ParallelSteps, ExecutorStep, IfStep, WhileStep, ForEachStep)
+            ):
+                plan.append((step, step.execute_async, True))
+            else:
+                plan.append((step, step.compile(), step.is_async))
+        return tuple(plan)
+
+    def _compile_hooked_plan(  # type: ignore
+        self,
+    ) -> tuple[tuple[Step, Callable[[Any], Any], bool], ...]:
+        """
+        :return: steps with the functions executing them with hooks
+        """
+        return tuple((step, step.execute_async, True) for step in self.steps.steps)
+
+    async def _run_steps_async(
+        self,
+        plan: Sequence[tuple[Step, Callable[[Any], Any], bool]],
+        start: int,
+        state: tuple[Any, Any, str],
+        is_execute_if_empty: bool,
+        is_log_steps: bool,
+    ) -> tuple[Any, Any, str]:
+        """
+        Executes the part of the plan
+        :param plan: part of the plan
+        :param int start: index of the first step of the part
+        :param state: (step_data, result_data, previous_step) before the part
+        :return: (step_data, result_data, previous_step) after the part
+        """
+        step_data, result_data, previous_step = state
+        for i, (step, call, is_awaitable) in enumerate(plan, start):
+            if is_log_steps:
+                self.logger.info("Starting Step %s", step)
+            try:
+                result_data = call(step_data)
+                if is_awaitable:
+                    result_data = await result_data
+                if not result_data and not is_execute_if_empty:
+                    raise NoDataForExecutionStepException(step.name)
+            except Exception as exc:
+                self._raise_step_error(i, step, previous_step, step_data, exc)
+            if not result_data:
+                continue
+            step_data = result_data
+            previous_step = step.name
+            if is_log_steps:
+                self.logger.info("Finished Step %s", step)
+        return step_data, result_data, previous_step
+
+    async def step_by_step(  # type: ignore
         self,
         *args: Any,
     ) -> Any:
-        return self.__step_by_step(*args)
+        plan = self._hooked_plan if hooks.registered_hooks else self._plan
+        _, result_data, _ = await self._run_steps_async(
+            plan,  # type: ignore
+            0,
+            (args, None, "start"),
+            self.is_execute_if_empty,
+            self._is_log_steps_enabled(),
+        )
+        return result_data
+
+    def stream(  # type: ignore
+        self,
+        items: Iterable[Any] | AsyncIterable[Any],
+        chunk_size: int | None = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Lazily executes the steps for each item
+         of the iterable or the asynchronous iterable,
+         the items are processed one by one.
+        Before `BatchStep` the items are accumulated into batches
+        :param items: input data of the first step
+        :type items: Union[Iterable[Any], AsyncIterable[Any]]
+        :param chunk_size: if set the items are grouped into lists
+         of the size and each list is passed to the first step
+        :type chunk_size: Optional[int]
+        :return: asynchronous iterator of the results of the last step
+        :raise ValueError: if chunk_size less than 1
+        :example:
+        >>> async for result in stepper.stream(read_rows(path), chunk_size=1000):
+        >>>     await write(result)
+        """
+        self._validate_chunk_size(chunk_size)
+        step_data = self.__iter_step_data(items, chunk_size)
+        if not self._batch_indexes:
+            return self.__stream(step_data)
+        return self.__stream_batches(step_data)
+
+    async def __iter_step_data(
+        self,
+        items: Iterable[Any] | AsyncIterable[Any],
+        chunk_size: int | None,
+    ) -> AsyncIterator[tuple[Any, ...]]:
+        if not isinstance(items, AsyncIterable):
+            if chunk_size is not None:
+                items = ((chunk,) for chunk in iter_chunks(items, chunk_size))
+            for item in items:
+                yield self._to_step_data(item)
+        elif chunk_size is not None:
+            async for chunk in aiter_chunks(items, chunk_size):
+                yield (chunk,)
+        else:
+            async for item in items:
+                yield self._to_step_data(item)
 
+    async def __stream(
+        self, step_data: AsyncIterator[tuple[Any, ...]]
+    ) -> AsyncIterator[Any]:
+        async for args in step_data:
+            yield await self.step_by_step(*args)
 
-# ToDo add if else and loop !
+    async def _stream_steps_async(
+        self,
+        states: AsyncIterator[tuple[Any, Any, str]],
+        plan: Sequence[tuple[Step, Callable[[Any], Any], bool]],
+        start: int,
+        is_execute_if_empty: bool,
+        is_log_steps: bool,
+    ) -> AsyncIterator[tuple[Any, Any, str]]:
+        async for state in states:
+            yield await self._run_steps_async(
+                plan, start, state, is_execute_if_empty, is_log_steps
+            )
+
+    async def _stream_batch_async(
+        self,
+        states: AsyncIterator[tuple[Any, Any, str]],
+        index: int,
+        is_execute_if_empty: bool,
+        is_log_steps: bool,
+    ) -> AsyncIterator[tuple[Any, Any, str]]:
+        step: BatchStep = self.steps[index]  # type: ignore
+        async for batch in aiter_chunks(states, step.batch_size):
+            if is_log_steps:
+                self.logger.info("Starting Step %s", step)
+            items = [step.to_batch_item(step_data) for step_data, _, _ in batch]
+            try:
+                results = await step.execute_batch_async(items)
+            except Exception as exc:
+                self._raise_step_error(index, step, batch[0][2], items, exc)
+            for state in self._split_batch(step, batch, results, is_execute_if_empty):
+                yield state
+            if is_log_steps:
+                self.logger.info("Finished Step %s", step)
+
+    async def __stream_batches(
+        self, step_data: AsyncIterator[tuple[Any, ...]]
+    ) -> AsyncIterator[Any]:
+        plan = self._hooked_plan if hooks.registered_hooks else self._plan
+        is_execute_if_empty = self.is_execute_if_empty
+        is_log_steps = self._is_log_steps_enabled()
+
+        async def start_states() -> AsyncIterator[tuple[Any, Any, str]]:
+            async for args in step_data:
+                yield args, None, "start"
+
+        states = start_states()
+        start = 0
+        for index in self._batch_indexes:
+            states = self._stream_steps_async(
+                states,
+                plan[start:index],  # type: ignore
+                start,
+                is_execute_if_empty,
+                is_log_steps,
+            )
+            states = self._stream_batch_async(
+                states, index, is_execute_if_empty, is_log_steps
+            )
+            start = index + 1
+        states = self._stream_steps_async(
+            states,
+            plan[start:],  # type: ignore
+            start,
+            is_execute_if_empty,
+            is_log_steps,
+        )
+        async for _, result_data, _ in states:
+            yield result_data
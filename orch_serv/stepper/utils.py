@@ -1,11 +1,28 @@
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    MutableSequence,
+    Sequence,
+)
 import enum
 import inspect
+from itertools import islice
+import pickle
+import threading
 from types import MappingProxyType
 from typing import Any, Union, get_args, get_origin
 import warnings
+import weakref
 
-from orch_serv.exc import DataConsistencyError, ExtraAttributeError
+from orch_serv.exc import (
+    DataConsistencyError,
+    ExtraAttributeError,
+    NotPicklableStepError,
+)
 
 
 class ParameterKind(enum.IntEnum):
@@ -16,6 +33,91 @@ class ParameterKind(enum.IntEnum):
     VAR_KEYWORD = 4
 
 
+SIGNATURE_CACHE_MAXSIZE = 1024
+
+
+class SignatureCache:
+    """
+    Cache of `inspect.signature` results.
+    Callables are referenced weakly, so the cache does not keep
+     dynamically created functions alive,
+     and the least recently used signatures are evicted
+     when the cache is full.
+    Bound methods are cached by their function,
+     callables which do not support weak references
+     or are not hashable are not cached
+    """
+
+    def __init__(self, maxsize: int = SIGNATURE_CACHE_MAXSIZE) -> None:
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be greater than 0")
+        self._maxsize = maxsize
+        self._data: OrderedDict[tuple[weakref.ref, bool], inspect.Signature] = (
+            OrderedDict()
+        )
+        # reentrant, the callback of the weak reference may be called
+        # by the garbage collector while the lock is held
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _remove(self, ref: weakref.ref) -> None:
+        with self._lock:
+            self._data.pop((ref, True), None)
+            self._data.pop((ref, False), None)
+
+    def get(self, obj: Callable) -> inspect.Signature:
+        """
+        Returns the signature of the callable
+        :param Callable obj: callable to inspect
+        :return: signature of the callable
+        :rtype: inspect.Signature
+        """
+        is_bound = inspect.ismethod(obj)
+        try:
+            ref = weakref.ref(obj.__func__ if is_bound else obj)  # type: ignore
+            # the reference is hashed by the callable, e.g. a dataclass
+            # with `__call__` and `eq=True` is not hashable
+            hash(ref)
+        except TypeError:
+            return inspect.signature(obj)
+        key = (ref, is_bound)
+        with self._lock:
+            signature = self._data.get(key)
+            if signature is not None:
+                self._data.move_to_end(key)
+                return signature
+        signature = inspect.signature(obj)
+        with self._lock:
+            # the reference with the callback is stored to remove
+            # the signature when the callable is deleted
+            self._data[(weakref.ref(ref(), self._remove), is_bound)] = signature
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+        return signature
+
+    def clear(self) -> None:
+        """
+        Removes all signatures from the cache
+        :return: nothing
+        """
+        with self._lock:
+            self._data.clear()
+
+
+signature_cache = SignatureCache()
+
+
+def get_signature(obj: Callable) -> inspect.Signature:
+    """
+    Returns the cached signature of the callable
+    :param Callable obj: callable to inspect
+    :return: signature of the callable
+    """
+    return signature_cache.get(obj)
+
+
 def format_signature_parameters(
     parameters: MappingProxyType[str, inspect.Parameter],
 ) -> str:
@@ -69,21 +171,45 @@ def parse_signature(obj: Callable) -> tuple[str, str]:
     :param obj:
     :return: (attributes, returned)
     """
-    signature = inspect.signature(obj)
+    signature = get_signature(obj)
     return format_signature_parameters(signature.parameters), inspect.formatannotation(  # type: ignore
         signature.return_annotation
     )
 
 
 def get_returned_value(obj: Callable) -> Any:
-    signature = inspect.signature(obj)
+    signature = get_signature(obj)
     if get_origin(signature.return_annotation) is tuple:
         return get_args(signature.return_annotation)
     return signature.return_annotation
 
 
+BATCH_ORIGINS = (list, tuple, Sequence, MutableSequence, Iterable)
+
+
+def get_batch_element(annotation: Any) -> Any:
+    """
+    Returns the annotation of the element of the sequence
+    :param annotation: annotation of the sequence, e.g. `list[int]`
+    :return: annotation of the element or `inspect.Signature.empty`
+     if the sequence is not annotated with the element type
+    """
+    args = get_args(annotation)
+    if get_origin(annotation) in BATCH_ORIGINS and args:
+        return args[0]
+    return inspect.Signature.empty
+
+
+def get_batch_returned_value(obj: Callable) -> Any:
+    """
+    :param Callable obj: object of the batch step
+    :return: annotation of the element of the sequence returned by the object
+    """
+    return get_batch_element(get_signature(obj).return_annotation)
+
+
 def get_attributes_obj(obj: Callable) -> str:
-    signature = inspect.signature(obj)
+    signature = get_signature(obj)
     return " ,".join(list(signature.parameters.keys()))
 
 
@@ -91,15 +217,20 @@ def is_optional(field: Any) -> Any:
     return get_origin(field) is Union and type(None) in get_args(field)
 
 
-def validate_data_step(obj: Callable, additional_args: dict) -> None:
+def validate_data_step(
+    obj: Callable, additional_args: dict, is_pickle_required: bool = False
+) -> None:
     """
     Validate provided data for execution step
     :param Callable obj: obj to execution
     :param additional_args: kwargs for execution obj
+    :param bool is_pickle_required: the step is executed in another process,
+     so obj and kwargs must be picklable
     :return: nothing
     :raises ExtraAttributeError: if in kwargs
+    :raises NotPicklableStepError: if obj or kwargs can't be pickled
     """
-    signature_func = inspect.signature(obj)
+    signature_func = get_signature(obj)
     provided_args = set(additional_args.keys())
     existed_attributes = set(signature_func.parameters.keys())
     extra_attributes = provided_args - existed_attributes
@@ -107,6 +238,11 @@ def validate_data_step(obj: Callable, additional_args: dict) -> None:
         raise ExtraAttributeError(
             obj.__name__, list(additional_args), get_attributes_obj(obj)
         )
+    if is_pickle_required:
+        try:
+            pickle.dumps((obj, additional_args))
+        except Exception as exc:
+            raise NotPicklableStepError(obj.__name__, str(exc)) from exc
 
 
 def is_exist_keyword_variable(obj: Callable) -> bool:
@@ -115,12 +251,44 @@ def is_exist_keyword_variable(obj: Callable) -> bool:
     :param Callable obj: obj to execution
     :return: is exist in function **kwargs
     """
-    for param in inspect.signature(obj).parameters.values():
+    for param in get_signature(obj).parameters.values():
         if str(param.kind) == "VAR_KEYWORD":
             return True
     return False
 
 
+def validate_batch_data_consistency(
+    obj: Callable, return_previous_obj: Any, additional_args: dict
+) -> None:
+    """
+    Function for validate data consistency between the step
+     and the batch step, which receives the sequence of the returned data
+    :param Callable obj: obj to execution, the first argument is the batch
+    :param return_previous_obj: annotations returned from previous step
+    :param additional_args: kwargs for execution obj
+    :return: nothing
+    :raises DataConsistencyError: if not consistent data
+    """
+    parameters = list(get_signature(obj).parameters.values())
+    if not parameters:
+        raise DataConsistencyError(
+            obj.__name__, ["The object must receive the batch as the first argument"]
+        )
+    annotation = parameters[0].annotation
+    element = get_batch_element(annotation)
+    if element is not inspect.Signature.empty and element != return_previous_obj:
+        raise DataConsistencyError(
+            obj.__name__,
+            [
+                "Expected and passed type of the element of the batch do not match."
+                f" Expected `{element}`, passed `{return_previous_obj}`"
+            ],
+        )
+    # the batch is checked, so the rest of the arguments are validated
+    # as if the previous step returned the batch
+    validate_data_consistency(obj, annotation, additional_args)
+
+
 def validate_data_consistency(  # noqa: C901
     obj: Callable, return_previous_obj: Any, additional_args: dict
 ) -> None:
@@ -132,7 +300,7 @@ def validate_data_consistency(  # noqa: C901
     :return: nothing
     :raises DataConsistencyError: if not consistent data
     """
-    signature_func = inspect.signature(obj)
+    signature_func = get_signature(obj)
     data_to_check = [return_previous_obj]
     if isinstance(return_previous_obj, tuple):
         data_to_check = list(return_previous_obj)
@@ -189,3 +357,35 @@ def validate_data_consistency(  # noqa: C901
         )
     if errors:
         raise DataConsistencyError(obj.__name__, errors)
+
+
+def iter_chunks(items: Iterable[Any], chunk_size: int) -> Iterator[list[Any]]:
+    """
+    Lazily splits the items into lists,
+     only one chunk is kept in memory
+    :param items: items to split
+    :param int chunk_size: max size of the chunk
+    :return: iterator of the chunks
+    """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+async def aiter_chunks(
+    items: AsyncIterable[Any], chunk_size: int
+) -> AsyncIterator[list[Any]]:
+    """
+    Lazily splits the items of the asynchronous iterable into lists
+    :param items: items to split
+    :param int chunk_size: max size of the chunk
+    :return: asynchronous iterator of the chunks
+    """
+    chunk = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -1,3 +1,5 @@
+import os
+import threading
 from typing import Any, Optional
 
 from pydantic import BaseModel
@@ -78,6 +80,38 @@ class FifthBlock(SyncBlock):
         raise Exception
 
 
+class BoundarySyncBlock(SyncBlock):
+    name_block = "boundary block"
+    is_transport_boundary = True
+
+    def process(self, msg: BaseOrchServMsg):
+        CONST_LIST_SYNC.append(6)
+
+
+class ExecutorSyncBlock(SyncBlock):
+    name_block = "executor block"
+
+    def process(self, msg: BaseOrchServMsg):
+        msg.body.body_option = f"{os.getpid()}:{threading.get_ident()}"
+        return msg
+
+
+class NewMessageSyncBlock(SyncBlock):
+    name_block = "new message block"
+
+    def process(self, msg: BaseOrchServMsg):
+        new_msg = msg.model_copy(deep=True)
+        new_msg.body.body_option = "new message"
+        return new_msg
+
+
+class RecordSyncBlock(SyncBlock):
+    name_block = "record block"
+
+    def process(self, msg: BaseOrchServMsg):
+        CONST_LIST_SYNC.append(msg.body.body_option)
+
+
 class FirstAsyncBlock(AsyncBlock):
     name_block = "first async block"
 
@@ -119,6 +153,30 @@ class FifthAsyncBlock(AsyncBlock):
         raise Exception
 
 
+class BoundaryAsyncBlock(AsyncBlock):
+    name_block = "boundary async block"
+    is_transport_boundary = True
+
+    async def process(self, msg: BaseOrchServMsg):
+        CONST_LIST_ASYNC.append(6)
+
+
+class NewMessageAsyncBlock(AsyncBlock):
+    name_block = "new message async block"
+
+    async def process(self, msg: BaseOrchServMsg):
+        new_msg = msg.model_copy(deep=True)
+        new_msg.body.body_option = "new message"
+        return new_msg
+
+
+class RecordAsyncBlock(AsyncBlock):
+    name_block = "record async block"
+
+    async def process(self, msg: BaseOrchServMsg):
+        CONST_LIST_ASYNC.append(msg.body.body_option)
+
+
 MSG_TO_PROCESS_IN_FIRST_BLOCK = MyTestModel(body=dict(), header=dict())
 MSG_TO_PROCESS_IN_SECOND_BLOCK = MyTestModel(
     body=dict(), header=dict(source="first block")
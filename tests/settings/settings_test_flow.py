@@ -6,10 +6,16 @@ from orch_serv import AsyncFlow, BaseOrchServMsg, FlowBlock, FlowBuilder, SyncFl
 from .settings_test_block import (
     CONST_LIST_ASYNC,
     CONST_LIST_SYNC,
+    BoundaryAsyncBlock,
+    BoundarySyncBlock,
     FirstAsyncBlock,
     FirstBlock,
     FourthAsyncBlock,
     FourthBlock,
+    NewMessageAsyncBlock,
+    NewMessageSyncBlock,
+    RecordAsyncBlock,
+    RecordSyncBlock,
     SecondAsyncBlock,
     SecondBlock,
     ThirdAsyncBlock,
@@ -258,3 +264,66 @@ class FourthTestSyncFlow(SyncFlow):
     def tst_method_with_correct_processing(message: BaseOrchServMsg):
         CONST_LIST_SYNC.append(-4)
         return message
+
+
+class RunToCompletionSyncFlow(SyncFlow):
+    name_flow = "run_to_completion_flow"
+    is_run_to_completion = True
+
+    steps_flow = FlowBuilder(
+        FlowBlock(FirstBlock),
+        FlowBlock(BoundarySyncBlock),
+        FlowBlock(SecondBlock, pre_handler_function=tst_method_with_correct_processing),
+        FlowBlock(ThirdBlock),
+    )
+
+
+class RunToCompletionAsyncFlow(AsyncFlow):
+    name_flow = "run_to_completion_async_flow"
+    is_run_to_completion = True
+
+    steps_flow = FlowBuilder(
+        FlowBlock(FirstAsyncBlock),
+        FlowBlock(BoundaryAsyncBlock),
+        FlowBlock(
+            SecondAsyncBlock,
+            pre_handler_function=async_tst_method_with_correct_processing,
+        ),
+        FlowBlock(ThirdAsyncBlock),
+    )
+
+
+def record_sync_post_handler(message: BaseOrchServMsg):
+    CONST_LIST_SYNC.append(f"post {message.body.body_option}")
+    return message
+
+
+async def record_async_post_handler(message: BaseOrchServMsg):
+    CONST_LIST_ASYNC.append(f"post {message.body.body_option}")
+    return message
+
+
+class NewMessageRunToCompletionSyncFlow(SyncFlow):
+    name_flow = "new_message_run_to_completion_flow"
+    is_run_to_completion = True
+
+    steps_flow = FlowBuilder(
+        FlowBlock(NewMessageSyncBlock, post_handler_function=record_sync_post_handler),
+        FlowBlock(RecordSyncBlock),
+        FlowBlock(FourthBlock),
+        FlowBlock(SecondBlock),
+    )
+
+
+class NewMessageRunToCompletionAsyncFlow(AsyncFlow):
+    name_flow = "new_message_run_to_completion_async_flow"
+    is_run_to_completion = True
+
+    steps_flow = FlowBuilder(
+        FlowBlock(
+            NewMessageAsyncBlock, post_handler_function=record_async_post_handler
+        ),
+        FlowBlock(RecordAsyncBlock),
+        FlowBlock(FourthAsyncBlock),
+        FlowBlock(SecondAsyncBlock),
+    )
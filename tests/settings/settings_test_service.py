@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, Optional
 
 from pydantic import BaseModel
@@ -9,6 +10,7 @@ from orch_serv.service import (
     AsyncService,
     CommandHandlerPostProcessStrategy,
     CommandHandlerProcessStrategy,
+    ResultShape,
     Service,
     ServiceBlock,
     ServiceBuilder,
@@ -310,3 +312,133 @@ class AsyncSwapService(AsyncService):
             processor=AsyncSwapThirdProcessHandler,
         ),
     )
+
+
+BATCHES_SYNC = []
+BATCHES_ASYNC = []
+
+
+class BatchProcessHandler(CommandHandlerProcessStrategy):
+    target_command = "FirstProcessHandler"
+
+    def process(self, message: BaseOrchServMsg):
+        return message, None
+
+
+class BatchAsyncProcessHandler(AsyncCommandHandlerProcessStrategy):
+    target_command = "FirstAsyncProcessHandler"
+
+    async def process(self, message: BaseOrchServMsg):
+        return message, None
+
+
+class BatchPostProcessHandler(CommandHandlerPostProcessStrategy):
+    def post_process(
+        self, msg: BaseOrchServMsg, additional_data: Optional[Any] = None
+    ) -> None:
+        BATCHES_SYNC.append([msg])
+
+    def post_process_batch(self, batch: list) -> None:
+        BATCHES_SYNC.append([msg for msg, _ in batch])
+
+
+class BatchAsyncPostProcessHandler(AsyncCommandHandlerPostProcessStrategy):
+    async def post_process(
+        self, msg: BaseOrchServMsg, additional_data: Optional[Any] = None
+    ) -> None:
+        BATCHES_ASYNC.append(msg)
+
+
+class BatchService(Service):
+    service_commands = ServiceBuilder(
+        ServiceBlock(processor=BatchProcessHandler),
+        default_post_process=BatchPostProcessHandler,
+    )
+
+
+class BatchAsyncService(AsyncService):
+    service_commands = ServiceBuilder(
+        ServiceBlock(processor=BatchAsyncProcessHandler),
+        default_post_process=BatchAsyncPostProcessHandler,
+    )
+
+
+CONCURRENCY_STATE = {"in_progress": 0, "max_in_progress": 0, "limited": 0}
+
+
+class ConcurrentAsyncProcessHandler(AsyncCommandHandlerProcessStrategy):
+    target_command = "FirstAsyncProcessHandler"
+
+    async def process(self, message: BaseOrchServMsg):
+        CONCURRENCY_STATE["in_progress"] += 1
+        CONCURRENCY_STATE["max_in_progress"] = max(
+            CONCURRENCY_STATE["max_in_progress"], CONCURRENCY_STATE["in_progress"]
+        )
+        await asyncio.sleep(0.01)
+        CONCURRENCY_STATE["in_progress"] -= 1
+        if message.body.with_error:
+            raise ValueError
+        return None
+
+
+class LimitedAsyncProcessHandler(AsyncCommandHandlerProcessStrategy):
+    target_command = "SecondAsyncProcessHandler"
+    max_concurrency = 1
+
+    async def process(self, message: BaseOrchServMsg):
+        CONCURRENCY_STATE["limited"] += 1
+        assert CONCURRENCY_STATE["limited"] == 1
+        await asyncio.sleep(0.01)
+        CONCURRENCY_STATE["limited"] -= 1
+        return None
+
+
+class ConcurrentAsyncService(AsyncService):
+    service_commands = ServiceBuilder(
+        ServiceBlock(processor=ConcurrentAsyncProcessHandler),
+        ServiceBlock(processor=LimitedAsyncProcessHandler),
+    )
+
+
+POST_PROCESSED = []
+
+
+class AutoShapeProcessHandler(CommandHandlerProcessStrategy):
+    target_command = "AutoShapeProcessHandler"
+
+    def process(self, message: BaseOrchServMsg):
+        if message.body.base_option == "tuple":
+            return message, "additional"
+        return message
+
+
+class MessageShapeProcessHandler(CommandHandlerProcessStrategy):
+    target_command = "MessageShapeProcessHandler"
+    result_shape = ResultShape.MESSAGE
+
+    def process(self, message: BaseOrchServMsg):
+        return message
+
+
+class TupleShapeProcessHandler(CommandHandlerProcessStrategy):
+    target_command = "TupleShapeProcessHandler"
+    result_shape = ResultShape.TUPLE
+
+    def process(self, message: BaseOrchServMsg):
+        return message, "additional"
+
+
+class ShapePostProcessHandler(CommandHandlerPostProcessStrategy):
+    def post_process(
+        self, msg: BaseOrchServMsg, additional_data: Optional[Any] = None
+    ) -> None:
+        POST_PROCESSED.append((msg, additional_data))
+
+
+class ShapeService(Service):
+    service_commands = ServiceBuilder(
+        ServiceBlock(processor=AutoShapeProcessHandler),
+        ServiceBlock(processor=MessageShapeProcessHandler),
+        ServiceBlock(processor=TupleShapeProcessHandler),
+        default_post_process=ShapePostProcessHandler,
+    )
@@ -1,6 +1,7 @@
-from typing import Any, List, Optional, Tuple
+import asyncio
+from typing import Any, List, Optional, Sequence, Tuple
 
-from orch_serv import Step, Stepper, StepsBuilder
+from orch_serv import AsyncStepper, ParallelSteps, Step, Stepper, StepsBuilder
 
 
 def tst_function() -> Tuple[int, int]:
@@ -85,3 +86,52 @@ def tst_function_with_optional() -> Optional[int]:
 
 def tst_function_with_optional_2(val: int) -> None:
     pass
+
+
+PARALLEL_STATE = dict(in_progress=0, max_in_progress=0)
+
+
+async def async_load(value: int) -> int:
+    PARALLEL_STATE["in_progress"] += 1
+    PARALLEL_STATE["max_in_progress"] = max(
+        PARALLEL_STATE["max_in_progress"], PARALLEL_STATE["in_progress"]
+    )
+    await asyncio.sleep(0.01)
+    PARALLEL_STATE["in_progress"] -= 1
+    return value + 1
+
+
+async def async_double(value: int) -> int:
+    await asyncio.sleep(0.01)
+    return value * 2
+
+
+def sync_square(value: int) -> int:
+    return value * value
+
+
+def merge_results(first: int, second: int, third: int) -> List[int]:
+    return [first, second, third]
+
+
+class MyAsyncFlow(AsyncStepper):
+    steps = StepsBuilder(
+        Step(async_load),
+        ParallelSteps(
+            Step(async_load), Step(async_double), Step(sync_square), max_concurrency=2
+        ),
+        Step(merge_results),
+    )
+
+
+def executor_negate(value: int) -> int:
+    return -value
+
+
+async def async_double_half(value: int) -> int:
+    await asyncio.sleep(0)
+    return value // 2
+
+
+def one_id(value: int) -> Sequence[int]:
+    return (value,)
@@ -1,6 +1,7 @@
 """
 Tests for block
 """
+
 from copy import deepcopy
 from typing import Optional
 
@@ -17,11 +18,14 @@ from tests.settings.settings_test_block import (
     MSG_TO_PROCESS_IN_SECOND_BLOCK,
     FirstAsyncBlock,
     FirstBlock,
+    FourthBlock,
+    MyTestModel,
     OtherClassForBlocks,
     OtherClassForBlocksWithErrorInTimeInit,
     OtherClassForBlocksWithErrorInTimeInitWithoutArguments,
     SecondAsyncBlock,
     SecondBlock,
+    ThirdBlock,
     async_tst_method_with_correct_processing,
     async_tst_method_with_incorrect_processing,
     tst_method_with_correct_processing,
@@ -277,3 +281,55 @@ async def test_async_block():
         block_f.post_handler_function = 1
     with pytest.raises(TypeError):
         block_f.post_handler_function = "sad"
+
+
+def test_block_snapshot(mocker):
+    """
+    the message is copied only if the post handler
+     can receive the message sent to `process`
+    """
+    CONST_LIST_SYNC.clear()
+    received = list()
+
+    def post_handler(msg):
+        received.append(msg)
+
+    spy = mocker.spy(BaseOrchServMsg, "snapshot")
+    message = deepcopy(MSG_TO_PROCESS_IN_FIRST_BLOCK)
+    ThirdBlock(post_handler_function=post_handler).handle(message)
+    assert spy.call_count == 1
+    assert received == [message]
+    assert received[0] is not message
+
+    FourthBlock(post_handler_function=post_handler).handle(
+        deepcopy(MSG_TO_PROCESS_IN_FIRST_BLOCK)
+    )
+    FirstBlock().handle(deepcopy(MSG_TO_PROCESS_IN_FIRST_BLOCK))
+    assert spy.call_count == 1
+    assert len(received) == 1
+    assert CONST_LIST_SYNC == [3, 4, 1]
+
+
+@pytest.mark.asyncio
+async def test_block_lazy_message():
+    """
+    the lazily validated message with the body from a buffer
+     is copied for the post handler
+    """
+    CONST_LIST_SYNC.clear()
+    CONST_LIST_ASYNC.clear()
+    json_body = b'{"body_option": "lazy"}'
+    for body in (memoryview(json_body), bytearray(json_body)):
+        message = MyTestModel.model_validate_lazy(dict(body=body, header=dict()))
+        FirstBlock(post_handler_function=tst_method_with_correct_processing).handle(
+            message
+        )
+        message = MyTestModel.model_validate_lazy(dict(body=body, header=dict()))
+        await FirstAsyncBlock(
+            post_handler_function=async_tst_method_with_correct_processing
+        ).handle(message)
+        assert message.body.body_option == "lazy"
+    assert CONST_LIST_SYNC == [1, -1] * 2
+    assert CONST_LIST_ASYNC == [1, -1] * 2
+    CONST_LIST_SYNC.clear()
+    CONST_LIST_ASYNC.clear()
@@ -6,6 +6,7 @@ from charset_normalizer.md import getLogger
 from orch_serv import FlowBlock, FlowBuilder, SyncFlow
 from orch_serv.exc import (
     FlowBlockException,
+    FlowException,
     FlowBuilderException,
     NotUniqueBlockInFlowError,
     WorkTypeMismatchException,
@@ -33,6 +34,10 @@ from tests.settings.settings_test_flow import (
     IncorrectTestFlowWithIncorrectTypeSteps,
     IncorrectTestFlowWithoutNameFlow,
     IncorrectTestFlowWithoutStepsFlow,
+    NewMessageRunToCompletionAsyncFlow,
+    NewMessageRunToCompletionSyncFlow,
+    RunToCompletionAsyncFlow,
+    RunToCompletionSyncFlow,
     Test,
     TestAsyncFlow,
     TestFlow,
@@ -142,3 +147,116 @@ def test_flow_block():
         fb.init_block(ThirdTestAsyncFlow)
     with pytest.raises(TypeError):
         fb.init_block(FirstBlock)
+
+
+def test_flow_dispatch_table():
+    """
+    test resuming a message in a long flow by source
+    :return:
+    """
+    count_blocks = 1500  # deeper than the default recursion limit
+    blocks = [
+        type(f"LongFlowBlock{i}", (FirstBlock,), {"name_block": f"block {i}"})
+        for i in range(count_blocks)
+    ]
+
+    class LongFlow(SyncFlow):
+        name_flow = "long_flow"
+        steps_flow = FlowBuilder(*[FlowBlock(block) for block in blocks])
+
+    flow = LongFlow()
+    assert len(flow._dispatch_table) == count_blocks
+    assert flow._dispatch_table[f"block {count_blocks - 1}"] is None
+
+    CONST_LIST_SYNC.clear()
+    msg = deepcopy(MSG_TO_PROCESS_IN_FIRST_BLOCK)
+    msg.set_source(f"block {count_blocks - 2}")
+    flow.to_go_with_the_flow(msg)
+    assert CONST_LIST_SYNC == [1]
+    assert msg.get_source() == f"block {count_blocks - 1}"
+
+    with pytest.raises(FlowException):
+        flow.to_go_with_the_flow(msg)
+    msg.set_source("not existed block")
+    with pytest.raises(FlowException):
+        flow.to_go_with_the_flow(msg)
+    assert CONST_LIST_SYNC == [1]
+
+
+def test_flow_run_to_completion():
+    """
+    test driving a message through all in-process blocks in one call
+    :return:
+    """
+    CONST_LIST_SYNC.clear()
+    flow = RunToCompletionSyncFlow()
+    msg = deepcopy(MSG_TO_PROCESS_IN_FIRST_BLOCK)
+    flow.to_go_with_the_flow(msg)
+    assert CONST_LIST_SYNC == [1, 6]
+    assert msg.get_source() == "boundary block"
+    flow.to_go_with_the_flow(msg)
+    assert CONST_LIST_SYNC == [1, 6, -1, 2, 3]
+    assert msg.get_source() == "third block"
+
+    CONST_LIST_SYNC.clear()
+    flow.to_go_with_the_flow(
+        deepcopy(MSG_TO_PROCESS_IN_FIRST_BLOCK), is_run_to_completion=False
+    )
+    assert CONST_LIST_SYNC == [1]
+
+    CONST_LIST_SYNC.clear()
+    flow = TestFlow()
+    flow.to_go_with_the_flow(
+        deepcopy(MSG_TO_PROCESS_IN_FIRST_BLOCK), is_run_to_completion=True
+    )
+    assert CONST_LIST_SYNC == [-3, 1, -1, -1, 2, -3]
+
+
+@pytest.mark.asyncio
+async def test_async_flow_run_to_completion():
+    """
+    test driving a message through all in-process async blocks in one call
+    :return:
+    """
+    CONST_LIST_ASYNC.clear()
+    flow = RunToCompletionAsyncFlow()
+    msg = deepcopy(MSG_TO_PROCESS_IN_FIRST_BLOCK)
+    await flow.to_go_with_the_flow(msg)
+    assert CONST_LIST_ASYNC == [1, 6]
+    await flow.to_go_with_the_flow(msg)
+    assert CONST_LIST_ASYNC == [1, 6, -1, 2, 3]
+    assert msg.get_source() == "third async block"
+
+    CONST_LIST_ASYNC.clear()
+    flow = TestAsyncFlow()
+    await flow.to_go_with_the_flow(
+        deepcopy(MSG_TO_PROCESS_IN_FIRST_BLOCK), is_run_to_completion=True
+    )
+    assert CONST_LIST_ASYNC == [-3, 1, -1, -1, 2, -3]
+
+
+def test_flow_run_to_completion_new_message():
+    """
+    test the next block gets the message returned by the `process`
+    :return:
+    """
+    CONST_LIST_SYNC.clear()
+    msg = deepcopy(MSG_TO_PROCESS_IN_FIRST_BLOCK)
+    NewMessageRunToCompletionSyncFlow().to_go_with_the_flow(msg)
+    # the flow stops after the block without a message
+    # and `is_execute_after_nullable_process_msg = False`
+    assert CONST_LIST_SYNC == ["post new message", "new message", 4]
+    assert msg.body.body_option is None
+
+
+@pytest.mark.asyncio
+async def test_async_flow_run_to_completion_new_message():
+    """
+    test the next async block gets the message returned by the `process`
+    :return:
+    """
+    CONST_LIST_ASYNC.clear()
+    msg = deepcopy(MSG_TO_PROCESS_IN_FIRST_BLOCK)
+    await NewMessageRunToCompletionAsyncFlow().to_go_with_the_flow(msg)
+    assert CONST_LIST_ASYNC == ["post new message", "new message", 4]
+    assert msg.body.body_option is None
@@ -0,0 +1,125 @@
+"""
+Module with tests orch_serv.hooks
+"""
+
+import pytest
+
+from orch_serv import SyncOrchestrator, hooks
+from orch_serv.hooks import Hook, HistogramHook, register_hook, unregister_hook
+from orch_serv.stepper.stepper import Step, Stepper, StepsBuilder
+from tests.settings.settings_test_block import (
+    FifthBlock,
+    FirstAsyncBlock,
+    FirstBlock,
+    MyTestModel,
+)
+from tests.settings.settings_test_service import (
+    MyAsyncService,
+    MySyncService,
+    msg_to_async_first_handler,
+    msg_to_first_handler,
+)
+
+
+class RecordingHook(Hook):
+    def __init__(self):
+        self.events = []
+
+    def on_start(self, event):
+        self.events.append(("start", event.kind, event.name))
+
+    def on_end(self, event):
+        assert event.duration >= 0
+        self.events.append(("end", event.kind, event.name))
+
+    def on_error(self, event):
+        assert event.error is not None
+        self.events.append(("error", event.kind, event.name))
+
+
+@pytest.fixture
+def recording_hook():
+    hook = RecordingHook()
+    histogram = HistogramHook()
+    register_hook(hook)
+    register_hook(histogram)
+    register_hook(hook)
+    try:
+        yield hook, histogram
+    finally:
+        unregister_hook(hook)
+        unregister_hook(histogram)
+
+
+def increment(value: int) -> int:
+    return value + 1
+
+
+@pytest.mark.asyncio
+async def test_hooks(recording_hook):
+    hook, histogram = recording_hook
+    assert hooks.registered_hooks == (hook, histogram)
+    with pytest.raises(TypeError):
+        register_hook(object())
+
+    orchestrator = SyncOrchestrator(blocks=[FirstBlock, FifthBlock])
+    orchestrator.handle(MyTestModel(body=dict(), header=dict(target="first block")))
+    await FirstAsyncBlock().handle(MyTestModel(body=dict(), header=dict()))
+    MySyncService().handle(msg_to_first_handler)
+    await MyAsyncService().handle(msg_to_async_first_handler)
+    Stepper(StepsBuilder(Step(increment))).step_by_step(1)
+    orchestrator.handle(MyTestModel(body=dict(), header=dict(target="fifth block")))
+
+    assert hook.events == [
+        ("start", "block", "first block"),
+        ("end", "block", "first block"),
+        ("start", "block", "first async block"),
+        ("end", "block", "first async block"),
+        ("start", "command", "FirstProcessHandler"),
+        ("end", "command", "FirstProcessHandler"),
+        ("start", "command", "FirstAsyncProcessHandler"),
+        ("end", "command", "FirstAsyncProcessHandler"),
+        ("start", "step", "increment"),
+        ("end", "step", "increment"),
+        ("start", "block", "fifth block"),
+        ("error", "block", "fifth block"),
+    ]
+    summary = histogram.summary()
+    assert summary[("block", "first block")]["count"] == 1
+    assert summary[("block", "fifth block")]["errors"] == 1
+    assert histogram.percentile("step", "increment", 99) > 0
+    assert histogram.percentile("step", "not existed", 99) is None
+    histogram.reset()
+    assert histogram.summary() == {}
+
+
+def test_histogram_percentiles():
+    histogram = HistogramHook()
+    for duration in range(1, 101):
+        event = hooks.HookEvent("block", "block")
+        event.duration = duration / 1000
+        histogram.on_end(event)
+    assert histogram.percentile("block", "block", 50) == pytest.approx(0.05, rel=0.1)
+    assert histogram.percentile("block", "block", 99) == pytest.approx(0.099, rel=0.1)
+    assert histogram.percentile("block", "block", 100) == pytest.approx(0.1)
+    with pytest.raises(ValueError):
+        HistogramHook(growth_factor=1)
+
+
+def test_without_hooks():
+    assert hooks.registered_hooks == tuple()
+    assert Step(increment).execute(1) == 2
+
+
+class Incrementer:
+    def __call__(self, value: int) -> int:
+        return value + 1
+
+
+def test_hooks_callable_step(recording_hook):
+    hook, _ = recording_hook
+    assert Step(Incrementer()).execute(1) == 2
+    assert hook.events == [
+        ("start", "step", "Incrementer"),
+        ("end", "step", "Incrementer"),
+    ]
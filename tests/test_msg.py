@@ -1,13 +1,34 @@
 """
 Test msg library
 """
-# pylint: disable=too-few-public-methods,no-name-in-module,invalid-name,abstract-method
-from typing import Dict, Optional, Type, Union
 
+# pylint: disable=too-few-public-methods,no-name-in-module,invalid-name,abstract-method
+import gc
+import pickle
+from typing import Dict, List, Optional, Type, Union
+import weakref
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    PrivateAttr,
+    ValidationError,
+    create_model,
+    model_validator,
+)
 import pytest
-from pydantic import BaseModel, ValidationError
 
 from orch_serv import BaseOrchServMsg
+from orch_serv.exc import MsgCodecError
+from orch_serv.msg import (
+    MSG_CLASS_REGISTRY,
+    LazyMessageRepr,
+    MsgClassRegistry,
+    MsgEnvelope,
+    decode_envelope,
+    encode_message,
+)
+from tests.settings.settings_test_block import BodyModel as BlockBodyModel, MyTestModel
 
 
 class BodyModel(BaseModel):
@@ -311,3 +332,352 @@ def test_get_command() -> None:
     val = CorrectMsg(body=body_data(), header=dict(command=test_command))
 
     assert val.get_command() == test_command
+
+
+def test_snapshot() -> None:
+    """
+    Test the snapshot is not affected by changes of the original message
+    :return: nothing
+    """
+
+    class NestedBodyModel(BaseModel):
+        """
+        test class
+        """
+
+        values: List[int] = []
+        options: Dict[str, BodyModel] = {}
+
+    class MyType(BaseOrchServMsg):
+        """
+        Test class
+        """
+
+        body: NestedBodyModel
+        header: HeaderModel
+
+    val = MyType(
+        body=dict(values=[1, 2], options=dict(first=body_data())),
+        header=header_data(),
+    )
+    snapshot = val.snapshot()
+    assert isinstance(snapshot, MyType)
+    assert snapshot == val
+    assert snapshot is not val
+
+    val.header.header_option = "changed"
+    val.body.values.append(3)
+    val.body.options["first"].body_option = "changed"
+    val.body.options["second"] = BodyModel()
+
+    assert snapshot.header.header_option == "test_header"
+    assert snapshot.body.values == [1, 2]
+    assert snapshot.body.options == dict(first=body_data(is_raw=False))
+
+    class ExtraType(MyType):
+        """
+        Test class with extra fields and private attributes
+        """
+
+        model_config = ConfigDict(extra="allow")
+        _trace: List[str] = PrivateAttr(default_factory=list)
+
+    val = ExtraType(body=dict(values=[1]), header=header_data(), tags=["first"])
+    val._trace.append("first")
+    snapshot = val.snapshot()
+    val.tags.append("second")
+    val._trace.append("second")
+    assert snapshot.tags == ["first"]
+    assert snapshot._trace == ["first"]
+
+
+def test_lazy_message_repr() -> None:
+    """
+    Test the representation of the message for the logs
+    :return: nothing
+    """
+
+    class LargeBodyModel(BaseModel):
+        """
+        test class
+        """
+
+        payload: str
+        values: List[int]
+
+    class MyType(BaseOrchServMsg):
+        """
+        Test class
+        """
+
+        body: LargeBodyModel
+        header: HeaderModel
+
+    val = MyType(
+        body=dict(payload="x" * 10_000, values=list(range(10_000))),
+        header=header_data(),
+    )
+    assert str(LazyMessageRepr(val)) == str(val)
+    assert str(LazyMessageRepr(val, is_dump=True)) == str(
+        val.model_dump(exclude_unset=True)
+    )
+    bounded = str(LazyMessageRepr(val, max_length=300))
+    assert len(bounded) <= 303
+    assert bounded.startswith("MyType(body=LargeBodyModel(payload='xxx")
+    short = str(LazyMessageRepr(val.header, max_length=300))
+    assert short == "HeaderModel(header_option='test_header')"
+    assert str(LazyMessageRepr("not a message", max_length=5)) == "'not ..."
+
+
+def test_binary_envelope() -> None:
+    """
+    Test the binary envelope of the message
+    :return: nothing
+    """
+
+    class RoutingHeaderModel(BaseModel):
+        """
+        test class
+        """
+
+        source: Optional[str] = None
+        command: Optional[str] = None
+
+    class MyType(BaseOrchServMsg):
+        """
+        Test class
+        """
+
+        body: BodyModel
+        header: Optional[RoutingHeaderModel] = None
+
+        def get_source(self) -> Optional[str]:
+            return self.header.source if self.header else None
+
+        def get_command(self) -> Optional[str]:
+            return self.header.command if self.header else None
+
+    val = MyType(body=body_data(), header=dict(source="первый", command="test_command"))
+    data = encode_message(val)
+    envelope = decode_envelope(bytearray(data))
+    assert isinstance(envelope, MsgEnvelope)
+    assert envelope.get_source() == "первый"
+    assert envelope.get_command() == "test_command"
+    # not implemented methods of the message
+    assert envelope.get_flow() is None
+    assert envelope.get_target() is None
+    assert isinstance(envelope.body, memoryview)
+    assert envelope.decode(MyType) == val
+
+    # the routing header is read-only and mirrors the header of the message
+    assert not hasattr(envelope, "set_source")
+    forwarded = decode_envelope(envelope.to_bytes())
+    assert forwarded.get_source() == "первый"
+    assert bytes(forwarded.body) == bytes(envelope.body)
+    assert forwarded.decode(MyType) == val
+
+    without_header = MyType(body=body_data())
+    envelope = decode_envelope(encode_message(without_header))
+    assert envelope.header is None
+    assert envelope.decode(MyType) == without_header
+
+    for wrong_data in (b"", b"XYZ\x01", data[:10], data[:1] + b"X" + data[2:]):
+        with pytest.raises(MsgCodecError):
+            decode_envelope(wrong_data)
+    with pytest.raises(MsgCodecError):
+        encode_message(MyType(body=body_data(), header=dict(source="x" * 70_000)))
+
+    class TracedType(MyType):
+        """
+        Test class with a field except the header and the body
+        """
+
+        trace_id: str = "none"
+
+    # the fields except the header and the body would be lost by the envelope
+    traced = TracedType(body=body_data(), trace_id="abc")
+    with pytest.raises(MsgCodecError, match="trace_id"):
+        encode_message(traced)
+    with pytest.raises(MsgCodecError, match="trace_id"):
+        encode_message(TracedType(body=body_data()))
+
+    class ExtraType(MyType):
+        """
+        Test class with extra fields
+        """
+
+        model_config = ConfigDict(extra="allow")
+
+    assert decode_envelope(encode_message(ExtraType(body=body_data()))).decode(
+        ExtraType
+    ) == ExtraType(body=body_data())
+    with pytest.raises(MsgCodecError, match="trace_id"):
+        encode_message(ExtraType(body=body_data(), trace_id="abc"))
+
+
+def test_lazy_body_validation(mocker) -> None:
+    """
+    Test the lazy validation of the body of the message
+    :return: nothing
+    """
+
+    class MyType(BaseOrchServMsg):
+        """
+        Test class
+        """
+
+        body: BodyModel
+        header: Optional[HeaderModel] = None
+
+        def get_target(self) -> Optional[str]:
+            return self.header.header_option
+
+    data = dict(body=body_data(), header=header_data())
+    val = MyType.model_validate_lazy(data)
+    assert isinstance(val, MyType)
+    assert not val.is_body_validated
+    assert isinstance(val.header, HeaderModel)
+    assert val.get_target() == "test_header"
+    spy_validate = mocker.spy(MyType, "_validate_lazy_body")
+    assert val.body == body_data(is_raw=False)
+    assert val.is_body_validated
+    # the validated body is cached in the message
+    assert val.body is val.body
+    assert spy_validate.call_count == 1
+    assert val == MyType(**data)
+    assert val.model_dump(exclude_unset=True) == data
+
+    # the snapshot keeps the body not validated
+    not_validated = MyType.model_validate_lazy(data)
+    snapshot = not_validated.snapshot()
+    assert not snapshot.is_body_validated
+    assert snapshot == not_validated
+    assert not_validated.model_dump_json() == MyType(**data).model_dump_json()
+
+    json_val = MyType.model_validate_lazy(MyType(**data).model_dump_json())
+    assert not json_val.is_body_validated
+    assert json_val == val
+
+    envelope = decode_envelope(encode_message(val))
+    lazy_val = envelope.decode(MyType, is_lazy=True)
+    assert not lazy_val.is_body_validated
+    assert lazy_val == val
+
+    invalid_body = MyType.model_validate_lazy(dict(body=dict(body_option=[1])))
+    assert invalid_body.header is None
+    with pytest.raises(ValidationError):
+        invalid_body.body  # noqa: B018
+    with pytest.raises(ValidationError):
+        MyType.model_validate_lazy(
+            dict(body=body_data(), header=dict(header_option=[1]))
+        )
+    # data with missing or unknown fields is validated completely
+    with pytest.raises(ValidationError):
+        MyType.model_validate_lazy(dict(header=header_data()))
+    assert MyType.model_validate_lazy(dict(data, extra=1)).is_body_validated
+    with pytest.raises(AttributeError):
+        MyType.model_construct().body  # noqa: B018
+
+
+def test_lazy_body_serialization() -> None:
+    """
+    Test the serialization of the lazily validated message
+     as a field of another model and of the class with model validators
+    :return: nothing
+    """
+
+    class Wrapper(BaseModel):
+        """
+        Test class with the message as a field
+        """
+
+        msg: MyTestModel
+
+    data = dict(
+        body=dict(body_option="lazy"),
+        header=dict(source="test_source", flow=None, target=None),
+    )
+    lazy = MyTestModel.model_validate_lazy(data)
+    assert lazy.model_fields_set == {"body", "header"}
+    assert not lazy.is_body_validated
+    assert Wrapper(msg=lazy).model_dump() == dict(msg=data)
+    assert lazy.is_body_validated
+    lazy = MyTestModel.model_validate_lazy(data)
+    assert Wrapper.model_validate_json(Wrapper(msg=lazy).model_dump_json()) == (
+        Wrapper(msg=MyTestModel(**data))
+    )
+    lazy = MyTestModel.model_validate_lazy(data)
+    assert dict(lazy) == dict(MyTestModel(**data))
+    lazy = MyTestModel.model_validate_lazy(data)
+    assert "lazy" in repr(lazy)
+
+    class CheckedType(MyTestModel):
+        """
+        Test class with the model validator which reads the body
+        """
+
+        @model_validator(mode="after")
+        def check_body(self) -> "CheckedType":
+            assert self.body.body_option
+            return self
+
+    # the class with model validators is validated completely
+    checked = CheckedType.model_validate_lazy(data)
+    assert checked.is_body_validated
+    assert checked == CheckedType(**data)
+
+
+def test_lazy_body_assignment_and_pickle() -> None:
+    """
+    Test the assignment of the body of the lazily validated message
+     and pickling of the message decoded from the envelope
+    :return: nothing
+    """
+    data = dict(body=dict(body_option="raw"), header=dict(source="test_source"))
+    val = MyTestModel.model_validate_lazy(data)
+    val.body = BlockBodyModel(body_option="assigned")
+    assert val.is_body_validated
+    assert val.body.body_option == "assigned"
+    assert val.model_dump() == dict(
+        body=dict(body_option="assigned"),
+        header=dict(source="test_source", flow=None, target=None),
+    )
+
+    envelope = decode_envelope(encode_message(MyTestModel(**data)))
+    lazy_val = envelope.decode(MyTestModel, is_lazy=True)
+    restored = pickle.loads(pickle.dumps(lazy_val))
+    assert not restored.is_body_validated
+    assert restored == MyTestModel(**data)
+
+
+def test_msg_class_registry() -> None:
+    """
+    Test the registry of parametrised message classes
+    :return: nothing
+    """
+    registry = MsgClassRegistry(maxsize=2)
+    first_class = registry.get(BaseOrchServMsg, BodyModel, HeaderModel)
+    assert registry.get(BaseOrchServMsg, BodyModel, HeaderModel) is first_class
+    assert first_class is BaseOrchServMsg[BodyModel, HeaderModel]
+    val = first_class(body=body_data(), header=header_data())
+    assert val.body == body_data(is_raw=False)
+    assert registry.info() == dict(hits=1, misses=1, size=1, maxsize=2)
+
+    def make_body_model(name: str) -> Type[BaseModel]:
+        return create_model(name, body_option=(str, ...))
+
+    evicted = weakref.ref(registry.get(BaseOrchServMsg, make_body_model("Evicted")))
+    registry.get(BaseOrchServMsg, make_body_model("Second"))
+    registry.get(BaseOrchServMsg, BodyModel, HeaderModel)
+    assert len(registry) == 2
+    gc.collect()
+    # the evicted class is not referenced by the registry or pydantic
+    assert evicted() is None
+    assert BaseOrchServMsg.parametrize(BodyModel, HeaderModel) is first_class
+    assert (
+        MSG_CLASS_REGISTRY.get(BaseOrchServMsg, BodyModel, HeaderModel) is first_class
+    )
+    registry.clear()
+    assert registry.info() == dict(hits=0, misses=0, size=0, maxsize=2)
+    with pytest.raises(ValueError):
+        MsgClassRegistry(maxsize=0)
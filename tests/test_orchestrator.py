@@ -1,13 +1,19 @@
 """
 Test Orchestrator
 """
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import inspect
+import os
+import threading
+import time
 from copy import deepcopy
 from logging import getLogger
 
 import pytest
 
-from orch_serv import AsyncOrchestrator, SyncOrchestrator
+from orch_serv import AsyncBlock, AsyncOrchestrator, SyncBlock, SyncOrchestrator
+from orch_serv.orchestrator.block import InlineExecutor
 from orch_serv.exc import (
     NoDateException,
     NotFoundDefaultError,
@@ -53,7 +59,9 @@ from tests.settings.settings_orchestrator.settings_orchestrator_msgs import (
 from tests.settings.settings_test_block import (
     CONST_LIST_ASYNC,
     CONST_LIST_SYNC,
+    ExecutorSyncBlock,
     FirstBlock,
+    MyTestModel,
     SecondBlock,
 )
 from tests.settings.settings_test_flow import SecondTestFlow, TestFlow
@@ -649,3 +657,232 @@ async def test_async_orchestrator_handler():
     assert res == CORRECT_MSG_TO_ASYNC_BLOCK_WITH_EXCEPTION
     res = await orchestrator.handle(deepcopy(CORRECT_EMPTY_MSG))
     assert res == CORRECT_EMPTY_MSG
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_run_to_completion():
+    """
+    Test orchestrator drives flows messages to completion
+    :return:
+    """
+    CONST_LIST_SYNC.clear()
+    orchestrator = SyncOrchestrator(flows=[TestFlow], is_run_to_completion=True)
+    res = orchestrator.handle(deepcopy(CORRECT_MSG_FIRST_FLOW_FIRST_BLOCK))
+    assert res is None
+    assert CONST_LIST_SYNC == [-3, 1, -1, -1, 2, -3]
+
+    CONST_LIST_ASYNC.clear()
+    orchestrator = AsyncOrchestrator(
+        flows=settings_correct_orchestrator_async_flows, is_run_to_completion=True
+    )
+    res = await orchestrator.handle(deepcopy(ASYNC_CORRECT_MSG_FIRST_FLOW_FIRST_BLOCK))
+    assert res is None
+    assert CONST_LIST_ASYNC == [-3, 1, -1, -1, 2, -3]
+
+
+class SlowAsyncBlock(AsyncBlock):
+    name_block = "slow async block"
+    in_progress = 0
+    max_in_progress = 0
+
+    async def process(self, msg):
+        SlowAsyncBlock.in_progress += 1
+        SlowAsyncBlock.max_in_progress = max(
+            SlowAsyncBlock.max_in_progress, SlowAsyncBlock.in_progress
+        )
+        await asyncio.sleep(0.01)
+        SlowAsyncBlock.in_progress -= 1
+        CONST_LIST_ASYNC.append(int(msg.body.body_option))
+
+
+@pytest.mark.asyncio
+async def test_async_orchestrator_handle_batch():
+    """
+    Test orchestrator handling batch and stream of msgs
+    :return:
+    """
+    CONST_LIST_ASYNC.clear()
+    orchestrator = AsyncOrchestrator(
+        blocks=[
+            settings_correct_orchestrator_async_blocks.FirstAsyncBlock,
+            settings_correct_orchestrator_async_blocks.SecondAsyncBlock,
+            SlowAsyncBlock,
+        ],
+        flows=settings_correct_orchestrator_async_flows,
+    )
+    res = await orchestrator.handle_batch(
+        [
+            deepcopy(ASYNC_CORRECT_MSG_TO_FIRST_BLOCK),
+            ASYNC_INCORRECT_MSG_TO_BLOCK,
+            CONST_LIST_ASYNC,
+            deepcopy(ASYNC_CORRECT_MSG_TO_SECOND_BLOCK),
+            deepcopy(ASYNC_CORRECT_MSG_FIRST_FLOW_FIRST_BLOCK),
+        ]
+    )
+    assert res[0] is None
+    assert res[1] is ASYNC_INCORRECT_MSG_TO_BLOCK
+    assert isinstance(res[2], TypeError)
+    assert res[3] is None
+    assert res[4] is None
+    assert sorted(CONST_LIST_ASYNC) == sorted([1, 2, -3, 1, -1])
+    assert not isinstance(orchestrator._targets["first async block"], type)
+    assert not isinstance(orchestrator._flows["test_async_flow"], type)
+
+    messages = [
+        MyTestModel(
+            body=dict(body_option=str(i)), header=dict(target="slow async block")
+        )
+        for i in range(10)
+    ]
+    CONST_LIST_ASYNC.clear()
+    res = await orchestrator.handle_batch(
+        messages, max_concurrency=3, is_force_return=True
+    )
+    assert res == messages
+    assert sorted(CONST_LIST_ASYNC) == list(range(10))
+    assert SlowAsyncBlock.max_in_progress == 3
+
+    async def stream():
+        for message in messages:
+            yield message
+
+    SlowAsyncBlock.max_in_progress = 0
+    res = [
+        result
+        async for result in orchestrator.handle_stream(
+            stream(), max_concurrency=2, is_force_return=True
+        )
+    ]
+    assert res == messages
+    assert SlowAsyncBlock.max_in_progress == 2
+    res = [result async for result in orchestrator.handle_stream(messages[:3])]
+    assert res == [None, None, None]
+
+    with pytest.raises(ValueError):
+        await orchestrator.handle_batch(messages, max_concurrency=0)
+    with pytest.raises(ValueError):
+        async for _ in orchestrator.handle_stream(messages, max_concurrency=0):
+            pass  # pragma: no cover
+
+
+class BrokenInitAsyncBlock(AsyncBlock):
+    name_block = "broken init async block"
+
+    def __init__(self, *args, **kwargs):
+        raise RuntimeError("broken block")
+
+    async def process(self, msg):
+        pass  # pragma: no cover
+
+
+@pytest.mark.asyncio
+async def test_async_orchestrator_handle_batch_route_error():
+    """
+    Test an error of a route is returned only for messages routed there
+    :return:
+    """
+    CONST_LIST_ASYNC.clear()
+    orchestrator = AsyncOrchestrator(
+        blocks=[
+            settings_correct_orchestrator_async_blocks.FirstAsyncBlock,
+            BrokenInitAsyncBlock,
+        ],
+    )
+    broken_msg = MyTestModel(
+        body=dict(), header=dict(target="broken init async block")
+    )
+    res = await orchestrator.handle_batch(
+        [broken_msg, deepcopy(ASYNC_CORRECT_MSG_TO_FIRST_BLOCK)]
+    )
+    assert isinstance(res[0], RuntimeError)
+    assert res[1] is None
+    assert CONST_LIST_ASYNC == [1]
+
+
+def test_sync_orchestrator_executor():
+    main_thread = f"{os.getpid()}:{threading.get_ident()}"
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        orchestrator = SyncOrchestrator(
+            blocks=[ExecutorSyncBlock], flows=[TestFlow], executor=executor
+        )
+        message = MyTestModel(body=dict(), header=dict(target="executor block"))
+        assert orchestrator.handle(message, is_force_return=True) is message
+        assert message.body.body_option.startswith(f"{os.getpid()}:")
+        assert message.body.body_option != main_thread
+        assert orchestrator._targets["executor block"].executor is executor
+        orchestrator.handle(deepcopy(CORRECT_MSG_FIRST_FLOW_FIRST_BLOCK))
+        for block in orchestrator._flows[TestFlow.name_flow].get_blocks():
+            assert block.executor is executor
+
+        # the block with its own executor keeps it
+        inline_block = ExecutorSyncBlock()
+        inline_block.executor = InlineExecutor()
+        orchestrator = SyncOrchestrator(blocks=[inline_block], executor=executor)
+        message = MyTestModel(body=dict(), header=dict(target="executor block"))
+        orchestrator.handle(message)
+        assert isinstance(inline_block.executor, InlineExecutor)
+        assert message.body.body_option == main_thread
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        block = ExecutorSyncBlock()
+        block.executor = executor
+        message = MyTestModel(body=dict(), header=dict(target="executor block"))
+        result = block.run_process(message)
+        assert isinstance(result, MyTestModel)
+        assert result is not message
+        assert message.body.body_option is None
+        assert not result.body.body_option.startswith(f"{os.getpid()}:")
+
+
+class SlowInitBlock(SyncBlock):
+    name_block = "slow init block"
+    count_instances = 0
+
+    def __init__(self, *args, **kwargs):
+        time.sleep(0.05)
+        SlowInitBlock.count_instances += 1
+        super().__init__(*args, **kwargs)
+
+    def process(self, msg):
+        return msg
+
+
+def test_orchestrator_warm_up():
+    orchestrator = SyncOrchestrator(
+        blocks=[FirstBlock, SecondBlock], flows=[TestFlow], preload=True
+    )
+    assert not any(
+        isinstance(obj, type)
+        for obj in (*orchestrator._targets.values(), *orchestrator._flows.values())
+    )
+    target = orchestrator._targets[FirstBlock.name_block]
+    orchestrator.warm_up(is_parallel=True)
+    assert orchestrator._targets[FirstBlock.name_block] is target
+
+    orchestrator = SyncOrchestrator(blocks=[SlowInitBlock, FirstBlock])
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        targets = list(
+            pool.map(orchestrator._get_target, [SlowInitBlock.name_block] * 8)
+        )
+    assert SlowInitBlock.count_instances == 1
+    assert all(target is targets[0] for target in targets)
+    orchestrator.warm_up(is_parallel=True, max_workers=2)
+    assert not isinstance(orchestrator._targets[FirstBlock.name_block], type)
+    assert SlowInitBlock.count_instances == 1
+
+
+def test_orchestrator_isolated_registries():
+    first_orchestrator = SyncOrchestrator(blocks=[FirstBlock, SecondBlock])
+    second_orchestrator = SyncOrchestrator(blocks=[FirstBlock, SecondBlock])
+    with pytest.raises(TypeError):
+        first_orchestrator._targets[FirstBlock.name_block] = FirstBlock()
+    first_orchestrator.handle(deepcopy(CORRECT_MSG_TO_FIRST_BLOCK))
+    assert not isinstance(first_orchestrator._targets[FirstBlock.name_block], type)
+    assert second_orchestrator._targets[FirstBlock.name_block] is FirstBlock
+    second_orchestrator.warm_up()
+    assert (
+        first_orchestrator._targets[FirstBlock.name_block]
+        is not second_orchestrator._targets[FirstBlock.name_block]
+    )
+    assert SyncOrchestrator._targets == {}
+    assert SyncOrchestrator._flows == {}
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import time
 
 import pytest
 
@@ -7,25 +9,50 @@ from orch_serv.exc import (
     EmptyCommandsException,
     IncorrectDefaultCommand,
     NotUniqueCommandError,
+    PostProcessingClosedError,
+    ResultShapeMismatchError,
     ServiceBlockException,
     ServiceBuilderException,
 )
-from orch_serv.service import AsyncService, Service, ServiceBlock, ServiceBuilder
+from orch_serv.service import (
+    AsyncPostProcessingPipeline,
+    AsyncService,
+    PostProcessingPipeline,
+    Service,
+    ServiceBlock,
+    ServiceBuilder,
+)
+from orch_serv.service.service import ServiceCommand
 from tests.settings.settings_test_service import (
+    BATCHES_ASYNC,
+    BATCHES_SYNC,
+    CONCURRENCY_STATE,
     CONST_LIST_ASYNC,
     CONST_LIST_SYNC,
+    POST_PROCESSED,
     AsyncSwapService,
+    AutoShapeProcessHandler,
+    BatchAsyncService,
+    BatchPostProcessHandler,
+    BatchService,
+    ConcurrentAsyncProcessHandler,
+    ConcurrentAsyncService,
     FirstAsyncPostProcessHandler,
     FirstAsyncProcessHandler,
     FirstPostProcessHandler,
     FirstProcessHandler,
+    MessageShapeProcessHandler,
     MyAsyncService,
     MySyncService,
     SecondAsyncPostProcessHandler,
     SecondAsyncProcessHandler,
     SecondPostProcessHandler,
     SecondProcessHandler,
+    ServiceTestMessage,
+    ShapePostProcessHandler,
+    ShapeService,
     SwapService,
+    TupleShapeProcessHandler,
     msg_to_async_first_handler,
     msg_to_async_forth_handler,
     msg_to_async_second_handler,
@@ -442,3 +469,219 @@ async def test_async_swap():
     assert CONST_LIST_ASYNC == [1, 2, -1, -2, -3, 3]
     await service.handle(msg_to_second_handler_swap_async)
     assert CONST_LIST_ASYNC == [1, 2, -1, -2, -3, 3, 2]
+
+
+def test_service_isolated_registries():
+    first_service = SwapService()
+    second_service = SwapService()
+    assert first_service._dict_handlers is not second_service._dict_handlers
+    with pytest.raises(TypeError):
+        first_service._dict_handlers["new command"] = None
+    assert Service._dict_handlers == {}
+
+
+def test_service_lazy_logging(mocker):
+    logger = logging.getLogger("test_service_lazy_logging")
+    logger.setLevel(logging.WARNING)
+    service = MySyncService(logger=logger)
+    spy_dump = mocker.spy(ServiceTestMessage, "model_dump")
+    service.handle(msg_to_first_handler)
+    assert spy_dump.call_count == 0
+    logger.setLevel(logging.INFO)
+    service.handle(msg_to_first_handler)
+    assert spy_dump.call_count > 0
+
+
+def test_service_post_processing_pipeline():
+    BATCHES_SYNC.clear()
+    pipeline = PostProcessingPipeline(batch_size=2, flush_interval=10)
+    service = BatchService(post_processing=pipeline)
+    for _ in range(3):
+        assert service.handle(msg_to_first_handler) is None
+    service.flush()
+    # the full batch is flushed by the size, the rest by `flush`
+    assert [len(batch) for batch in BATCHES_SYNC] == [2, 1]
+
+    BATCHES_SYNC.clear()
+    timed = BatchService(
+        post_processing=PostProcessingPipeline(batch_size=100, flush_interval=0.01)
+    )
+    timed.handle(msg_to_first_handler)
+    for _ in range(100):
+        if BATCHES_SYNC:
+            break
+        time.sleep(0.01)
+    assert BATCHES_SYNC == [[msg_to_first_handler]]
+    timed.close()
+
+    service.close()
+    assert pipeline.is_closed
+    service.flush()
+    # the message is returned if the pipeline is closed
+    assert service.handle(msg_to_first_handler) == msg_to_first_handler
+    with pytest.raises(PostProcessingClosedError):
+        pipeline.submit(BatchPostProcessHandler(), msg_to_first_handler)
+    with pytest.raises(TypeError):
+        BatchService(post_processing=AsyncPostProcessingPipeline())
+    with pytest.raises(ValueError):
+        PostProcessingPipeline(batch_size=0)
+
+
+@pytest.mark.asyncio
+async def test_async_service_post_processing_pipeline():
+    BATCHES_ASYNC.clear()
+    service = BatchAsyncService(
+        post_processing=AsyncPostProcessingPipeline(batch_size=2, max_pending=1)
+    )
+    for _ in range(3):
+        assert await service.handle(msg_to_async_first_handler) is None
+    await service.close()
+    # `post_process_batch` calls `post_process` for each message by default
+    assert BATCHES_ASYNC == [msg_to_async_first_handler] * 3
+    await service.close()
+    with pytest.raises(TypeError):
+        BatchAsyncService(post_processing=PostProcessingPipeline())
+
+    # the cancelled `flush` does not stop the background task
+    BATCHES_ASYNC.clear()
+    service = BatchAsyncService(
+        post_processing=AsyncPostProcessingPipeline(flush_interval=10)
+    )
+    await service.handle(msg_to_async_first_handler)
+    flush = asyncio.ensure_future(service.flush())
+    await asyncio.sleep(0)
+    flush.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await flush
+    await service.handle(msg_to_async_first_handler)
+    await service.close()
+    assert BATCHES_ASYNC == [msg_to_async_first_handler] * 2
+
+
+@pytest.mark.asyncio
+async def test_async_service_handle_many():
+    service = ConcurrentAsyncService()
+    msg_with_error = ServiceTestMessage(
+        body=dict(with_error=True),
+        header=dict(command=ConcurrentAsyncProcessHandler.target_command),
+    )
+    messages = [
+        msg_to_async_first_handler,
+        msg_with_error,
+        msg_to_async_forth_handler,
+        msg_to_async_second_handler,
+        msg_to_async_second_handler,
+        msg_to_async_first_handler,
+    ]
+    CONCURRENCY_STATE["max_in_progress"] = 0
+    results = await service.handle_many(messages)
+    # the message with error and the message without handler are returned
+    assert results == [msg_with_error, msg_to_async_forth_handler]
+    assert CONCURRENCY_STATE["max_in_progress"] == 3
+    assert CONCURRENCY_STATE["in_progress"] == CONCURRENCY_STATE["limited"] == 0
+
+    CONCURRENCY_STATE["max_in_progress"] = 0
+    results = await service.handle_many(
+        iter(messages), max_concurrency=2, is_force_return=True
+    )
+    assert results == messages
+    assert CONCURRENCY_STATE["max_in_progress"] == 2
+    assert await service.handle_many([]) == []
+    with pytest.raises(ValueError):
+        await service.handle_many(messages, max_concurrency=0)
+
+    class WrongLimitHandler(ConcurrentAsyncProcessHandler):
+        max_concurrency = 0
+
+    with pytest.raises(ValueError):
+
+        class WrongLimitService(AsyncService):
+            service_commands = ServiceBuilder(ServiceBlock(processor=WrongLimitHandler))
+
+        WrongLimitService()
+
+
+def test_async_service_handle_many_in_event_loops():
+    service = ConcurrentAsyncService()
+    messages = [msg_to_async_second_handler] * 3
+    # the semaphores of the commands are created for each event loop
+    for _ in range(2):
+        assert asyncio.run(service.handle_many(messages)) == []
+    assert CONCURRENCY_STATE["limited"] == 0
+
+
+def test_service_result_shape():
+    POST_PROCESSED.clear()
+    service = ShapeService(default_command=TupleShapeProcessHandler.target_command)
+    messages = [
+        ServiceTestMessage(body=dict(), header=dict(command=command))
+        for command in (
+            AutoShapeProcessHandler.target_command,
+            MessageShapeProcessHandler.target_command,
+            TupleShapeProcessHandler.target_command,
+            "not existed",
+        )
+    ]
+    message_with_tuple = ServiceTestMessage(
+        body=dict(base_option="tuple"),
+        header=dict(command=AutoShapeProcessHandler.target_command),
+    )
+    for message in messages + [message_with_tuple]:
+        assert service.handle(message) is None
+    # the message is not unpacked as a tuple of its fields
+    assert POST_PROCESSED == [
+        (messages[0], None),
+        (messages[1], None),
+        (messages[2], "additional"),
+        (messages[3], "additional"),
+        (message_with_tuple, "additional"),
+    ]
+
+    class MessageInTupleShapeHandler(TupleShapeProcessHandler):
+        def process(self, message):
+            return message
+
+    POST_PROCESSED.clear()
+    wrong_shape_services = [
+        Service(
+            ServiceBuilder(
+                ServiceBlock(
+                    processor=MessageInTupleShapeHandler,
+                    post_processor=ShapePostProcessHandler,
+                )
+            ),
+            default_command=MessageInTupleShapeHandler.target_command,
+            is_catch_exceptions=is_catch_exceptions,
+        )
+        for is_catch_exceptions in (True, False)
+    ]
+    # the message is returned as not processed
+    assert wrong_shape_services[0].handle(messages[0]) == messages[0]
+    with pytest.raises(ResultShapeMismatchError, match="TupleShapeProcessHandler"):
+        wrong_shape_services[1].handle(messages[0])
+    # the fields of the message are not passed to the post processor
+    assert POST_PROCESSED == []
+
+    class WrongShapeHandler(MessageShapeProcessHandler):
+        result_shape = "list"
+
+    with pytest.raises(ServiceBuilderException):
+        Service(ServiceBuilder(ServiceBlock(processor=WrongShapeHandler)))
+
+
+def test_service_command_structure():
+    service = ShapeService()
+    command = service._get_service_command(
+        ServiceTestMessage(
+            body=dict(), header=dict(command=TupleShapeProcessHandler.target_command)
+        )
+    )
+    assert isinstance(command, ServiceCommand)
+    assert isinstance(command.processor, TupleShapeProcessHandler)
+    assert command == ServiceCommand(
+        command.processor, command.post_processor, command.unpack_result
+    )
+    assert command != ServiceCommand(command.processor, command.post_processor)
+    assert "TupleShapeProcessHandler" in repr(command)
+    with pytest.raises(AttributeError):
+        command.extra = None
@@ -2,24 +2,60 @@
 Module with tests orch_serv.stepper.stepper
 """
 
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+import gc
+import logging
+
 import pytest
 
 from orch_serv.exc import (
+    BatchSizeMismatchError,
     ConsistencyStepsException,
     DataConsistencyError,
     ExtraAttributeError,
     NoDataForExecutionStepException,
     EmptyStepper,
+    LoopLimitExceededError,
+    NotPicklableStepError,
+)
+from orch_serv.orchestrator.block import InlineExecutor
+from orch_serv.stepper.cache import StepCache
+from orch_serv.stepper.stepper import (
+    AsyncStepper,
+    BatchStep,
+    CachedStep,
+    ExecutorStep,
+    ForEachStep,
+    IfStep,
+    ParallelSteps,
+    Step,
+    Stepper,
+    StepsBuilder,
+    WhileStep,
 )
-from orch_serv.stepper.stepper import Step, Stepper, StepsBuilder
+from orch_serv.stepper.utils import SignatureCache
 from tests.settings.settings_test_stepper import (
     DATA_AFTER_FIRST_FLOW,
     DATA_AFTER_SECOND_FLOW,
     LIST_ARGS,
+    PARALLEL_STATE,
+    MyAsyncFlow,
     MyFirstFlow,
     MySecondFlow,
     MyThirdFlow,
     TestClass,
+    async_double,
+    async_double_half,
+    async_load,
+    correct_step_1,
+    correct_step_2,
+    executor_negate,
+    merge_results,
+    one_id,
+    sync_square,
     tst_function,
     tst_function_2,
     tst_function_3,
@@ -95,3 +131,563 @@ def test_stepper() -> None:
     assert resp == [3]
 
     StepsBuilder(Step(tst_function_with_optional), Step(tst_function_with_optional_2))
+
+
+@pytest.mark.asyncio
+async def test_async_stepper() -> None:
+    """
+    tests for async stepper with parallel steps
+    :return:
+    """
+    PARALLEL_STATE["max_in_progress"] = 0
+    assert await MyAsyncFlow().step_by_step(1) == [3, 4, 4]
+    assert PARALLEL_STATE["max_in_progress"] == 1
+
+    parallel = ParallelSteps(Step(async_load), Step(async_load), Step(async_load))
+    stepper = AsyncStepper(StepsBuilder(Step(async_load), parallel))
+    assert await stepper.step_by_step(1) == (3, 3, 3)
+    assert PARALLEL_STATE["max_in_progress"] == 3
+    assert parallel.is_async
+    assert parallel.name == "parallel(async_load, async_load, async_load)"
+
+    PARALLEL_STATE["max_in_progress"] = 0
+    limited = ParallelSteps(*[Step(async_load) for _ in range(4)], max_concurrency=2)
+    assert await AsyncStepper(StepsBuilder(limited)).step_by_step(1) == (2, 2, 2, 2)
+    assert PARALLEL_STATE["max_in_progress"] == 2
+
+    # sync steps in the group are executed one by one in the sync stepper
+    sync_parallel = ParallelSteps(Step(sync_square), Step(sync_square))
+    assert not sync_parallel.is_async
+    stepper = Stepper(StepsBuilder(sync_parallel, Step(merge_results, third=0)))
+    assert stepper.step_by_step(3) == [9, 9, 0]
+
+    with pytest.raises(TypeError):
+        Stepper(StepsBuilder(Step(async_load)))
+    with pytest.raises(TypeError):
+        Stepper(StepsBuilder(Step(sync_square), parallel))
+    with pytest.raises(DataConsistencyError):
+        StepsBuilder(
+            Step(async_load),
+            ParallelSteps(Step(async_load), Step(async_double)),
+            Step(tst_function_2),
+        )
+    with pytest.raises(ValueError):
+        ParallelSteps(Step(async_load), max_concurrency=0)
+    with pytest.raises(EmptyStepper):
+        ParallelSteps()
+    with pytest.raises(TypeError):
+        ParallelSteps(async_load)  # type: ignore
+    with pytest.raises(ConsistencyStepsException):
+        await AsyncStepper(
+            StepsBuilder(
+                Step(async_load),
+                Step(async_double),
+                is_validate_consistency_steps=False,
+            )
+        ).step_by_step("1")
+
+
+def test_signature_cache() -> None:
+    """
+    tests for cache of signatures
+    :return:
+    """
+    cache = SignatureCache(maxsize=2)
+    assert cache.get(tst_function_3) is cache.get(tst_function_3)
+    assert len(cache) == 1
+
+    class WithMethod:
+        def method(self, value: int) -> int:
+            return value
+
+    first, second = WithMethod(), WithMethod()
+    assert cache.get(first.method) is cache.get(second.method)
+    assert list(cache.get(first.method).parameters) == ["value"]
+    assert len(cache) == 2
+
+    def dynamic(value: int) -> int:
+        return value
+
+    cache.get(dynamic)
+    # the least recently used signature is evicted
+    assert len(cache) == 2
+    cache.get(tst_function_3)
+    assert len(cache) == 2
+    del dynamic
+    gc.collect()
+    assert len(cache) == 1
+
+    class WithoutWeakReference:
+        __slots__ = ()
+
+        def __call__(self, value: int) -> int:
+            return value
+
+    # callables without weak references are not cached
+    assert list(cache.get(WithoutWeakReference()).parameters) == ["value"]
+    assert len(cache) == 1
+
+    @dataclass
+    class NotHashable:
+        def __call__(self, value: int) -> int:
+            return value
+
+    # not hashable callables are not cached
+    assert list(cache.get(NotHashable()).parameters) == ["value"]
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        SignatureCache(maxsize=0)
+
+
+def test_log_callable_object_steps(caplog) -> None:
+    """
+    tests for logging of steps with callable objects
+    :return:
+    """
+
+    class Incrementer:
+        def __call__(self, value: int) -> int:
+            return value + 1
+
+    class BatchIncrementer:
+        def __call__(self, values: list[int]) -> list[int]:
+            return [value + 1 for value in values]
+
+    logger = logging.getLogger("test_log_callable_object_steps")
+    stepper = Stepper(
+        StepsBuilder(
+            Step(Incrementer()),
+            CachedStep(Incrementer()),
+            ExecutorStep(Incrementer(), InlineExecutor()),
+            BatchStep(BatchIncrementer(), batch_size=2),
+        ),
+        logger=logger,
+    )
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        assert stepper.step_by_step(1) == 5
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 8
+    assert all("Incrementer" in message for message in messages)
+
+
+def test_stepper_plan(mocker) -> None:
+    """
+    tests for compiled plan of steps and logging of steps
+    :return:
+    """
+    step = Step(correct_step_2, arg=2)
+    call = step.compile()
+    assert call(([5, 6],)) == [6]
+    assert call([5, 6]) == [6]
+
+    logger = mocker.Mock()
+    stepper = MySecondFlow(logger=logger, is_log_steps=False)
+    LIST_ARGS.clear()
+    stepper.step_by_step()
+    assert LIST_ARGS == DATA_AFTER_SECOND_FLOW
+    logger.info.assert_not_called()
+
+    logger.isEnabledFor.return_value = True
+    # steps are logged by default
+    stepper = MySecondFlow(logger=logger)
+    stepper.step_by_step()
+    # the step without the result is not logged as finished
+    assert logger.info.call_count == 2 * len(stepper.steps) - 1
+
+    logger.reset_mock()
+    logger.isEnabledFor.return_value = False
+    stepper.step_by_step()
+    logger.info.assert_not_called()
+
+    parallel = Stepper(
+        StepsBuilder(
+            Step(correct_step_1),
+            ParallelSteps(Step(correct_step_2), Step(correct_step_2, arg=3)),
+            is_validate_consistency_steps=False,
+        )
+    )
+    assert parallel.step_by_step() == ([2, 3], [2, 3])
+
+
+@pytest.mark.asyncio
+async def test_stepper_stream() -> None:
+    """
+    tests for lazy execution of the steps for each item
+    :return:
+    """
+    consumed = []
+
+    def items(count: int):
+        for value in range(count):
+            consumed.append(value)
+            yield value
+
+    def increment(value: int) -> int:
+        return value + 1
+
+    def total(values: list[int]) -> int:
+        return sum(values)
+
+    stepper = Stepper(StepsBuilder(Step(increment), Step(increment)))
+    results = stepper.stream(items(5))
+    assert consumed == []
+    assert next(results) == 2
+    assert consumed == [0]
+    assert list(results) == [3, 4, 5, 6]
+
+    def pair(value: int, other: int) -> int:
+        return value * other
+
+    assert list(Stepper(StepsBuilder(Step(pair))).stream([(2, 3), (4, 5)])) == [
+        6,
+        20,
+    ]
+
+    chunked = Stepper(StepsBuilder(Step(total)))
+    assert list(chunked.stream(range(5), chunk_size=2)) == [1, 5, 4]
+    with pytest.raises(ValueError):
+        chunked.stream(range(5), chunk_size=0)
+
+    async def async_items(count: int):
+        for value in range(count):
+            yield value
+
+    async_stepper = AsyncStepper(StepsBuilder(Step(increment), Step(async_double)))
+    assert [result async for result in async_stepper.stream(range(3))] == [2, 4, 6]
+    assert [result async for result in async_stepper.stream(async_items(3))] == [
+        2,
+        4,
+        6,
+    ]
+    async_chunked = AsyncStepper(StepsBuilder(Step(total)))
+    assert [
+        result async for result in async_chunked.stream(async_items(5), chunk_size=2)
+    ] == [1, 5, 4]
+    assert [
+        result async for result in async_chunked.stream(range(5), chunk_size=3)
+    ] == [3, 7]
+
+
+@pytest.mark.asyncio
+async def test_batch_step() -> None:
+    """
+    tests for batch steps
+    :return:
+    """
+    calls = []
+
+    def parse(value: str) -> int:
+        return int(value)
+
+    def scale(values: list[int], factor: int = 2) -> list[int]:
+        calls.append(len(values))
+        return [value * factor for value in values]
+
+    def increment(value: int) -> int:
+        return value + 1
+
+    stepper = Stepper(
+        StepsBuilder(
+            Step(parse), BatchStep(scale, batch_size=2, factor=3), Step(increment)
+        )
+    )
+    assert stepper.step_by_step("2") == 7
+    assert calls == [1]
+    calls.clear()
+    assert list(stepper.stream(["1", "2", "3", "4", "5"])) == [4, 7, 10, 13, 16]
+    assert calls == [2, 2, 1]
+    assert BatchStep(scale).get_returned_value() is int
+
+    with pytest.raises(DataConsistencyError):
+        StepsBuilder(Step(increment), BatchStep(scale), Step(parse))
+    with pytest.raises(DataConsistencyError):
+        StepsBuilder(Step(tst_function), BatchStep(scale))
+    with pytest.raises(ValueError):
+        BatchStep(scale, batch_size=0)
+
+    def lose_item(values: list[int]) -> list[int]:
+        return values[1:]
+
+    with pytest.raises(BatchSizeMismatchError):
+        list(Stepper(StepsBuilder(Step(parse), BatchStep(lose_item))).stream(["1"]))
+
+    async def async_scale(values: list[int]) -> list[int]:
+        await asyncio.sleep(0)
+        calls.append(len(values))
+        return [value * 2 for value in values]
+
+    calls.clear()
+    async_stepper = AsyncStepper(
+        StepsBuilder(
+            Step(parse), BatchStep(async_scale, batch_size=3), Step(async_double)
+        )
+    )
+    assert await async_stepper.step_by_step("1") == 4
+    assert [result async for result in async_stepper.stream(["1", "2", "3", "4"])] == [
+        4,
+        8,
+        12,
+        16,
+    ]
+    assert calls == [1, 3, 1]
+
+
+@pytest.mark.asyncio
+async def test_cached_step() -> None:
+    """
+    tests for steps with the cache of results
+    :return:
+    """
+    calls = []
+
+    def normalize(value: str, suffix: str = "") -> str:
+        calls.append(value)
+        return value.strip().lower() + suffix
+
+    cache = StepCache(maxsize=2)
+    first = Stepper(StepsBuilder(CachedStep(normalize, cache=cache)))
+    second = Stepper(StepsBuilder(CachedStep(normalize, cache=cache, suffix="!")))
+    assert first.step_by_step(" A ") == "a"
+    assert first.step_by_step(" A ") == "a"
+    assert calls == [" A "]
+    # kwargs are a part of the key
+    assert second.step_by_step(" A ") == "a!"
+    assert calls == [" A ", " A "]
+    assert cache.info() == dict(hits=1, misses=2, size=2, maxsize=2)
+    # the least recently used result is evicted
+    first.step_by_step(" B ")
+    first.step_by_step(" A ")
+    assert calls == [" A ", " A ", " B ", " A "]
+    assert len(cache) == 2
+
+    # unhashable input data is not cached
+    def first_item(values: list[int]) -> int:
+        calls.append(values)
+        return values[0]
+
+    calls.clear()
+    unhashable = CachedStep(first_item)
+    assert unhashable.execute([1]) == unhashable.execute([1]) == 1
+    assert calls == [[1], [1]]
+    assert unhashable.cache.info()["size"] == 0
+
+    # equal values of different types have different results
+    identity = CachedStep(lambda value: value)
+    assert [type(identity.execute(value)) for value in (1, True, 1.0)] == [
+        int,
+        bool,
+        float,
+    ]
+    assert identity.cache.info()["size"] == 3
+
+    ttl_cache = StepCache(ttl=0.01)
+    step = CachedStep(normalize, cache=ttl_cache)
+    step.execute("C")
+    step.execute("C")
+    await asyncio.sleep(0.02)
+    step.execute("C")
+    assert ttl_cache.hits == 1
+    assert ttl_cache.misses == 2
+    ttl_cache.clear()
+    assert ttl_cache.info() == dict(hits=0, misses=0, size=0, maxsize=128)
+    with pytest.raises(ValueError):
+        StepCache(maxsize=0)
+    with pytest.raises(ValueError):
+        StepCache(ttl=0)
+
+    async_cache = StepCache()
+    async_stepper = AsyncStepper(
+        StepsBuilder(CachedStep(async_double, cache=async_cache))
+    )
+    assert await async_stepper.step_by_step(2) == 4
+    assert await async_stepper.step_by_step(2) == 4
+    assert async_cache.info() == dict(hits=1, misses=1, size=1, maxsize=128)
+
+
+@pytest.mark.asyncio
+async def test_executor_step() -> None:
+    """
+    tests for steps executed in executors
+    :return:
+    """
+    with (
+        ThreadPoolExecutor(max_workers=2) as threads,
+        ProcessPoolExecutor(max_workers=1) as processes,
+    ):
+        steps = StepsBuilder(
+            Step(async_load),
+            ParallelSteps(
+                ExecutorStep(sync_square, processes),
+                ExecutorStep(executor_negate, threads),
+                ExecutorStep(sync_square, InlineExecutor()),
+            ),
+            Step(merge_results),
+        )
+        assert await AsyncStepper(steps).step_by_step(3) == [16, -4, 16]
+        sync_steps = StepsBuilder(
+            ExecutorStep(sync_square, processes),
+            ParallelSteps(
+                ExecutorStep(executor_negate, processes),
+                ExecutorStep(sync_square, threads),
+                Step(sync_square),
+            ),
+            Step(merge_results),
+        )
+        assert Stepper(sync_steps).step_by_step(2) == [-4, 16, 16]
+        assert sync_steps[1].execute(2) == (-2, 4, 4)
+
+        def local_function(value: int) -> int:
+            return value
+
+        # local functions can't be pickled for the process pool
+        with pytest.raises(NotPicklableStepError):
+            ExecutorStep(local_function, processes)
+        assert ExecutorStep(local_function, threads).execute(1) == 1
+        with pytest.raises(TypeError):
+            ExecutorStep(async_double, threads)
+    with pytest.raises(TypeError):
+        ExecutorStep(sync_square, None)  # type: ignore
+
+
+def test_control_flow_steps_names(caplog) -> None:
+    """
+    tests for names of conditional and loop steps
+     with conditions which are not functions
+    :return:
+    """
+
+    def is_greater(value: int, limit: int) -> bool:
+        return value > limit
+
+    def half(value: int) -> int:
+        return value // 2
+
+    if_step = IfStep(partial(is_greater, limit=10), Step(half))
+    while_step = WhileStep(partial(is_greater, limit=1), Step(half))
+    assert if_step.name == "if(partial)"
+    assert while_step.name == "while(partial)"
+    assert "partial" in str(if_step)
+    assert "partial" in str(while_step)
+
+    logger = logging.getLogger("test_control_flow_steps_names")
+    stepper = Stepper(
+        StepsBuilder(Step(half), if_step, while_step),
+        logger=logger,
+    )
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        assert stepper.step_by_step(48) == 1
+    assert all("partial" in record.getMessage() for record in caplog.records[2:])
+
+
+@pytest.mark.asyncio
+async def test_control_flow_steps(mocker) -> None:
+    """
+    tests for conditional and loop steps
+    :return:
+    """
+
+    def start(value: int) -> int:
+        return value
+
+    def is_even(value: int) -> bool:
+        return value % 2 == 0
+
+    def half(value: int) -> int:
+        return value // 2
+
+    def triple(value: int) -> int:
+        return value * 3
+
+    def to_text(value: int) -> str:
+        return str(value)
+
+    def is_big(value: int) -> bool:
+        return value > 10
+
+    def ids(value: int) -> list[int]:
+        return list(range(1, value + 1))
+
+    def join(values: list[str]) -> str:
+        return ",".join(values)
+
+    stepper = Stepper(
+        StepsBuilder(
+            Step(start),
+            IfStep(is_even, Step(half), else_step=Step(triple)),
+            WhileStep(is_big, Step(half)),
+            Step(to_text),
+        )
+    )
+    assert stepper.step_by_step(8) == "4"
+    assert stepper.step_by_step(9) == "6"
+    assert stepper.step_by_step(100) == "6"
+    # without else the data is passed unchanged
+    without_else = Stepper(StepsBuilder(Step(start), IfStep(is_even, Step(half))))
+    assert without_else.step_by_step(3) == 3
+
+    for_each = Stepper(StepsBuilder(Step(ids), ForEachStep(Step(triple))))
+    assert for_each.step_by_step(3) == [3, 6, 9]
+    assert ForEachStep(Step(to_text)).get_returned_value() == list[str]
+
+    # the sequence of one item is not unpacked
+    single = Stepper(StepsBuilder(Step(one_id), ForEachStep(Step(triple))))
+    assert single.step_by_step(5) == [15]
+
+    # the branches must return the same data
+    with pytest.raises(DataConsistencyError):
+        StepsBuilder(Step(start), IfStep(is_even, Step(to_text), else_step=Step(half)))
+    with pytest.raises(DataConsistencyError):
+        StepsBuilder(Step(start), IfStep(is_even, Step(to_text)))
+    # the step of the loop must return the data it receives
+    with pytest.raises(DataConsistencyError):
+        StepsBuilder(Step(start), WhileStep(is_big, Step(to_text)))
+    # for each step requires the sequence
+    with pytest.raises(DataConsistencyError):
+        StepsBuilder(Step(start), ForEachStep(Step(triple)))
+    with pytest.raises(DataConsistencyError):
+        StepsBuilder(Step(ids), ForEachStep(Step(join)))
+    with pytest.raises(TypeError):
+        IfStep(async_double, Step(half))
+    with pytest.raises(TypeError):
+        WhileStep(is_big, half)  # type: ignore
+    with pytest.raises(ValueError):
+        WhileStep(is_big, Step(half), max_iterations=0)
+
+    def always(value: int) -> bool:
+        return True
+
+    with pytest.raises(LoopLimitExceededError):
+        Stepper(
+            StepsBuilder(Step(start), WhileStep(always, Step(triple), max_iterations=3))
+        ).step_by_step(1)
+
+    async_stepper = AsyncStepper(
+        StepsBuilder(
+            Step(ids),
+            ForEachStep(Step(async_double), max_concurrency=2),
+            is_validate_consistency_steps=False,
+        )
+    )
+    assert await async_stepper.step_by_step(3) == [2, 4, 6]
+    async_if = AsyncStepper(
+        StepsBuilder(
+            Step(start),
+            IfStep(is_even, Step(async_double), else_step=Step(triple)),
+            WhileStep(is_big, Step(async_double_half)),
+        )
+    )
+    assert await async_if.step_by_step(4) == 8
+    assert await async_if.step_by_step(5) == 7
+    with pytest.raises(TypeError):
+        Stepper(StepsBuilder(Step(start), IfStep(is_even, Step(async_double))))
+
+    # the nested executor step is awaited without blocking the event loop
+    spy = mocker.spy(ExecutorStep, "execute_async")
+    with ThreadPoolExecutor(max_workers=1) as threads:
+        nested = AsyncStepper(
+            StepsBuilder(Step(start), IfStep(is_even, ExecutorStep(half, threads)))
+        )
+        assert await nested.step_by_step(4) == 2
+    assert spy.call_count == 1